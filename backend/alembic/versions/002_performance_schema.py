@@ -0,0 +1,501 @@
+"""Storage, index and view changes for the hot query paths
+
+Revision ID: 002_performance_schema
+Revises: 001_initial_schema
+Create Date: 2026-10-17 02:30:00
+
+Brings a database created by 001_initial_schema up to the schema the
+application now expects:
+- native enum types instead of VARCHAR + CHECK for tier/status/position
+- transaction hashes as raw 32-byte BYTEA (converted from 0x-hex)
+- analytics-only metrics as DOUBLE PRECISION
+- traders.pnl_30d and traders.categories
+- cached id sequences (and an id default for trades)
+- partial / covering / BRIN / hash / trigram indexes replacing broad ones
+- TimescaleDB chunk interval, compression and retention policies
+- v_user_portfolio and mv_trader_leaderboard as materialized views
+- database-level JIT and parallel worker settings, fillfactor and autovacuum
+
+Values are fixed literals rather than read from settings, so the DDL this
+revision runs is the same in every environment.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '002_performance_schema'
+down_revision = '001_initial_schema'
+branch_labels = None
+depends_on = None
+
+# Native enum types for low-cardinality status columns (4 bytes, no CHECK per write)
+ENUM_TYPES = {
+    'subscription_tier_t': ('free', 'basic', 'pro', 'premium'),
+    'api_key_status_t': ('active', 'revoked', 'suspended', 'expired'),
+    'copy_rel_status_t': ('active', 'paused', 'stopped'),
+    'trade_status_t': ('pending', 'open', 'closed', 'cancelled', 'failed'),
+    'trade_position_t': ('YES', 'NO', 'LONG', 'SHORT'),
+    'trade_queue_status_t': ('pending', 'processing', 'completed', 'failed', 'cancelled'),
+}
+
+# (table, column, enum type, server default, VARCHAR length, CHECK it replaces)
+ENUM_COLUMNS = (
+    ('users', 'subscription_tier', 'subscription_tier_t', 'free', 20, 'users_tier_valid'),
+    ('polymarket_api_keys', 'status', 'api_key_status_t', 'active', 20, 'api_keys_status_valid'),
+    ('copy_relationships', 'status', 'copy_rel_status_t', 'active', 20, 'copy_rel_status_valid'),
+    ('trades', 'position', 'trade_position_t', None, 10, 'trades_position_valid'),
+    ('trades', 'status', 'trade_status_t', 'pending', 20, 'trades_status_valid'),
+    ('trade_queue', 'position', 'trade_position_t', None, 10, None),
+    ('trade_queue', 'status', 'trade_queue_status_t', 'pending', 20, 'trade_queue_status_valid'),
+)
+
+# (table, column) holding a 0x-prefixed 66-character transaction hash
+TX_HASH_COLUMNS = (
+    ('trades', 'original_tx_hash'),
+    ('trades', 'copy_tx_hash'),
+    ('trade_queue', 'original_tx_hash'),
+)
+
+# (table, column, NUMERIC precision, scale) for analytics-only metrics
+FLOAT_COLUMNS = (
+    ('traders', 'pnl_7d_percent', 10, 4),
+    ('traders', 'sharpe_ratio', 10, 4),
+    ('traders', 'max_drawdown', 10, 4),
+    ('traders', 'volatility', 10, 4),
+    ('trades', 'realized_pnl_percent', 10, 4),
+    ('trades', 'unrealized_pnl_usd', 20, 6),
+    ('trades', 'slippage_percent', 5, 2),
+)
+
+# Frequently updated, unindexed counters: leave room for HOT updates
+FILLFACTOR_TABLES = ('users', 'traders', 'copy_relationships')
+
+TRADES_PARALLEL_WORKERS = 8
+
+V_ACTIVE_COPY_RELATIONSHIPS = """
+    CREATE OR REPLACE VIEW v_active_copy_relationships AS
+    SELECT
+        cr.id,
+        cr.user_id,
+        u.email AS user_email,
+        u.wallet_address AS user_wallet,
+        cr.trader_wallet_address,
+        t.display_name AS trader_name,
+        t.win_rate AS trader_win_rate,
+        t.pnl_7d AS trader_pnl_7d,
+        cr.proportionality_factor,
+        cr.max_investment_per_trade_usd,
+        cr.total_trades_copied,
+        cr.total_pnl_usd,
+        cr.created_at
+    FROM copy_relationships cr
+    JOIN users u ON cr.user_id = u.id
+    JOIN traders t ON cr.trader_wallet_address = t.wallet_address
+    WHERE cr.status = 'active' AND u.is_active = true{trader_filter}
+"""
+
+V_USER_PORTFOLIO_QUERY = """
+    SELECT
+        u.id AS user_id,
+        u.email,
+        u.subscription_tier,
+        u.balance_usd,
+        COUNT(DISTINCT cr.id) AS traders_following,
+        COUNT(DISTINCT t.id) FILTER (WHERE t.status = 'open') AS open_positions,
+        SUM(t.entry_value_usd) FILTER (WHERE t.status = 'open') AS total_exposure_usd,
+        SUM(t.realized_pnl_usd) FILTER (WHERE t.status = 'closed') AS total_realized_pnl,
+        SUM(t.unrealized_pnl_usd) FILTER (WHERE t.status = 'open') AS total_unrealized_pnl
+    FROM users u
+    LEFT JOIN copy_relationships cr ON u.id = cr.user_id AND cr.status = 'active'
+    LEFT JOIN trades t ON u.id = t.copying_user_id
+    WHERE u.is_active = true
+    GROUP BY u.id, u.email, u.subscription_tier, u.balance_usd
+"""
+
+
+def _set_database(setting: str, value) -> None:
+    """ALTER DATABASE <current database> SET/RESET (value None resets)"""
+    action = f'RESET {setting}' if value is None else f'SET {setting} = {value}'
+    op.execute(f"DO $$ BEGIN EXECUTE format('ALTER DATABASE %I {action}', current_database()); END $$")
+
+
+def _add_constraint(table_name: str, constraint_name: str, definition: str) -> None:
+    """Add a constraint without a full-table lock, then validate existing rows"""
+    op.execute(f'ALTER TABLE {table_name} ADD CONSTRAINT {constraint_name} {definition} NOT VALID')
+    op.execute(f'ALTER TABLE {table_name} VALIDATE CONSTRAINT {constraint_name}')
+
+
+def _tx_hash_check(column: str) -> str:
+    """CHECK that a converted tx hash column holds 32-byte hashes"""
+    return f'CHECK ({column} IS NULL OR octet_length({column}) = 32)'
+
+
+def upgrade() -> None:
+    """
+    Convert the 001 schema in place.
+    
+    Runs in phases: column conversions (inside the migration transaction,
+    they rewrite their tables), then indexes, then constraints, then
+    TimescaleDB policies and views. Indexes are built outside the
+    transaction (CONCURRENTLY, or per-chunk on the trades hypertable) and
+    constraints are added NOT VALID + VALIDATE, so writers aren't blocked
+    while either runs. Compression is enabled last, since compressed
+    hypertables don't allow column type changes.
+    """
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    
+    # Short OLTP queries: JIT compile time exceeds execution time
+    _set_database('jit', 'off')
+    # Let analytics over trades (e.g. the portfolio aggregate) use every worker
+    _set_database('max_parallel_workers_per_gather', TRADES_PARALLEL_WORKERS)
+    _set_database('max_parallel_workers', TRADES_PARALLEL_WORKERS * 2)
+    
+    # Views reference columns converted below; they are recreated at the end
+    op.execute('DROP VIEW IF EXISTS v_user_portfolio')
+    op.execute('DROP VIEW IF EXISTS v_active_copy_relationships')
+    
+    # =========================================================================
+    # COLUMN TYPES
+    # =========================================================================
+    # Indexes that are replaced anyway, dropped first so the rewrites below
+    # don't rebuild them
+    op.drop_index('idx_users_tier', table_name='users')
+    op.drop_index('idx_api_keys_key_hash', table_name='polymarket_api_keys')
+    op.drop_index('idx_trade_queue_status_priority', table_name='trade_queue')
+    op.drop_index('idx_trades_entry_timestamp', table_name='trades')
+    
+    for type_name, values in ENUM_TYPES.items():
+        labels = ', '.join(f"'{value}'" for value in values)
+        op.execute(f'CREATE TYPE {type_name} AS ENUM ({labels})')
+    
+    for table_name, column, type_name, default, _, check in ENUM_COLUMNS:
+        if check:
+            op.drop_constraint(check, table_name, type_='check')
+        if default:
+            op.alter_column(table_name, column, server_default=None)
+        op.execute(
+            f'ALTER TABLE {table_name} ALTER COLUMN {column} '
+            f'TYPE {type_name} USING {column}::text::{type_name}'
+        )
+        if default:
+            op.alter_column(table_name, column, server_default=default)
+    
+    # Raw 32-byte hashes (app.db.types.TxHash converts to/from 0x-hex). A
+    # value with non-hex digits fails here; one of the wrong length fails
+    # the length CHECK added in the constraints phase.
+    for table_name, column in TX_HASH_COLUMNS:
+        op.execute(
+            f'ALTER TABLE {table_name} ALTER COLUMN {column} '
+            f"TYPE BYTEA USING decode(substr({column}, 3), 'hex')"
+        )
+    
+    # Analytics-only metrics: float8 (ledger amounts stay NUMERIC)
+    for table_name, column, _, _ in FLOAT_COLUMNS:
+        op.execute(f'ALTER TABLE {table_name} ALTER COLUMN {column} TYPE DOUBLE PRECISION')
+    
+    op.add_column('traders', sa.Column('pnl_30d', sa.Numeric(20, 6), nullable=False, server_default='0'))
+    # Written by LeaderboardService.update_trader_stats
+    op.add_column('traders', sa.Column('categories', postgresql.JSONB(), nullable=False, server_default=sa.text("'[]'::jsonb")))
+    
+    # =========================================================================
+    # IDS
+    # =========================================================================
+    # High-insert tables hand out ids 100 at a time per session
+    for table_name in ('polymarket_api_keys', 'trade_queue'):
+        op.execute(
+            "DO $$ BEGIN EXECUTE format('ALTER SEQUENCE %s CACHE 100', "
+            f"pg_get_serial_sequence('{table_name}', 'id')); END $$"
+        )
+    
+    # trades.id had no default (no primary key, so it was never a serial)
+    op.execute('CREATE SEQUENCE trades_id_seq AS BIGINT CACHE 100 OWNED BY trades.id')
+    op.execute("SELECT setval('trades_id_seq', COALESCE((SELECT MAX(id) FROM trades), 0) + 1, false)")
+    op.execute("ALTER TABLE trades ALTER COLUMN id SET DEFAULT nextval('trades_id_seq')")
+    
+    # No trigger on trades: it is the hottest write path and row triggers get in
+    # the way of compression. Trade.updated_at is set by the ORM (onupdate).
+    op.execute('DROP TRIGGER IF EXISTS update_trades_updated_at ON trades')
+    
+    # =========================================================================
+    # STORAGE PARAMETERS
+    # =========================================================================
+    # Balance / PnL / follower counters are updated constantly but not indexed;
+    # leaving 20% free space per page keeps those updates HOT (no index writes).
+    for table_name in FILLFACTOR_TABLES:
+        op.execute(
+            f"ALTER TABLE {table_name} SET (fillfactor = 80, "
+            "autovacuum_vacuum_scale_factor = 0.02, autovacuum_analyze_scale_factor = 0.01)"
+        )
+    
+    # The planner's size heuristic under-provisions workers for hypertable chunks
+    op.execute(f"ALTER TABLE trades SET (parallel_workers = {TRADES_PARALLEL_WORKERS})")
+    
+    # New chunks cover a day (~25% of shared_buffers at expected ingest);
+    # existing chunks keep their 7-day range
+    op.execute("SELECT set_chunk_time_interval('trades', INTERVAL '1 day')")
+    
+    # =========================================================================
+    # INDEXES
+    # =========================================================================
+    with op.get_context().autocommit_block():
+        # Free tier is the vast majority of rows; only index the paying tiers
+        op.create_index('idx_users_tier_paid', 'users', ['subscription_tier'],
+                        postgresql_where=sa.text("subscription_tier IN ('basic', 'pro', 'premium')"), postgresql_concurrently=True)
+    
+        # Equality-only lookups by SHA-256 of the plaintext key
+        op.create_index('idx_api_keys_key_hash', 'polymarket_api_keys', ['key_hash'], postgresql_using='hash', postgresql_concurrently=True)
+    
+        # Redundant with the wallet_address unique constraint
+        op.drop_index('idx_traders_wallet', table_name='traders', postgresql_concurrently=True)
+        # Leaderboard top-N served by index-only scan over active traders
+        op.create_index('idx_traders_pnl_7d_covering', 'traders', [sa.text('pnl_7d DESC')],
+                        postgresql_include=['wallet_address', 'display_name', 'win_rate', 'follower_count'],
+                        postgresql_where=sa.text('is_active = true'), postgresql_concurrently=True)
+        op.drop_index('idx_traders_pnl_7d', table_name='traders', postgresql_concurrently=True)
+        for column in ('total_pnl', 'win_rate'):
+            op.drop_index(f'idx_traders_{column}', table_name='traders', postgresql_concurrently=True)
+            op.create_index(f'idx_traders_{column}', 'traders', [sa.text(f'{column} DESC')],
+                            postgresql_where=sa.text('is_active = true'), postgresql_concurrently=True)
+    
+        # Covers v_active_copy_relationships so it resolves via index-only scan
+        op.create_index('idx_copy_rel_active_user', 'copy_relationships', ['user_id'],
+                        postgresql_include=['trader_wallet_address', 'proportionality_factor', 'max_investment_per_trade_usd'],
+                        postgresql_where=sa.text("status = 'active'"), postgresql_concurrently=True)
+    
+        # One partial index per dispatch state keeps the pending scan small
+        op.create_index('idx_trade_queue_pending', 'trade_queue', ['priority', 'created_at'],
+                        postgresql_where=sa.text("status = 'pending'"), postgresql_concurrently=True)
+        op.create_index('idx_trade_queue_processing', 'trade_queue', ['started_at'],
+                        postgresql_where=sa.text("status = 'processing'"), postgresql_concurrently=True)
+    
+    # Hypertables don't support CREATE INDEX CONCURRENTLY; transaction_per_chunk
+    # is TimescaleDB's equivalent and only locks one chunk at a time.
+    with op.get_context().autocommit_block():
+        # Pure time-range scans: chunk exclusion plus a tiny BRIN index. The
+        # hypertable's default entry_timestamp btree still serves ORDER BY ... LIMIT.
+        op.execute('CREATE INDEX idx_trades_entry_ts_brin ON trades USING BRIN (entry_timestamp) WITH (pages_per_range = 32, timescaledb.transaction_per_chunk)')
+        # Covering indexes for the v_user_portfolio open/closed aggregates (index-only scans)
+        op.execute("CREATE INDEX idx_trades_user_open ON trades (copying_user_id) INCLUDE (id, entry_value_usd, unrealized_pnl_usd) WITH (timescaledb.transaction_per_chunk) WHERE status = 'open'")
+        op.execute("CREATE INDEX idx_trades_user_closed ON trades (copying_user_id) INCLUDE (realized_pnl_usd) WITH (timescaledb.transaction_per_chunk) WHERE status = 'closed'")
+    
+    # =========================================================================
+    # CONSTRAINTS
+    # =========================================================================
+    # Added after the indexes so validation can use them. Each statement commits
+    # on its own, and NOT VALID + VALIDATE only holds a SHARE UPDATE EXCLUSIVE
+    # lock while existing rows are checked.
+    with op.get_context().autocommit_block():
+        for table_name, column in TX_HASH_COLUMNS:
+            check = _tx_hash_check(column)
+            if table_name == 'trades':
+                # TimescaleDB propagates hypertable constraints to every chunk
+                # itself, so trades constraints are added directly rather than
+                # NOT VALID.
+                op.execute(f'ALTER TABLE trades ADD CONSTRAINT trades_{column}_length {check}')
+            else:
+                _add_constraint(table_name, f'{table_name}_{column}_length', check)
+    
+    # =========================================================================
+    # TIMESCALEDB
+    # =========================================================================
+    # Columnar compression for historical chunks. Segmenting by the trader and
+    # copying user matches idx_trades_trader_wallet / idx_trades_copying_user so
+    # those lookups can skip whole segments of compressed chunks. Small daily
+    # chunks are merged into larger ones on compression to keep planning cheap.
+    op.execute("""
+        ALTER TABLE trades SET (
+            timescaledb.compress,
+            timescaledb.compress_segmentby = 'trader_wallet_address, copying_user_id',
+            timescaledb.compress_orderby = 'entry_timestamp DESC',
+            timescaledb.compress_chunk_time_interval = '7 days'
+        )
+    """)
+    
+    # Track per-chunk id ranges so lookups by id can skip chunks
+    op.execute("SELECT enable_chunk_skipping('trades', 'id')")
+    op.execute("SELECT add_compression_policy('trades', INTERVAL '14 days', if_not_exists => TRUE)")
+    
+    # Drop whole chunks past the retention window instead of row-by-row DELETEs.
+    # maintenance.reconcile_trade_retention clamps cached history afterwards.
+    op.execute("SELECT add_retention_policy('trades', INTERVAL '2 years', if_not_exists => TRUE)")
+    
+    # =========================================================================
+    # VIEWS
+    # =========================================================================
+    op.execute(V_ACTIVE_COPY_RELATIONSHIPS.format(trader_filter=' AND t.is_active = true'))
+    
+    # Materialized so portfolio reads are an index lookup instead of a
+    # GROUP BY over the trades hypertable; refreshed by the
+    # maintenance.refresh_user_portfolio beat task.
+    op.execute(f'CREATE MATERIALIZED VIEW v_user_portfolio AS {V_USER_PORTFOLIO_QUERY} WITH DATA')
+    
+    # Unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.execute('CREATE UNIQUE INDEX idx_v_user_portfolio_user_id ON v_user_portfolio (user_id)')
+    
+    # Leaderboard metrics aggregated from the trader's own closed trades;
+    # refreshed by the maintenance.refresh_trader_leaderboard beat task so
+    # /leaderboard reads are index scans instead of per-request aggregation.
+    op.execute("""
+        CREATE MATERIALIZED VIEW mv_trader_leaderboard AS
+        SELECT
+            t.wallet_address,
+            t.is_active,
+            t.sharpe_ratio,
+            t.last_trade_at,
+            t.categories,
+            COALESCE(SUM(tr.realized_pnl_usd) FILTER (WHERE tr.exit_timestamp > NOW() - INTERVAL '7 days'), 0) AS pnl_7d,
+            COALESCE(SUM(tr.realized_pnl_usd) FILTER (WHERE tr.exit_timestamp > NOW() - INTERVAL '30 days'), 0) AS pnl_30d,
+            COALESCE(SUM(tr.realized_pnl_usd), 0) AS pnl_total,
+            COALESCE(SUM(tr.entry_value_usd), 0) AS total_volume_usd,
+            COALESCE(100.0 * COUNT(*) FILTER (WHERE tr.exit_timestamp > NOW() - INTERVAL '7 days' AND tr.realized_pnl_usd > 0)
+                / NULLIF(COUNT(*) FILTER (WHERE tr.exit_timestamp > NOW() - INTERVAL '7 days'), 0), 0)::float8 AS win_rate_7d,
+            COALESCE(100.0 * COUNT(*) FILTER (WHERE tr.exit_timestamp > NOW() - INTERVAL '30 days' AND tr.realized_pnl_usd > 0)
+                / NULLIF(COUNT(*) FILTER (WHERE tr.exit_timestamp > NOW() - INTERVAL '30 days'), 0), 0)::float8 AS win_rate_30d,
+            COALESCE(100.0 * COUNT(*) FILTER (WHERE tr.realized_pnl_usd > 0)
+                / NULLIF(COUNT(tr.id), 0), 0)::float8 AS win_rate_total,
+            COUNT(tr.id) FILTER (WHERE tr.exit_timestamp > NOW() - INTERVAL '7 days') AS total_trades_7d,
+            COUNT(tr.id) FILTER (WHERE tr.exit_timestamp > NOW() - INTERVAL '30 days') AS total_trades_30d,
+            COUNT(tr.id) AS total_trades
+        FROM traders t
+        LEFT JOIN trades tr
+            ON tr.trader_wallet_address = t.wallet_address
+            AND tr.status = 'closed'
+            AND tr.is_copy_trade = false
+        GROUP BY t.id
+        WITH DATA
+    """)
+    
+    op.execute('CREATE UNIQUE INDEX idx_mv_trader_leaderboard_wallet ON mv_trader_leaderboard (wallet_address)')
+    # /leaderboard/trader/{wallet} matches case-insensitively (checksummed or
+    # lowercase addresses), i.e. on lower(wallet_address)
+    op.execute('CREATE INDEX idx_mv_trader_leaderboard_wallet_lower ON mv_trader_leaderboard (lower(wallet_address))')
+    # One active-only index per leaderboard rank_by option so
+    # ORDER BY <col> DESC LIMIT n stops after n index entries (pnl_7d is
+    # served by idx_mv_trader_leaderboard_search below)
+    for column in ('pnl_30d', 'pnl_total', 'total_volume_usd', 'win_rate_7d'):
+        op.execute(f'CREATE INDEX idx_mv_trader_leaderboard_{column} ON mv_trader_leaderboard ({column} DESC) WHERE is_active')
+    op.execute('CREATE INDEX idx_mv_trader_leaderboard_sharpe_ratio ON mv_trader_leaderboard (sharpe_ratio DESC NULLS LAST) WHERE is_active')
+    # /traders/search and the default pnl_7d leaderboard: the key is the full
+    # ORDER BY / keyset cursor (pnl_7d, wallet_address), so pages come off the
+    # index with no sort; filter columns and the rest of the projection are
+    # INCLUDEd and checked on the index tuple, so both are index-only scans
+    op.execute("""
+        CREATE INDEX idx_mv_trader_leaderboard_search ON mv_trader_leaderboard
+            (pnl_7d DESC, wallet_address DESC)
+            INCLUDE (win_rate_7d, total_trades, pnl_30d, pnl_total, win_rate_30d, sharpe_ratio, last_trade_at, categories)
+            WHERE is_active
+    """)
+    # Category listings filter with categories @> '["<name>"]'
+    op.execute('CREATE INDEX idx_mv_trader_leaderboard_categories ON mv_trader_leaderboard USING gin (categories jsonb_path_ops) WHERE is_active')
+    # /traders/search?q= matches wallet_address ILIKE '%q%'; trigrams make the
+    # infix match indexable instead of a per-row string scan
+    op.execute('CREATE INDEX idx_mv_trader_leaderboard_wallet_trgm ON mv_trader_leaderboard USING gin (wallet_address gin_trgm_ops) WHERE is_active')
+
+
+def downgrade() -> None:
+    """Restore the 001 schema (compressed trades chunks are decompressed first)"""
+    
+    # Views
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS mv_trader_leaderboard')
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS v_user_portfolio')
+    op.execute('DROP VIEW IF EXISTS v_active_copy_relationships')
+    
+    # TimescaleDB
+    op.execute("SELECT remove_retention_policy('trades', if_exists => TRUE)")
+    op.execute("SELECT remove_compression_policy('trades', if_exists => TRUE)")
+    op.execute("SELECT decompress_chunk(chunk, if_compressed => TRUE) FROM show_chunks('trades') AS chunk")
+    op.execute("SELECT disable_chunk_skipping('trades', 'id')")
+    op.execute('ALTER TABLE trades SET (timescaledb.compress = false)')
+    op.execute("SELECT set_chunk_time_interval('trades', INTERVAL '7 days')")
+    
+    # Indexes
+    op.execute('DROP INDEX IF EXISTS idx_trades_user_closed')
+    op.execute('DROP INDEX IF EXISTS idx_trades_user_open')
+    op.execute('DROP INDEX IF EXISTS idx_trades_entry_ts_brin')
+    with op.get_context().autocommit_block():
+        for index_name in (
+            'idx_trade_queue_processing', 'idx_trade_queue_pending', 'idx_copy_rel_active_user',
+            'idx_traders_win_rate', 'idx_traders_total_pnl', 'idx_traders_pnl_7d_covering',
+            'idx_api_keys_key_hash', 'idx_users_tier_paid',
+        ):
+            op.drop_index(index_name, postgresql_concurrently=True, if_exists=True)
+    
+    # Storage parameters
+    op.execute('ALTER TABLE trades RESET (parallel_workers)')
+    for table_name in FILLFACTOR_TABLES:
+        op.execute(
+            f'ALTER TABLE {table_name} RESET (fillfactor, '
+            'autovacuum_vacuum_scale_factor, autovacuum_analyze_scale_factor)'
+        )
+    
+    op.execute('CREATE TRIGGER update_trades_updated_at BEFORE UPDATE ON trades FOR EACH ROW EXECUTE FUNCTION update_updated_at_column()')
+    
+    # Ids
+    op.execute('ALTER TABLE trades ALTER COLUMN id DROP DEFAULT')
+    op.execute('DROP SEQUENCE IF EXISTS trades_id_seq')
+    for table_name in ('polymarket_api_keys', 'trade_queue'):
+        op.execute(
+            "DO $$ BEGIN EXECUTE format('ALTER SEQUENCE %s CACHE 1', "
+            f"pg_get_serial_sequence('{table_name}', 'id')); END $$"
+        )
+    
+    # Column types
+    for table_name, column in TX_HASH_COLUMNS:
+        op.drop_constraint(f'{table_name}_{column}_length', table_name, type_='check')
+    
+    op.drop_column('traders', 'categories')
+    op.drop_column('traders', 'pnl_30d')
+    
+    for table_name, column, precision, scale in FLOAT_COLUMNS:
+        op.execute(f'ALTER TABLE {table_name} ALTER COLUMN {column} TYPE NUMERIC({precision}, {scale})')
+    
+    for table_name, column in TX_HASH_COLUMNS:
+        op.execute(
+            f'ALTER TABLE {table_name} ALTER COLUMN {column} '
+            f"TYPE VARCHAR(66) USING '0x' || encode({column}, 'hex')"
+        )
+    
+    for table_name, column, type_name, default, length, check in ENUM_COLUMNS:
+        if default:
+            op.alter_column(table_name, column, server_default=None)
+        op.execute(
+            f'ALTER TABLE {table_name} ALTER COLUMN {column} '
+            f'TYPE VARCHAR({length}) USING {column}::text'
+        )
+        if default:
+            op.alter_column(table_name, column, server_default=default)
+    
+    for type_name in ENUM_TYPES:
+        op.execute(f'DROP TYPE IF EXISTS {type_name}')
+    
+    # 001 indexes
+    op.create_index('idx_users_tier', 'users', ['subscription_tier'])
+    op.create_index('idx_api_keys_key_hash', 'polymarket_api_keys', ['key_hash'])
+    op.create_index('idx_traders_wallet', 'traders', ['wallet_address'])
+    op.create_index('idx_traders_pnl_7d', 'traders', [sa.text('pnl_7d DESC')])
+    op.create_index('idx_traders_total_pnl', 'traders', [sa.text('total_pnl DESC')])
+    op.create_index('idx_traders_win_rate', 'traders', [sa.text('win_rate DESC')])
+    op.create_index('idx_trades_entry_timestamp', 'trades', [sa.text('entry_timestamp DESC')])
+    op.create_index('idx_trade_queue_status_priority', 'trade_queue', ['status', 'priority', 'created_at'],
+                    postgresql_where=sa.text("status IN ('pending', 'processing')"))
+    
+    # 001 CHECK constraints, added after the indexes as in upgrade()
+    with op.get_context().autocommit_block():
+        for table_name, column, type_name, _, _, check in ENUM_COLUMNS:
+            if not check:
+                continue
+            labels = ', '.join(f"'{value}'" for value in ENUM_TYPES[type_name])
+            definition = f'CHECK ({column} IN ({labels}))'
+            if table_name == 'trades':
+                op.execute(f'ALTER TABLE trades ADD CONSTRAINT {check} {definition}')
+            else:
+                _add_constraint(table_name, check, definition)
+    
+    # 001 views
+    op.execute(V_ACTIVE_COPY_RELATIONSHIPS.format(trader_filter=''))
+    op.execute(f'CREATE OR REPLACE VIEW v_user_portfolio AS {V_USER_PORTFOLIO_QUERY}')
+    
+    _set_database('jit', None)
+    _set_database('max_parallel_workers_per_gather', None)
+    _set_database('max_parallel_workers', None)
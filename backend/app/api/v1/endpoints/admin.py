@@ -187,19 +187,16 @@ async def get_risk_metrics(
     """
     risk_service = get_risk_management_service()
     
-    # Get circuit breaker status
-    is_circuit_breaker_active = await risk_service.is_circuit_breaker_active()
+    # Circuit breaker, paused traders and cooling users in one Redis round trip
+    snapshot = await risk_service.get_risk_snapshot()
     
     # Check failure rate
     should_trigger, failure_rate = await risk_service.check_failure_rate(db)
     
-    # Get paused traders (would query Redis)
-    paused_traders_count = 0
-    
     return {
-        "circuit_breaker_active": is_circuit_breaker_active,
+        "circuit_breaker_active": snapshot["circuit_breaker_active"],
         "failure_rate_last_hour": f"{failure_rate * 100:.1f}%",
-        "paused_traders": paused_traders_count,
-        "users_in_cooling_period": 0,  # TODO: Count from Redis
+        "paused_traders": snapshot["paused_traders"],
+        "users_in_cooling_period": snapshot["users_in_cooling_period"],
         "recent_risk_events": []  # TODO: Query from audit log
     }
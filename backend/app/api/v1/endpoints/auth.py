@@ -157,11 +157,11 @@ async def register(
         )
     
     # Check if email already exists
-    query = select(User).where(User.email == request.email)
+    query = select(User.id).where(User.email == request.email)
     result = await db.execute(query)
-    existing_user = result.scalar_one_or_none()
+    existing_user_id = result.scalar_one_or_none()
     
-    if existing_user:
+    if existing_user_id is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
@@ -169,16 +169,16 @@ async def register(
     
     # Check username if provided
     if request.username:
-        query = select(User).where(User.username == request.username)
+        query = select(User.id).where(User.username == request.username)
         result = await db.execute(query)
-        if result.scalar_one_or_none():
+        if result.scalar_one_or_none() is not None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already taken"
             )
     
     # Hash password
-    hashed_password = auth_service.hash_password(request.password)
+    hashed_password = await auth_service.hash_password_async(request.password)
     
     # Create user
     new_user = User(
@@ -247,6 +247,8 @@ async def login(
     user = result.scalar_one_or_none()
     
     if not user:
+        # Take as long as a wrong password would (no account enumeration)
+        await auth_service.verify_dummy_password_async(request.password)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
@@ -260,7 +262,7 @@ async def login(
         )
     
     # Verify password
-    if not auth_service.verify_password(request.password, user.password_hash):
+    if not await auth_service.verify_password_async(request.password, user.password_hash):
         # Increment failed attempts
         user.failed_login_attempts = (user.failed_login_attempts or 0) + 1
         
@@ -451,7 +453,7 @@ async def reset_password(
         )
     
     # Hash new password
-    new_hash = auth_service.hash_password(request.new_password)
+    new_hash = await auth_service.hash_password_async(request.new_password)
     
     # Update password
     user.password_hash = new_hash
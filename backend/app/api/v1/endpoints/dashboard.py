@@ -9,13 +9,14 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, desc, func
+from sqlalchemy import Float, select, and_, desc, func, cast
 from pydantic import BaseModel, Field, validator
 
 from app.db.session import get_db
 from app.models.api_key import User, Trade
 from app.api.v1.endpoints.auth import get_current_user
-from app.services.subscription import get_subscription_service, SubscriptionTier
+from app.api.v1.endpoints.traders import ChartTimeframe, TradeStatusFilter, get_daily_pnl
+from app.services.subscription import get_subscription_service
 
 
 router = APIRouter(prefix="/user", tags=["dashboard"])
@@ -90,7 +91,7 @@ class Position(BaseModel):
     """Open position"""
     id: int
     market_id: str
-    market_name: Optional[str]
+    market_name: Optional[str] = None  # Would fetch from cache
     
     outcome: str  # YES/NO
     quantity: float
@@ -249,11 +250,7 @@ async def create_copy_relationship(
     subscription_service = get_subscription_service()
     
     # Get current tier
-    tier = SubscriptionTier(
-        current_user.subscription_tier 
-        if hasattr(current_user, 'subscription_tier') 
-        else 'free'
-    )
+    tier = current_user.tier
     
     # Check subscription limits
     # Get current count (would query copy_relationships table)
@@ -267,11 +264,11 @@ async def create_copy_relationship(
         )
     
     # Verify trader exists
-    query = select(User).where(User.wallet_address == request.trader_address)
+    query = select(User.id).where(User.wallet_address == request.trader_address)
     result = await db.execute(query)
-    trader = result.scalar_one_or_none()
+    trader_id = result.scalar_one_or_none()
     
-    if not trader:
+    if trader_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Trader not found"
@@ -360,7 +357,26 @@ async def get_positions(
     - Open positions with current prices
     - Unrealized P&L
     """
-    query = select(Trade).where(
+    # Defaults for not-yet-marked positions are applied in SQL, and numerics
+    # come back as float8, so rows validate straight into Position
+    current_value = func.coalesce(Trade.current_value_usd, Trade.entry_value_usd)
+    unrealized_pnl = func.coalesce(Trade.unrealized_pnl_usd, 0.0)
+    
+    query = select(
+        Trade.id,
+        Trade.market_id,
+        Trade.position.label('outcome'),
+        cast(Trade.quantity, Float).label('quantity'),
+        cast(Trade.entry_price, Float).label('entry_price'),
+        cast(func.coalesce(Trade.exit_price, Trade.entry_price), Float).label('current_price'),
+        cast(Trade.entry_value_usd, Float).label('entry_value_usd'),
+        cast(current_value, Float).label('current_value_usd'),
+        unrealized_pnl.label('unrealized_pnl_usd'),
+        func.coalesce(
+            unrealized_pnl / func.nullif(cast(Trade.entry_value_usd, Float), 0.0, type_=Float) * 100, 0.0
+        ).label('unrealized_pnl_percent'),
+        Trade.entry_timestamp,
+    ).where(
         and_(
             Trade.trader_wallet_address == current_user.wallet_address,
             Trade.status == 'open'
@@ -368,25 +384,11 @@ async def get_positions(
     ).order_by(desc(Trade.entry_timestamp))
     
     result = await db.execute(query)
-    trades = result.scalars().all()
     
-    positions = []
-    for trade in trades:
-        positions.append(Position(
-            id=trade.id,
-            market_id=trade.market_id,
-            market_name=None,  # Would fetch from cache
-            outcome=trade.position,
-            quantity=float(trade.quantity),
-            entry_price=float(trade.entry_price),
-            current_price=float(trade.exit_price) if trade.exit_price else float(trade.entry_price),
-            entry_value_usd=float(trade.entry_value_usd),
-            current_value_usd=float(trade.current_value_usd) if hasattr(trade, 'current_value_usd') else float(trade.entry_value_usd),
-            unrealized_pnl_usd=float(trade.unrealized_pnl_usd) if hasattr(trade, 'unrealized_pnl_usd') else 0.0,
-            unrealized_pnl_percent=float(trade.unrealized_pnl_percent) if hasattr(trade, 'unrealized_pnl_percent') else 0.0,
-            copied_from=None,  # Would fetch from relationship
-            entry_timestamp=trade.entry_timestamp
-        ))
+    positions = [
+        Position.model_validate(row, from_attributes=True)
+        for row in result.all()
+    ]
     
     return positions
 
@@ -395,7 +397,7 @@ async def get_positions(
 async def get_trades(
     limit: int = Query(50, ge=1, le=500),
     offset: int = Query(0, ge=0),
-    status: Optional[str] = Query(None, regex="^(open|closed)$"),
+    status: Optional[TradeStatusFilter] = Query(None),
     market_id: Optional[str] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
@@ -517,7 +519,7 @@ async def get_trade_details(
 
 @router.get("/analytics/pnl-chart")
 async def get_pnl_chart(
-    timeframe: str = Query("30d", regex="^(7d|30d|90d|all)$"),
+    timeframe: ChartTimeframe = Query("30d"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -526,39 +528,18 @@ async def get_pnl_chart(
     
     **Timeframes:** 7d, 30d, 90d, all
     """
-    # Use same logic as trader performance endpoint
-    days_map = {"7d": 7, "30d": 30, "90d": 90, "all": None}
-    days = days_map.get(timeframe)
-    
-    query = select(Trade).where(Trade.trader_wallet_address == current_user.wallet_address)
-    
-    if days:
-        cutoff = datetime.utcnow() - timedelta(days=days)
-        query = query.where(Trade.entry_timestamp >= cutoff)
-    
-    query = query.order_by(Trade.entry_timestamp)
-    
-    result = await db.execute(query)
-    trades = result.scalars().all()
-    
-    # Group by date
-    from collections import defaultdict
-    daily_pnl = defaultdict(float)
-    
-    for trade in trades:
-        if trade.exit_timestamp and trade.realized_pnl_usd:
-            date_key = trade.exit_timestamp.date().isoformat()
-            daily_pnl[date_key] += float(trade.realized_pnl_usd)
+    # Same daily grouping as the trader performance endpoint
+    daily_data = await get_daily_pnl(db, current_user.wallet_address, timeframe)
     
     # Build data points
     data_points = []
     cumulative = 0
     
-    for date in sorted(daily_pnl.keys()):
-        cumulative += daily_pnl[date]
+    for date, day in daily_data.items():
+        cumulative += day["pnl"]
         data_points.append({
             "date": date,
-            "pnl": round(daily_pnl[date], 2),
+            "pnl": round(day["pnl"], 2),
             "cumulative_pnl": round(cumulative, 2)
         })
     
@@ -4,21 +4,26 @@ Leaderboard API Endpoints
 FastAPI endpoints for accessing trader leaderboard.
 """
 
-from typing import Optional
-from fastapi import APIRouter, Depends, Query
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi_cache.decorator import cache
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import query_key_builder
 from app.db.session import get_db
-from app.services.leaderboard import get_leaderboard_service, get_pnl_calculator
+from app.services.leaderboard import get_leaderboard_service
 
 
 router = APIRouter(prefix="/leaderboard", tags=["leaderboard"])
 
+RankBy = Literal["pnl_7d", "pnl_30d", "pnl_total", "win_rate_7d", "sharpe"]
+
 
 @router.get("/top")
+@cache(expire=30, namespace="lb", key_builder=query_key_builder("limit", "rank_by"))
 async def get_top_traders(
     limit: int = Query(100, ge=1, le=500),
-    rank_by: str = Query("pnl_7d", regex="^(pnl_7d|pnl_30d|pnl_total|win_rate_7d|sharpe)$"),
+    rank_by: RankBy = Query("pnl_7d"),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -59,32 +64,23 @@ async def get_trader_stats(
     
     **Returns:**
     - Trader stats including P&L, win rate, rank
+    
+    **Raises:**
+    - 404: Trader not found
     """
-    pnl_calculator = get_pnl_calculator()
     leaderboard = get_leaderboard_service()
     
-    # Get rolling P&L
-    stats = await pnl_calculator.calculate_rolling_pnl(db, wallet_address)
+    # Stats and rank in a single round trip
+    stats = await leaderboard.get_stats_with_rank(db, wallet_address)
     
-    # Get rank
-    rank = await leaderboard.get_trader_rank(db, wallet_address)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Trader not found")
     
-    return {
-        "wallet_address": wallet_address,
-        "rank": rank,
-        "pnl_7d": float(stats['pnl_7d']),
-        "pnl_30d": float(stats['pnl_30d']),
-        "pnl_all_time": float(stats['pnl_all_time']),
-        "win_rate_7d": stats['win_rate_7d'],
-        "win_rate_30d": stats['win_rate_30d'],
-        "win_rate_all_time": stats['win_rate_all_time'],
-        "total_trades_7d": stats['total_trades_7d'],
-        "total_trades_30d": stats['total_trades_30d'],
-        "total_trades_all_time": stats['total_trades_all_time']
-    }
+    return stats
 
 
 @router.get("/trending")
+@cache(expire=60, namespace="lb", key_builder=query_key_builder("limit"))
 async def get_trending_traders(
     limit: int = Query(10, ge=1, le=50),
     db: AsyncSession = Depends(get_db)
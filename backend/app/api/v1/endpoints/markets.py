@@ -4,10 +4,14 @@ Market Cache API Endpoints
 FastAPI endpoints for accessing cached market data.
 """
 
+from datetime import datetime
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from fastapi_cache.decorator import cache
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
+from app.core.cache import query_key_builder
 from app.services.cache.market_cache import get_market_cache_service, MarketInfo
 
 
@@ -16,16 +20,23 @@ router = APIRouter(prefix="/markets", tags=["markets"])
 
 class MarketResponse(BaseModel):
     """Market information response"""
+    # Validated straight from MarketInfo attributes, no intermediate dict
+    model_config = ConfigDict(from_attributes=True)
+    
     market_id: str
     name: str
     question: str
-    end_date: str
+    end_date: datetime
     yes_price: float
     no_price: float
     volume_24h: float
     liquidity: float
     is_active: bool
-    last_updated: str
+    last_updated: datetime
+
+
+# Validates a whole list of MarketInfo in one call
+_market_list_adapter = TypeAdapter(list[MarketResponse])
 
 
 class PriceResponse(BaseModel):
@@ -52,6 +63,10 @@ async def get_markets(
     """
     Get all active markets.
     
+    The JSON array is streamed in batches as markets are read from the
+    cache, so memory stays flat and the first bytes go out before the
+    last market is loaded.
+    
     **Parameters:**
     - `limit`: Maximum markets to return (optional)
     - `use_cache`: Whether to use cache (default: true)
@@ -66,18 +81,22 @@ async def get_markets(
     """
     cache = get_market_cache_service()
     
-    markets = await cache.get_all_markets(use_cache=use_cache)
+    async def iter_markets():
+        yield b"["
+        first = True
+        async for batch in cache.iter_market_payloads(
+            chunk=64, limit=limit, use_cache=use_cache
+        ):
+            for payload in batch:
+                yield payload if first else b"," + payload
+                first = False
+        yield b"]"
     
-    if limit:
-        markets = markets[:limit]
-    
-    return [
-        MarketResponse(**market.to_dict())
-        for market in markets
-    ]
+    return StreamingResponse(iter_markets(), media_type="application/json")
 
 
 @router.get("/trending", response_model=list[MarketResponse])
+@cache(expire=30, namespace="markets", key_builder=query_key_builder("limit"))
 async def get_trending_markets(
     limit: int = Query(10, ge=1, le=50)
 ):
@@ -94,10 +113,7 @@ async def get_trending_markets(
     
     markets = await cache.get_trending_markets(limit=limit)
     
-    return [
-        MarketResponse(**market.to_dict())
-        for market in markets
-    ]
+    return _market_list_adapter.validate_python(markets)
 
 
 @router.get("/{market_id}", response_model=MarketResponse)
@@ -120,12 +136,18 @@ async def get_market(
     """
     cache = get_market_cache_service()
     
-    market = await cache.get_market(market_id, use_cache=use_cache)
+    # Cache hit: the cached JSON is already the response body
+    if use_cache:
+        payload = await cache.get_market_payload(market_id)
+        if payload:
+            return Response(content=payload, media_type="application/json")
+    
+    market = await cache.get_market(market_id, use_cache=False)
     
     if not market:
         raise HTTPException(status_code=404, detail="Market not found")
     
-    return MarketResponse(**market.to_dict())
+    return MarketResponse.model_validate(market)
 
 
 @router.get("/{market_id}/price", response_model=PriceResponse)
@@ -150,6 +172,11 @@ async def get_market_price(market_id: str):
     """
     cache = get_market_cache_service()
     
+    # Cache hit: the cached JSON is already the response body
+    payload = await cache.get_market_price_payload(market_id)
+    if payload:
+        return Response(content=payload, media_type="application/json")
+    
     prices = await cache.get_market_price(market_id)
     
     if not prices:
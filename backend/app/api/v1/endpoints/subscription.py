@@ -5,24 +5,29 @@ Manage user subscriptions, usage tracking, and upgrades.
 """
 
 from typing import Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from pydantic import BaseModel
+import orjson
 
 from app.db.session import get_db
 from app.models.api_key import User
 from app.api.v1.endpoints.auth import get_current_user
 from app.services.subscription.subscription_service import (
-    get_subscription_service,
-    SubscriptionTier
+    SubscriptionTier,
+    TIER_LIMITS,
+    TIER_PRICES
 )
 
 
 router = APIRouter(prefix="/user/subscription", tags=["subscription"])
 
+# Billing period length
+_THIRTY_DAYS = timedelta(days=30)
+
 
 # ============================================================================
 # Request/Response Models
@@ -80,13 +85,40 @@ class UpgradeRequest(BaseModel):
 # Helper Functions
 # ============================================================================
 
+# Metered resources: (response field, usage key, TierLimits field, warning)
+_USAGE_METERS = (
+    ("copy_traders_usage_percent", "copy_traders_count", "max_copy_traders",
+     "Copy traders: {:.1f}% of limit used"),
+    ("volume_usage_percent", "monthly_volume_usd", "max_monthly_volume_usd",
+     "Monthly volume: {:.1f}% of limit used"),
+    ("api_calls_usage_percent", "api_calls_today", "max_api_calls_per_day",
+     "API calls: {:.1f}% of daily limit used"),
+)
+
+_ZERO_USAGE_PERCENTS = {field: 0.0 for field, _, _, _ in _USAGE_METERS}
+
+
+def _tier_usage_meters(tier: SubscriptionTier) -> tuple:
+    """Meters that apply to a tier with its limit pre-bound; unlimited ones are dropped"""
+    limits = TIER_LIMITS[tier]
+    return tuple(
+        (field, usage_key, float(getattr(limits, limit_field)), warning)
+        for field, usage_key, limit_field, warning in _USAGE_METERS
+        if getattr(limits, limit_field)
+    )
+
+
+# Specialized once per tier so /usage only evaluates meters that can fire
+_TIER_USAGE_METERS = {tier: _tier_usage_meters(tier) for tier in SubscriptionTier}
+
+
 async def get_monthly_usage(
     db: AsyncSession,
-    user_id: int
+    user_id: int,
+    now: datetime
 ) -> dict:
     """Get user's current month usage"""
     # Calculate period
-    now = datetime.utcnow()
     period_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
     
     # In production, query user_usage table
@@ -96,7 +128,7 @@ async def get_monthly_usage(
         "monthly_volume_usd": Decimal('0'),
         "api_calls_today": 0,
         "period_start": period_start,
-        "period_end": period_start + timedelta(days=30)
+        "period_end": period_start + _THIRTY_DAYS
     }
 
 
@@ -116,19 +148,16 @@ async def get_subscription(
     - Renewal date
     - Available features
     """
-    subscription_service = get_subscription_service()
-    
-    # Get user's tier (from database in production)
-    tier = SubscriptionTier(current_user.subscription_tier if hasattr(current_user, 'subscription_tier') else 'free')
-    limits = subscription_service.get_tier_limits(tier)
-    price = subscription_service.get_tier_price(tier)
+    tier = current_user.tier
+    limits = TIER_LIMITS[tier]
+    price = TIER_PRICES[tier]
     
     # Calculate renewal date
     started_at = current_user.created_at
     renews_at = None
     if tier != SubscriptionTier.FREE:
         # Monthly renewal
-        renews_at = started_at + timedelta(days=30)
+        renews_at = started_at + _THIRTY_DAYS
     
     return SubscriptionResponse(
         tier=tier.value,
@@ -158,44 +187,21 @@ async def get_usage(
     - Usage percentages
     - Limit warnings
     """
-    subscription_service = get_subscription_service()
-    
     # Get tier and limits
-    tier = SubscriptionTier(current_user.subscription_tier if hasattr(current_user, 'subscription_tier') else 'free')
-    limits = subscription_service.get_tier_limits(tier)
+    tier = current_user.tier
+    limits = TIER_LIMITS[tier]
     
     # Get usage
-    usage = await get_monthly_usage(db, current_user.id)
-    
-    # Calculate percentages
-    def calc_percent(current, maximum):
-        if maximum is None:
-            return 0  # Unlimited
-        return (current / maximum * 100) if maximum > 0 else 0
-    
-    copy_percent = calc_percent(
-        usage['copy_traders_count'],
-        limits.max_copy_traders
-    )
-    
-    volume_percent = calc_percent(
-        float(usage['monthly_volume_usd']),
-        float(limits.max_monthly_volume_usd) if limits.max_monthly_volume_usd else None
-    )
+    usage = await get_monthly_usage(db, current_user.id, datetime.now(timezone.utc))
     
-    api_percent = calc_percent(
-        usage['api_calls_today'],
-        limits.max_api_calls_per_day
-    )
-    
-    # Generate warnings
+    # Usage percentages and warnings for this tier's limited resources
+    percents = dict(_ZERO_USAGE_PERCENTS)
     warnings = []
-    if copy_percent >= 80:
-        warnings.append(f"Copy traders: {copy_percent:.1f}% of limit used")
-    if volume_percent >= 80:
-        warnings.append(f"Monthly volume: {volume_percent:.1f}% of limit used")
-    if api_percent >= 80:
-        warnings.append(f"API calls: {api_percent:.1f}% of daily limit used")
+    for field, usage_key, limit, warning in _TIER_USAGE_METERS[tier]:
+        percent = float(usage[usage_key]) / limit * 100
+        percents[field] = percent
+        if percent >= 80:
+            warnings.append(warning.format(percent))
     
     return UsageResponse(
         period_start=usage['period_start'],
@@ -206,10 +212,8 @@ async def get_usage(
         max_copy_traders=limits.max_copy_traders,
         max_monthly_volume_usd=float(limits.max_monthly_volume_usd) if limits.max_monthly_volume_usd else None,
         max_api_calls_per_day=limits.max_api_calls_per_day,
-        copy_traders_usage_percent=copy_percent,
-        volume_usage_percent=volume_percent,
-        api_calls_usage_percent=api_percent,
-        warnings=warnings
+        warnings=warnings,
+        **percents
     )
 
 
@@ -234,8 +238,6 @@ async def upgrade_subscription(
     - Subscription details
     - Payment confirmation (mock)
     """
-    subscription_service = get_subscription_service()
-    
     # Validate tier
     try:
         target_tier = SubscriptionTier(request.target_tier)
@@ -246,11 +248,7 @@ async def upgrade_subscription(
         )
     
     # Get current tier
-    current_tier = SubscriptionTier(
-        current_user.subscription_tier 
-        if hasattr(current_user, 'subscription_tier') 
-        else 'free'
-    )
+    current_tier = current_user.tier
     
     # Validate upgrade path
     if target_tier == current_tier:
@@ -266,7 +264,7 @@ async def upgrade_subscription(
         )
     
     # Get pricing
-    price = subscription_service.get_tier_price(target_tier)
+    price = TIER_PRICES[target_tier]
     
     # TODO: Phase 4 - Integrate with Stripe
     # stripe_response = await process_stripe_subscription(
@@ -279,10 +277,12 @@ async def upgrade_subscription(
     payment_success = True
     
     if payment_success:
+        now = datetime.now(timezone.utc)
+        
         # Update user's subscription
-        current_user.subscription_tier = target_tier.value
+        current_user.subscription_tier = target_tier.db_value
         current_user.subscription_status = "active"
-        current_user.subscription_started_at = datetime.utcnow()
+        current_user.subscription_started_at = now
         await db.commit()
         
         return {
@@ -290,7 +290,7 @@ async def upgrade_subscription(
             "message": f"Upgraded to {target_tier.value} tier",
             "tier": target_tier.value,
             "price_monthly": float(price),
-            "next_billing_date": (datetime.utcnow() + timedelta(days=30)).isoformat(),
+            "next_billing_date": (now + _THIRTY_DAYS).isoformat(),
             "payment_method": "mock_payment_method"  # Placeholder
         }
     else:
@@ -317,24 +317,16 @@ async def cancel_subscription(
     
     return {
         "message": "Subscription cancelled. Access continues until end of billing period.",
-        "access_until": (datetime.utcnow() + timedelta(days=30)).isoformat()
+        "access_until": (datetime.now(timezone.utc) + _THIRTY_DAYS).isoformat()
     }
 
 
-@router.get("/plans")
-async def list_subscription_plans():
-    """
-    List all available subscription plans.
-    
-    **Returns:**
-    - All tiers with pricing and features
-    """
-    subscription_service = get_subscription_service()
-    
+def _build_plans() -> list[dict]:
+    """Serializable description of every tier (static)"""
     plans = []
     for tier in SubscriptionTier:
-        limits = subscription_service.get_tier_limits(tier)
-        price = subscription_service.get_tier_price(tier)
+        limits = TIER_LIMITS[tier]
+        price = TIER_PRICES[tier]
         
         plans.append({
             "tier": tier.value,
@@ -348,4 +340,19 @@ async def list_subscription_plans():
             "features": limits.features
         })
     
-    return {"plans": plans}
+    return plans
+
+
+# Plans never change at runtime, so the response body is serialized once
+_PLANS_JSON = orjson.dumps({"plans": _build_plans()})
+
+
+@router.get("/plans")
+async def list_subscription_plans():
+    """
+    List all available subscription plans.
+    
+    **Returns:**
+    - All tiers with pricing and features
+    """
+    return Response(content=_PLANS_JSON, media_type="application/json")
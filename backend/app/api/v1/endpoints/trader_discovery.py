@@ -4,20 +4,35 @@ Trader Search & Discovery Endpoints
 Comprehensive search, filtering, and recommendation system for discovering traders.
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Callable
 from datetime import datetime, timedelta
 from decimal import Decimal
-from fastapi import APIRouter, Depends, Query, HTTPException
+import base64
+import math
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, HTTPException
+from fastapi.responses import Response
+from fastapi_cache import FastAPICache
+from fastapi_cache.decorator import cache
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func, desc, text
+from sqlalchemy import Float, Select, select, and_, or_, func, cast, lambda_stmt
 from pydantic import BaseModel, Field
+from loguru import logger
+import orjson
 
+from app.core.cache import query_key_builder
+from app.core.config import settings
+from app.db.estimates import estimate_row_count
 from app.db.session import get_db
-from app.models.api_key import Trade, User
+from app.models.api_key import trader_leaderboard
+from app.services.leaderboard import CATEGORIES
 
 
 router = APIRouter(prefix="/traders", tags=["trader-discovery"])
 
+# Search totals above this are reported from planner statistics unless
+# exact_count is requested
+APPROX_COUNT_THRESHOLD = 10_000
+
 
 # ============================================================================
 # Request/Response Models
@@ -54,6 +69,54 @@ class TraderSearchResult(BaseModel):
     categories: List[str] = []
 
 
+class TraderSearchResponse(BaseModel):
+    """Page of trader search results"""
+    query: Optional[str] = None
+    total: Optional[int] = None  # None on cursor pages
+    total_is_estimate: bool = False
+    limit: int
+    offset: int
+    has_more: bool
+    next_cursor: Optional[str] = None
+    results: List[TraderSearchResult]
+
+
+class CategoryTrader(BaseModel):
+    """Trader in a category listing"""
+    wallet_address: str
+    pnl_7d: float
+    pnl_30d: float
+    win_rate_7d: float
+    total_trades: int
+
+
+class CategoryTradersResponse(BaseModel):
+    """Page of traders in a category"""
+    category: str
+    description: str
+    total: int
+    limit: int
+    offset: int
+    has_more: bool
+    traders: List[CategoryTrader]
+
+
+class TraderRecommendation(BaseModel):
+    """Recommended trader"""
+    wallet_address: str
+    pnl_7d: float
+    win_rate_7d: float
+    total_trades: int
+    categories: List[str] = []
+    reason: str
+
+
+class RecommendationsResponse(BaseModel):
+    """Trader recommendations"""
+    count: int
+    recommendations: List[TraderRecommendation]
+
+
 class FilterMetadata(BaseModel):
     """Available filter ranges"""
     pnl_7d_range: Dict[str, float]
@@ -77,49 +140,162 @@ class CategoryInfo(BaseModel):
 # Helper Functions
 # ============================================================================
 
-def categorize_trader(
-    pnl_7d: float,
-    pnl_30d: float,
-    win_rate_7d: float,
-    total_trades: int,
-    sharpe_ratio: Optional[float]
-) -> List[str]:
+def encode_search_cursor(pnl_7d: float, wallet_address: str) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor"""
+    return base64.urlsafe_b64encode(orjson.dumps([pnl_7d, wallet_address])).decode()
+
+
+def decode_search_cursor(cursor: str) -> Tuple[Decimal, str]:
+    """
+    Decode a search cursor back into its (pnl_7d, wallet_address) key.
+    
+    Raises:
+        HTTPException: 400 if the cursor is malformed or tampered with
+    """
+    try:
+        pnl_7d, wallet_address = orjson.loads(base64.urlsafe_b64decode(cursor))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    # Only what encode_search_cursor produces: a finite number and a string
+    if (
+        isinstance(pnl_7d, bool)
+        or not isinstance(pnl_7d, (int, float))
+        or not math.isfinite(pnl_7d)
+        or not isinstance(wallet_address, str)
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    # Compare as NUMERIC (repr round-trips the float exactly) so the
+    # predicate stays on the pnl_7d index
+    return Decimal(repr(float(pnl_7d))), wallet_address
+
+
+def split_total_count(rows: List[Any]) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Split the `total_count` window column (COUNT(*) OVER ()) off page rows.
+    
+    Returns:
+        (row dicts without total_count, total matching rows)
+    """
+    items = []
+    for row in rows:
+        item = row._asdict()
+        del item["total_count"]
+        items.append(item)
+    
+    return items, (rows[0].total_count if rows else 0)
+
+
+def search_criteria(
+    q: Optional[str] = None,
+    min_pnl_7d: Optional[float] = None,
+    min_pnl_30d: Optional[float] = None,
+    min_winrate: Optional[float] = None,
+    min_trades: Optional[int] = None,
+    max_loss: Optional[float] = None,
+    min_sharpe: Optional[float] = None,
+    active_last_days: Optional[int] = None,
+) -> List[Callable[[Select], Select]]:
     """
-    Auto-categorize trader based on performance metrics.
+    Build the search filters as statement lambdas.
     
-    Returns list of category names.
+    Each filter is its own lambda, so a lambda_stmt composed from them is
+    cached per combination of filters: the expression tree is built and
+    compiled once, later requests only extract the closure values as bound
+    parameters.
     """
-    categories = []
+    lb = trader_leaderboard.c
+    criteria = []
+    
+    if min_pnl_7d is not None:
+        criteria.append(lambda s: s.where(lb.pnl_7d >= min_pnl_7d))
+    
+    if min_pnl_30d is not None:
+        criteria.append(lambda s: s.where(lb.pnl_30d >= min_pnl_30d))
+    
+    if min_winrate is not None:
+        criteria.append(lambda s: s.where(lb.win_rate_7d >= min_winrate))
     
-    # Consistent Winners
-    if win_rate_7d >= 65 and pnl_7d > 0 and pnl_30d > 0:
-        categories.append("Consistent Winners")
+    if min_trades is not None:
+        criteria.append(lambda s: s.where(lb.total_trades >= min_trades))
     
-    # High Volume
-    if total_trades >= 100:
-        categories.append("High Volume")
+    if max_loss is not None:
+        # Filter out traders with losses exceeding threshold
+        min_pnl_total = -max_loss
+        criteria.append(lambda s: s.where(lb.pnl_total >= min_pnl_total))
     
-    # New & Rising
-    if total_trades < 50 and pnl_7d > 500:
-        categories.append("New & Rising")
+    if min_sharpe is not None:
+        criteria.append(lambda s: s.where(
+            and_(
+                lb.sharpe_ratio.isnot(None),
+                lb.sharpe_ratio >= min_sharpe
+            )
+        ))
     
-    # Top Performers
-    if pnl_30d > 5000:
-        categories.append("Top Performers")
+    if active_last_days:
+        cutoff = datetime.utcnow() - timedelta(days=active_last_days)
+        criteria.append(lambda s: s.where(lb.last_trade_at >= cutoff))
     
-    # Risk Managers
-    if sharpe_ratio and sharpe_ratio > 2.0:
-        categories.append("Risk Managers")
+    # Search by wallet address (applied after the cheap range filters; the
+    # infix match is served by the wallet_address trigram index)
+    if q:
+        # Support partial wallet address search
+        pattern = f"%{q}%"
+        criteria.append(lambda s: s.where(lb.wallet_address.ilike(pattern)))
     
-    # Active Traders
-    if total_trades >= 20:  # Would check last_7d in real implementation
-        categories.append("Active Traders")
+    return criteria
+
+
+def search_matches(criteria: List[Callable[[Select], Select]], count: bool = False):
+    """Statement for the rows matching the search filters, or their COUNT(*)"""
+    lb = trader_leaderboard.c
+    
+    if count:
+        stmt = lambda_stmt(lambda: select(func.count()).select_from(
+            trader_leaderboard
+        ).where(
+            and_(
+                lb.is_active == True,
+                lb.total_trades > 0,
+            )
+        ))
+    else:
+        stmt = lambda_stmt(lambda: select(lb.wallet_address).where(
+            and_(
+                lb.is_active == True,
+                lb.total_trades > 0,
+            )
+        ))
     
-    return categories
+    for criterion in criteria:
+        stmt += criterion
+    
+    return stmt
 
 
-async def track_search(db: AsyncSession, query: str, filters: Dict[str, Any]):
-    """Track search analytics (simplified)"""
+async def count_matches(db: AsyncSession, criteria: List[Callable[[Select], Select]]) -> Tuple[int, bool]:
+    """
+    Total for a search: exact when small, planner estimate when large.
+    
+    Returns:
+        (total, whether it is an estimate)
+    """
+    estimate = await estimate_row_count(db, search_matches(criteria))
+    if estimate > APPROX_COUNT_THRESHOLD:
+        return estimate, True
+    
+    result = await db.execute(search_matches(criteria, count=True))
+    return result.scalar(), False
+
+
+async def track_search(query: str, filters: Dict[str, Any]):
+    """
+    Track search analytics (simplified)
+    
+    Runs as a background task after the response is sent, so it must open
+    its own session (AsyncSessionLocal) rather than reuse the request's.
+    """
     # In production, would insert into search_analytics table
     pass
 
@@ -128,8 +304,9 @@ async def track_search(db: AsyncSession, query: str, filters: Dict[str, Any]):
 # Endpoints
 # ============================================================================
 
-@router.get("/search", response_model=Dict[str, Any])
+@router.get("/search", response_model=TraderSearchResponse)
 async def search_traders(
+    background_tasks: BackgroundTasks,
     q: Optional[str] = Query(None, min_length=1, max_length=100),
     min_pnl_7d: Optional[float] = Query(None),
     min_pnl_30d: Optional[float] = Query(None),
@@ -140,6 +317,8 @@ async def search_traders(
     active_last_days: Optional[int] = Query(None, ge=1, le=365),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    exact_count: bool = Query(False, description="Count every match even for large totals"),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -155,115 +334,158 @@ async def search_traders(
     - `min_sharpe`: Minimum Sharpe ratio
     - `active_last_days`: Active in last N days
     - `limit`: Results per page
-    - `offset`: Pagination offset
+    - `offset`: Pagination offset (ignored when `cursor` is set)
+    - `cursor`: Keyset cursor; pages stay O(limit) at any depth
+    - `exact_count`: Exact `total` even above 10,000 matches; by default large
+      totals are planner estimates (`total_is_estimate: true`)
     
     **Example:**
     ```
     GET /api/traders/search?min_pnl_7d=1000&min_winrate=60&limit=20
+    GET /api/traders/search?min_pnl_7d=1000&min_winrate=60&limit=20&cursor=<next_cursor>
     ```
     """
-    # Build query
-    query_obj = select(User).where(User.total_trades > 0)
+    # Track search analytics once the response is out
+    background_tasks.add_task(track_search, q or "", {
+        "min_pnl_7d": min_pnl_7d,
+        "min_winrate": min_winrate,
+        "min_trades": min_trades
+    })
     
-    # Search by wallet address
-    if q:
-        # Support partial wallet address search
-        query_obj = query_obj.where(
-            User.wallet_address.ilike(f"%{q}%")
+    # The unfiltered first pages (landing page) are identical for everyone and
+    # only change when the leaderboard view refreshes, so serve them from Redis
+    is_default = cursor is None and not exact_count and q is None and all(
+        value is None for value in (
+            min_pnl_7d, min_pnl_30d, min_winrate, min_trades,
+            max_loss, min_sharpe, active_last_days
         )
+    )
+    if is_default:
+        default_key = f"{FastAPICache.get_prefix()}:traders:search-default:{offset}:{limit}"
+        # Fail open like @cache: a Redis error falls through to the query
+        try:
+            payload = await FastAPICache.get_backend().get(default_key)
+        except Exception as e:
+            logger.warning(f"Search cache read failed: {e}")
+            payload = None
+        if payload:
+            return Response(content=payload, media_type="application/json")
+    
+    lb = trader_leaderboard.c
+    criteria = search_criteria(
+        q, min_pnl_7d, min_pnl_30d, min_winrate, min_trades,
+        max_loss, min_sharpe, active_last_days
+    )
     
-    # Apply filters
-    if min_pnl_7d is not None:
-        query_obj = query_obj.where(User.pnl_7d_usd >= min_pnl_7d)
-    
-    if min_pnl_30d is not None:
-        query_obj = query_obj.where(User.pnl_30d_usd >= min_pnl_30d)
-    
-    if min_winrate is not None:
-        query_obj = query_obj.where(User.win_rate_7d >= min_winrate)
-    
-    if min_trades is not None:
-        query_obj = query_obj.where(User.total_trades >= min_trades)
-    
-    if max_loss is not None:
-        # Filter out traders with losses exceeding threshold
-        query_obj = query_obj.where(User.pnl_total_usd >= -max_loss)
-    
-    if min_sharpe is not None:
-        query_obj = query_obj.where(
-            and_(
-                User.sharpe_ratio.isnot(None),
-                User.sharpe_ratio >= min_sharpe
-            )
+    # Project only columns carried by idx_mv_trader_leaderboard_search so the
+    # filtered, ordered scan is satisfied by an index-only scan. NUMERIC
+    # columns are cast to float8 in SQL so rows need no per-row conversion.
+    stmt = lambda_stmt(lambda: select(
+        lb.wallet_address,
+        cast(lb.pnl_7d, Float).label("pnl_7d"),
+        cast(lb.pnl_30d, Float).label("pnl_30d"),
+        lb.win_rate_7d,
+        lb.total_trades,
+        lb.sharpe_ratio,
+        lb.categories,
+    ).where(
+        and_(
+            lb.is_active == True,  # matches the partial index predicate
+            lb.total_trades > 0,
         )
+    ))
     
-    if active_last_days:
-        # Would check last_trade_at in real implementation
-        cutoff = datetime.utcnow() - timedelta(days=active_last_days)
-        # query_obj = query_obj.where(User.last_trade_at >= cutoff)
-    
-    # Count total results
-    count_query = select(func.count()).select_from(query_obj.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-    
-    # Order by relevance (P&L 7d desc)
-    query_obj = query_obj.order_by(desc(User.pnl_7d_usd))
-    
-    # Pagination
-    query_obj = query_obj.offset(offset).limit(limit + 1)
+    # Apply filters
+    for criterion in criteria:
+        stmt += criterion
+    
+    # Order by relevance (P&L 7d desc), wallet as a unique tie-breaker
+    stmt += lambda s: s.order_by(lb.pnl_7d.desc(), lb.wallet_address.desc())
+    
+    # Pagination: keyset when a cursor is given, OFFSET otherwise. Cursor
+    # pages skip the total so they stay O(limit), clients keep the first
+    # page's. With exact_count the total rides on the page (COUNT(*) OVER ()),
+    # which reads every match; otherwise it comes from count_matches().
+    page_size = limit + 1
+    if cursor:
+        cursor_pnl, cursor_wallet = decode_search_cursor(cursor)
+        stmt += lambda s: s.where(
+            lb.pnl_7d <= cursor_pnl,
+            or_(lb.pnl_7d < cursor_pnl, lb.wallet_address < cursor_wallet)
+        ).limit(page_size)
+    elif exact_count:
+        stmt += lambda s: s.add_columns(
+            func.count().over().label("total_count")
+        ).offset(offset).limit(page_size)
+    else:
+        stmt += lambda s: s.offset(offset).limit(page_size)
     
     # Execute
-    result = await db.execute(query_obj)
-    traders = result.scalars().all()
+    result = await db.execute(stmt)
+    traders = result.all()
+    
+    total_is_estimate = False
+    if cursor:
+        rows, total = [trader._asdict() for trader in traders], None
+    elif exact_count:
+        rows, total = split_total_count(traders)
+        if not traders and offset:
+            # Past the last page the window has no row to ride on
+            total = (await db.execute(search_matches(criteria, count=True))).scalar()
+    else:
+        rows = [trader._asdict() for trader in traders]
+        if not offset and len(rows) <= limit:
+            # Everything fit on the first page
+            total = len(rows)
+        else:
+            total, total_is_estimate = await count_matches(db, criteria)
     
     # Check has_more
-    has_more = len(traders) > limit
-    traders = traders[:limit]
-    
-    # Build results with categories
-    results = []
-    for idx, trader in enumerate(traders):
-        # Categorize trader
-        categories = categorize_trader(
-            float(trader.pnl_7d_usd) if hasattr(trader, 'pnl_7d_usd') else 0,
-            float(trader.pnl_30d_usd) if hasattr(trader, 'pnl_30d_usd') else 0,
-            float(trader.win_rate_7d) if hasattr(trader, 'win_rate_7d') else 0,
-            trader.total_trades if hasattr(trader, 'total_trades') else 0,
-            float(trader.sharpe_ratio) if hasattr(trader, 'sharpe_ratio') and trader.sharpe_ratio else None
-        )
-        
-        result_item = TraderSearchResult(
-            wallet_address=trader.wallet_address,
-            rank=offset + idx + 1,
-            pnl_7d=float(trader.pnl_7d_usd) if hasattr(trader, 'pnl_7d_usd') else 0,
-            pnl_30d=float(trader.pnl_30d_usd) if hasattr(trader, 'pnl_30d_usd') else 0,
-            win_rate_7d=float(trader.win_rate_7d) if hasattr(trader, 'win_rate_7d') else 0,
-            total_trades=trader.total_trades if hasattr(trader, 'total_trades') else 0,
-            sharpe_ratio=float(trader.sharpe_ratio) if hasattr(trader, 'sharpe_ratio') and trader.sharpe_ratio else None,
-            relevance_score=1.0,
-            categories=categories
-        )
-        results.append(result_item.dict())
+    has_more = len(rows) > limit
+    rows = rows[:limit]
     
-    # Track search analytics
-    await track_search(db, q or "", {
-        "min_pnl_7d": min_pnl_7d,
-        "min_winrate": min_winrate,
-        "min_trades": min_trades
-    })
+    # Build results (TraderSearchResult shape; categories precomputed at
+    # stats-update time, numeric types already converted in SQL)
+    results = [
+        {
+            **row,
+            "rank": None if cursor else offset + idx + 1,
+            "relevance_score": 1.0
+        }
+        for idx, row in enumerate(rows)
+    ]
     
-    return {
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_search_cursor(last["pnl_7d"], last["wallet_address"])
+    
+    # Rows already have the TraderSearchResponse shape and native types, so
+    # skip re-validating every row against response_model (which stays for
+    # the schema) and serialize directly
+    payload = orjson.dumps({
         "query": q,
         "total": total,
+        "total_is_estimate": total_is_estimate,
         "limit": limit,
         "offset": offset,
         "has_more": has_more,
+        "next_cursor": next_cursor,
         "results": results
-    }
+    })
+    
+    if is_default:
+        try:
+            await FastAPICache.get_backend().set(
+                default_key, payload, expire=settings.LEADERBOARD_VIEW_REFRESH_SECONDS
+            )
+        except Exception as e:
+            logger.warning(f"Search cache write failed: {e}")
+    
+    return Response(content=payload, media_type="application/json")
 
 
-@router.get("/categories/{category_name}", response_model=Dict[str, Any])
+@router.get("/categories/{category_name}", response_model=CategoryTradersResponse)
 async def get_traders_by_category(
     category_name: str,
     limit: int = Query(50, ge=1, le=200),
@@ -286,97 +508,47 @@ async def get_traders_by_category(
     GET /api/traders/categories/consistent-winners?limit=20
     ```
     """
-    # Map category name to filters
-    category_map = {
-        "consistent-winners": {
-            "filters": {"min_winrate": 65, "min_pnl_7d": 0, "min_pnl_30d": 0},
-            "description": "Traders with 65%+ win rate and positive P&L"
-        },
-        "high-volume": {
-            "filters": {"min_trades": 100},
-            "description": "Traders with 100+ total trades"
-        },
-        "new-rising": {
-            "filters": {"min_pnl_7d": 500},
-            "max_trades": 50,
-            "description": "New traders with strong recent performance"
-        },
-        "top-performers": {
-            "filters": {"min_pnl_30d": 5000},
-            "description": "Top traders with 30-day P&L > $5000"
-        },
-        "risk-managers": {
-            "filters": {"min_sharpe": 2.0},
-            "description": "Traders with excellent risk-adjusted returns"
-        },
-        "active-traders": {
-            "filters": {"min_trades": 20},
-            "description": "Active traders with 20+ trades"
-        }
-    }
-    
-    category_config = category_map.get(category_name)
-    if not category_config:
+    category = CATEGORIES.get(category_name)
+    if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     
-    # Build query based on category criteria
-    query_obj = select(User).where(User.total_trades > 0)
-    
-    filters = category_config["filters"]
-    
-    if "min_winrate" in filters:
-        query_obj = query_obj.where(User.win_rate_7d >= filters["min_winrate"])
-    
-    if "min_pnl_7d" in filters:
-        query_obj = query_obj.where(User.pnl_7d_usd >= filters["min_pnl_7d"])
+    lb = trader_leaderboard.c
     
-    if "min_pnl_30d" in filters:
-        query_obj = query_obj.where(User.pnl_30d_usd >= filters["min_pnl_30d"])
-    
-    if "min_trades" in filters:
-        query_obj = query_obj.where(User.total_trades >= filters["min_trades"])
-    
-    if "max_trades" in category_config:
-        query_obj = query_obj.where(User.total_trades < category_config["max_trades"])
-    
-    if "min_sharpe" in filters:
-        query_obj = query_obj.where(
-            and_(
-                User.sharpe_ratio.isnot(None),
-                User.sharpe_ratio >= filters["min_sharpe"]
-            )
-        )
-    
-    # Count total
-    count_query = select(func.count()).select_from(query_obj.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    # Containment on the precomputed categories uses the GIN index. The
+    # predicates are shared with the fallback count below.
+    predicates = [
+        lb.is_active == True,
+        lb.categories.contains([category["name"]]),
+    ]
     
-    # Order and paginate
-    query_obj = query_obj.order_by(desc(User.pnl_7d_usd))
+    query_obj = select(
+        lb.wallet_address,
+        cast(lb.pnl_7d, Float).label("pnl_7d"),
+        cast(lb.pnl_30d, Float).label("pnl_30d"),
+        lb.win_rate_7d,
+        lb.total_trades,
+    ).where(*predicates)
+    
+    # Order and paginate, with the total in the same round trip
+    query_obj = query_obj.add_columns(func.count().over().label("total_count"))
+    query_obj = query_obj.order_by(lb.pnl_7d.desc())
     query_obj = query_obj.offset(offset).limit(limit + 1)
     
     # Execute
     result = await db.execute(query_obj)
-    traders = result.scalars().all()
-    
-    has_more = len(traders) > limit
-    traders = traders[:limit]
-    
-    # Format results
-    results = []
-    for trader in traders:
-        results.append({
-            "wallet_address": trader.wallet_address,
-            "pnl_7d": float(trader.pnl_7d_usd) if hasattr(trader, 'pnl_7d_usd') else 0,
-            "pnl_30d": float(trader.pnl_30d_usd) if hasattr(trader, 'pnl_30d_usd') else 0,
-            "win_rate_7d": float(trader.win_rate_7d) if hasattr(trader, 'win_rate_7d') else 0,
-            "total_trades": trader.total_trades if hasattr(trader, 'total_trades') else 0
-        })
+    traders = result.all()
+    
+    results, total = split_total_count(traders)
+    if not traders and offset:
+        count_query = select(func.count()).select_from(trader_leaderboard).where(*predicates)
+        total = (await db.execute(count_query)).scalar()
+    
+    has_more = len(results) > limit
+    results = results[:limit]
     
     return {
         "category": category_name,
-        "description": category_config["description"],
+        "description": category["description"],
         "total": total,
         "limit": limit,
         "offset": offset,
@@ -385,7 +557,7 @@ async def get_traders_by_category(
     }
 
 
-@router.get("/recommendations", response_model=Dict[str, Any])
+@router.get("/recommendations", response_model=RecommendationsResponse)
 async def get_trader_recommendations(
     user_id: Optional[int] = Query(None),
     limit: int = Query(10, ge=1, le=50),
@@ -406,34 +578,28 @@ async def get_trader_recommendations(
     # Simple recommendation: Top trending traders
     # In production, would use collaborative filtering based on user's copy list
     
-    query = select(User).where(
+    lb = trader_leaderboard.c
+    
+    reason = "Top trending trader" if not user_id else "Similar to your copy list"
+    
+    # Rows come back in TraderRecommendation shape: categories are stored
+    # at stats-update time and the NUMERIC conversion happens in SQL
+    query = select(
+        lb.wallet_address,
+        cast(lb.pnl_7d, Float).label("pnl_7d"),
+        lb.win_rate_7d,
+        lb.total_trades,
+        lb.categories,
+    ).where(
         and_(
-            User.total_trades >= 10,
-            User.pnl_7d_usd > 0
+            lb.is_active == True,
+            lb.total_trades >= 10,
+            lb.pnl_7d > 0
         )
-    ).order_by(desc(User.pnl_7d_usd)).limit(limit)
+    ).order_by(lb.pnl_7d.desc()).limit(limit)
     
     result = await db.execute(query)
-    traders = result.scalars().all()
-    
-    recommendations = []
-    for trader in traders:
-        categories = categorize_trader(
-            float(trader.pnl_7d_usd) if hasattr(trader, 'pnl_7d_usd') else 0,
-            float(trader.pnl_30d_usd) if hasattr(trader, 'pnl_30d_usd') else 0,
-            float(trader.win_rate_7d) if hasattr(trader, 'win_rate_7d') else 0,
-            trader.total_trades if hasattr(trader, 'total_trades') else 0,
-            float(trader.sharpe_ratio) if hasattr(trader, 'sharpe_ratio') and trader.sharpe_ratio else None
-        )
-        
-        recommendations.append({
-            "wallet_address": trader.wallet_address,
-            "pnl_7d": float(trader.pnl_7d_usd) if hasattr(trader, 'pnl_7d_usd') else 0,
-            "win_rate_7d": float(trader.win_rate_7d) if hasattr(trader, 'win_rate_7d') else 0,
-            "total_trades": trader.total_trades if hasattr(trader, 'total_trades') else 0,
-            "categories": categories,
-            "reason": "Top trending trader" if not user_id else "Similar to your copy list"
-        })
+    recommendations = [{**row._asdict(), "reason": reason} for row in result]
     
     return {
         "count": len(recommendations),
@@ -442,6 +608,7 @@ async def get_trader_recommendations(
 
 
 @router.get("/filters/metadata", response_model=FilterMetadata)
+@cache(expire=60, namespace="traders", key_builder=query_key_builder())
 async def get_filter_metadata(db: AsyncSession = Depends(get_db)):
     """
     Get available filter ranges for UI.
@@ -457,20 +624,28 @@ async def get_filter_metadata(db: AsyncSession = Depends(get_db)):
     }
     ```
     """
-    # Get aggregate stats
+    lb = trader_leaderboard.c
+    
+    # Get aggregate stats (the view refreshes every minute, so the
+    # response is cached for as long)
     query = select(
-        func.min(User.pnl_7d_usd).label('min_pnl_7d'),
-        func.max(User.pnl_7d_usd).label('max_pnl_7d'),
-        func.min(User.pnl_30d_usd).label('min_pnl_30d'),
-        func.max(User.pnl_30d_usd).label('max_pnl_30d'),
-        func.min(User.win_rate_7d).label('min_winrate'),
-        func.max(User.win_rate_7d).label('max_winrate'),
-        func.min(User.total_trades).label('min_trades'),
-        func.max(User.total_trades).label('max_trades'),
-        func.min(User.sharpe_ratio).label('min_sharpe'),
-        func.max(User.sharpe_ratio).label('max_sharpe'),
+        func.min(lb.pnl_7d).label('min_pnl_7d'),
+        func.max(lb.pnl_7d).label('max_pnl_7d'),
+        func.min(lb.pnl_30d).label('min_pnl_30d'),
+        func.max(lb.pnl_30d).label('max_pnl_30d'),
+        func.min(lb.win_rate_7d).label('min_winrate'),
+        func.max(lb.win_rate_7d).label('max_winrate'),
+        func.min(lb.total_trades).label('min_trades'),
+        func.max(lb.total_trades).label('max_trades'),
+        func.min(lb.sharpe_ratio).label('min_sharpe'),
+        func.max(lb.sharpe_ratio).label('max_sharpe'),
         func.count().label('total')
-    ).where(User.total_trades > 0)
+    ).where(
+        and_(
+            lb.is_active == True,
+            lb.total_trades > 0
+        )
+    )
     
     result = await db.execute(query)
     stats = result.one()
@@ -501,6 +676,7 @@ async def get_filter_metadata(db: AsyncSession = Depends(get_db)):
 
 
 @router.get("/categories", response_model=List[CategoryInfo])
+@cache(expire=60, namespace="traders", key_builder=query_key_builder())
 async def list_categories(db: AsyncSession = Depends(get_db)):
     """
     List all available trader categories with counts.
@@ -508,64 +684,26 @@ async def list_categories(db: AsyncSession = Depends(get_db)):
     **Returns:**
     - List of categories with trader counts
     """
-    categories = [
-        {
-            "name": "consistent-winners",
-            "description": "Traders with 65%+ win rate and positive P&L",
-            "criteria": {"min_winrate": 65, "min_pnl_7d": 0}
-        },
-        {
-            "name": "high-volume",
-            "description": "Traders with 100+ total trades",
-            "criteria": {"min_trades": 100}
-        },
-        {
-            "name": "new-rising",
-            "description": "New traders with strong recent performance",
-            "criteria": {"min_pnl_7d": 500, "max_trades": 50}
-        },
-        {
-            "name": "top-performers",
-            "description": "Top traders with 30-day P&L > $5000",
-            "criteria": {"min_pnl_30d": 5000}
-        },
-        {
-            "name": "risk-managers",
-            "description": "Traders with excellent risk-adjusted returns",
-            "criteria": {"min_sharpe": 2.0}
-        }
-    ]
+    lb = trader_leaderboard.c
     
-    # Get counts for each category
-    results = []
-    for category in categories:
-        # Build count query based on criteria
-        count_query = select(func.count()).where(User.total_trades > 0)
-        
-        criteria = category["criteria"]
-        if "min_winrate" in criteria:
-            count_query = count_query.where(User.win_rate_7d >= criteria["min_winrate"])
-        if "min_pnl_7d" in criteria:
-            count_query = count_query.where(User.pnl_7d_usd >= criteria["min_pnl_7d"])
-        if "min_pnl_30d" in criteria:
-            count_query = count_query.where(User.pnl_30d_usd >= criteria["min_pnl_30d"])
-        if "min_trades" in criteria:
-            count_query = count_query.where(User.total_trades >= criteria["min_trades"])
-        if "max_trades" in criteria:
-            count_query = count_query.where(User.total_trades < criteria["max_trades"])
-        if "min_sharpe" in criteria:
-            count_query = count_query.where(
-                and_(User.sharpe_ratio.isnot(None), User.sharpe_ratio >= criteria["min_sharpe"])
-            )
-        
-        count_result = await db.execute(count_query)
-        count = count_result.scalar()
-        
-        results.append(CategoryInfo(
-            name=category["name"],
+    # All category counts in one pass over the precomputed categories
+    count_query = select(*[
+        func.count().filter(
+            lb.categories.contains([category["name"]])
+        ).label(slug)
+        for slug, category in CATEGORIES.items()
+    ]).where(lb.is_active == True)
+    
+    counts = (await db.execute(count_query)).one()
+    
+    results = [
+        CategoryInfo(
+            name=slug,
             description=category["description"],
-            trader_count=count,
-            criteria=criteria
-        ))
+            trader_count=counts._mapping[slug],
+            criteria=category["criteria"]
+        )
+        for slug, category in CATEGORIES.items()
+    ]
     
     return results
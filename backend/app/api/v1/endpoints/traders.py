@@ -4,7 +4,7 @@ Trader API Endpoints
 Comprehensive endpoints for trader information, leaderboard, and performance data.
 """
 
-from typing import Optional, List
+from typing import Literal, Optional, List, Dict, Any
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
 from fastapi.responses import JSONResponse
@@ -22,6 +22,15 @@ from app.services.cache.market_cache import get_market_cache_service
 
 router = APIRouter(prefix="/traders", tags=["traders"])
 
+LeaderboardTimeframe = Literal["7d", "30d", "all"]
+LeaderboardSortBy = Literal["pnl", "winrate", "volume", "sharpe"]
+ChartTimeframe = Literal["7d", "30d", "90d", "all"]
+Outcome = Literal["YES", "NO"]
+TradeStatusFilter = Literal["open", "closed"]
+
+# Rows fetched per round trip when streaming trade history
+STREAM_BATCH_SIZE = 500
+
 
 # ============================================================================
 # Request/Response Models
@@ -129,6 +138,53 @@ def check_etag(request: Request, etag: str) -> bool:
     return client_etag == f'"{etag}"'
 
 
+async def get_daily_pnl(
+    db: AsyncSession,
+    wallet_address: str,
+    timeframe: ChartTimeframe
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Get realized P&L and trade count per exit date for a wallet.
+    
+    Args:
+        db: Database session
+        wallet_address: Trader address
+        timeframe: 7d, 30d, 90d, or all
+        
+    Returns:
+        Date (ISO format) -> {"pnl": float, "trades": int}, oldest first
+    """
+    days_map = {"7d": 7, "30d": 30, "90d": 90, "all": None}
+    days = days_map.get(timeframe)
+    
+    # Get realized trades (only the two columns the chart needs)
+    query = select(Trade.exit_timestamp, Trade.realized_pnl_usd).where(
+        and_(
+            Trade.trader_wallet_address == wallet_address,
+            Trade.exit_timestamp.isnot(None),
+            Trade.realized_pnl_usd != 0
+        )
+    )
+    
+    if days:
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        query = query.where(Trade.entry_timestamp >= cutoff)
+    
+    # Stream rows in batches so long histories are never fully materialized
+    result = await db.stream(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+    
+    # Group by date
+    from collections import defaultdict
+    daily_data = defaultdict(lambda: {"pnl": 0, "trades": 0})
+    
+    async for exit_timestamp, realized_pnl_usd in result:
+        date_key = exit_timestamp.date().isoformat()
+        daily_data[date_key]["pnl"] += float(realized_pnl_usd)
+        daily_data[date_key]["trades"] += 1
+    
+    return {date: daily_data[date] for date in sorted(daily_data.keys())}
+
+
 # ============================================================================
 # Endpoints
 # ============================================================================
@@ -136,8 +192,8 @@ def check_etag(request: Request, etag: str) -> bool:
 @router.get("/leaderboard", response_model=dict)
 async def get_leaderboard(
     request: Request,
-    timeframe: str = Query("7d", regex="^(7d|30d|all)$"),
-    sort_by: str = Query("pnl", regex="^(pnl|winrate|volume|sharpe)$"),
+    timeframe: LeaderboardTimeframe = Query("7d"),
+    sort_by: LeaderboardSortBy = Query("pnl"),
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
     db: AsyncSession = Depends(get_db)
@@ -299,8 +355,8 @@ async def get_trader_trades(
     limit: int = Query(50, ge=1, le=500),
     offset: int = Query(0, ge=0),
     market_id: Optional[str] = Query(None),
-    outcome: Optional[str] = Query(None, regex="^(YES|NO)$"),
-    status: Optional[str] = Query(None, regex="^(open|closed)$"),
+    outcome: Optional[Outcome] = Query(None),
+    status: Optional[TradeStatusFilter] = Query(None),
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     db: AsyncSession = Depends(get_db)
@@ -403,7 +459,7 @@ async def get_trader_trades(
 @router.get("/{wallet_address}/performance", response_model=PerformanceChartData)
 async def get_trader_performance(
     wallet_address: str,
-    timeframe: str = Query("30d", regex="^(7d|30d|90d|all)$"),
+    timeframe: ChartTimeframe = Query("30d"),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -435,45 +491,21 @@ async def get_trader_performance(
     }
     ```
     """
-    # Calculate days
-    days_map = {"7d": 7, "30d": 30, "90d": 90, "all": None}
-    days = days_map.get(timeframe)
-    
-    # Get trades
-    query = select(Trade).where(Trade.trader_wallet_address == wallet_address)
-    
-    if days:
-        cutoff = datetime.utcnow() - timedelta(days=days)
-        query = query.where(Trade.entry_timestamp >= cutoff)
-    
-    query = query.order_by(Trade.entry_timestamp)
-    
-    result = await db.execute(query)
-    trades = result.scalars().all()
-    
-    # Group by date and calculate P&L
-    from collections import defaultdict
-    daily_data = defaultdict(lambda: {"pnl": 0, "trades": 0})
-    
-    for trade in trades:
-        if trade.exit_timestamp and trade.realized_pnl_usd:
-            date_key = trade.exit_timestamp.date().isoformat()
-            daily_data[date_key]["pnl"] += float(trade.realized_pnl_usd)
-            daily_data[date_key]["trades"] += 1
+    daily_data = await get_daily_pnl(db, wallet_address, timeframe)
     
     # Build data points with cumulative P&L
     data_points = []
     cumulative_pnl = 0
     
-    for date in sorted(daily_data.keys()):
-        pnl = daily_data[date]["pnl"]
+    for date, day in daily_data.items():
+        pnl = day["pnl"]
         cumulative_pnl += pnl
         
         data_points.append(PerformanceDataPoint(
             date=date,
             pnl=round(pnl, 2),
             cumulative_pnl=round(cumulative_pnl, 2),
-            trades_count=daily_data[date]["trades"]
+            trades_count=day["trades"]
         ))
     
     return PerformanceChartData(
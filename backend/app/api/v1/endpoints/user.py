@@ -143,9 +143,9 @@ async def update_profile(
     """
     # Check username uniqueness if changing
     if profile.username and profile.username != current_user.username:
-        query = select(User).where(User.username == profile.username)
+        query = select(User.id).where(User.username == profile.username)
         result = await db.execute(query)
-        if result.scalar_one_or_none():
+        if result.scalar_one_or_none() is not None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already taken"
@@ -200,7 +200,7 @@ async def delete_account(
     
     # Verify password
     auth_service = get_auth_service()
-    if not auth_service.verify_password(request.password, current_user.password_hash):
+    if not await auth_service.verify_password_async(request.password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid password"
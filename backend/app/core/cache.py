@@ -0,0 +1,46 @@
+"""Response caching configuration"""
+
+import hashlib
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+import redis.asyncio as redis
+
+RESPONSE_CACHE_PREFIX = "pm-cache"
+
+
+def init_response_cache(redis_client: redis.Redis) -> None:
+    """Initialize fastapi-cache with the shared Redis backend"""
+    FastAPICache.init(RedisBackend(redis_client), prefix=RESPONSE_CACHE_PREFIX)
+
+
+def query_key_builder(*params: str) -> Callable[..., str]:
+    """
+    Build a cache key from the named query parameters only.
+
+    The default key builder hashes every endpoint argument, including
+    injected dependencies such as the DB session and request headers, so
+    no two requests ever share a key. This one ignores everything except
+    the listed parameters.
+
+    Example:
+        ```python
+        @cache(expire=30, key_builder=query_key_builder("limit", "rank_by"))
+        ```
+    """
+    def key_builder(
+        func: Callable[..., Any],
+        namespace: str = "",
+        *,
+        request: Any = None,
+        response: Any = None,
+        args: Tuple[Any, ...] = (),
+        kwargs: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        kwargs = kwargs or {}
+        raw = ":".join(f"{name}={kwargs.get(name)}" for name in params)
+        digest = hashlib.md5(raw.encode()).hexdigest()
+        return f"{FastAPICache.get_prefix()}:{namespace}:{func.__module__}.{func.__name__}:{digest}"
+
+    return key_builder
@@ -24,6 +24,11 @@ class Settings(BaseSettings):
     DATABASE_URL: PostgresDsn
     DATABASE_POOL_SIZE: int = 20
     DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: int = 30  # seconds to wait for a pooled connection
+    DATABASE_QUERY_CACHE_SIZE: int = 1200  # compiled statements kept per engine
+    DATABASE_PGBOUNCER: bool = False  # behind PgBouncer in transaction pooling mode
+    PORTFOLIO_VIEW_REFRESH_SECONDS: int = 60
+    LEADERBOARD_VIEW_REFRESH_SECONDS: int = 60
     
     # Redis
     REDIS_URL: RedisDsn
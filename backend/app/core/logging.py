@@ -7,6 +7,12 @@ from loguru import logger
 from app.core.config import settings
 
 
+# Frames inside the stdlib logging module are skipped when locating the
+# caller; no real call site is ever more than a few frames above emit()
+_LOGGING_FILE = logging.__file__
+_MAX_FRAME_DEPTH = 20
+
+
 class InterceptHandler(logging.Handler):
     """Intercept standard logging and redirect to loguru"""
     
@@ -18,8 +24,11 @@ class InterceptHandler(logging.Handler):
             level = record.levelno
 
         # Find caller from where originated the logged message
-        frame, depth = logging.currentframe(), 2
-        while frame.f_code.co_filename == logging.__file__:
+        # (starts at this frame, then walks out of the logging module)
+        frame, depth = logging.currentframe(), 0
+        while frame and depth < _MAX_FRAME_DEPTH and (
+            depth == 0 or frame.f_code.co_filename == _LOGGING_FILE
+        ):
             frame = frame.f_back
             depth += 1
 
@@ -68,13 +77,17 @@ def setup_logging():
         compression="zip",
     )
     
+    # Records below LOG_LEVEL would be dropped by every sink, so stop them in
+    # stdlib logging before a record is built or the caller frame is walked
+    min_level = logger.level(settings.LOG_LEVEL).no
+    
     # Intercept uvicorn logs
-    logging.getLogger("uvicorn").handlers = [InterceptHandler()]
-    logging.getLogger("uvicorn.access").handlers = [InterceptHandler()]
-    logging.getLogger("fastapi").handlers = [InterceptHandler()]
+    logging.getLogger("uvicorn").handlers = [InterceptHandler(min_level)]
+    logging.getLogger("uvicorn.access").handlers = [InterceptHandler(min_level)]
+    logging.getLogger("fastapi").handlers = [InterceptHandler(min_level)]
     
     # Set loguru as the logging handler for all modules
-    logging.basicConfig(handlers=[InterceptHandler()], level=0)
+    logging.basicConfig(handlers=[InterceptHandler(min_level)], level=min_level)
     
     logger.info(f"Logging initialized - Level: {settings.LOG_LEVEL}")
 
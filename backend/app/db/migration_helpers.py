@@ -0,0 +1,97 @@
+"""
+Helpers for Alembic data migrations
+
+Seed data and backfills must not run as one giant statement inside the
+migration transaction: memory grows with the row count and the whole load
+is written to WAL before anything commits. These helpers page through the
+data and commit each batch on its own.
+
+Example:
+    ```python
+    from app.db.migration_helpers import batched_bulk_insert, iter_batches
+
+    def upgrade() -> None:
+        batched_bulk_insert(traders_table, load_seed_rows(), batch_size=500)
+
+        query = sa.select(trades.c.id, trades.c.market_id).order_by(trades.c.id)
+        for rows in iter_batches(query):
+            ...
+    ```
+"""
+
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+
+from alembic import op
+from sqlalchemy import Select, Table
+from sqlalchemy.engine import Row
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def batched_bulk_insert(
+    table: Table,
+    rows: Iterable[Dict[str, Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> int:
+    """
+    Insert rows in fixed-size batches, committing after each batch.
+
+    Args:
+        table: Target table
+        rows: Row dicts (may be a generator, it is consumed lazily)
+        batch_size: Rows per INSERT statement
+
+    Returns:
+        Number of rows inserted
+    """
+    iterator = iter(rows)
+    inserted = 0
+
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            break
+
+        with op.get_context().autocommit_block():
+            op.bulk_insert(table, batch)
+
+        inserted += len(batch)
+
+    return inserted
+
+
+def iter_batches(
+    query: Select,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[Sequence[Row]]:
+    """
+    Page through a SELECT with LIMIT/OFFSET, one autocommit block per page.
+
+    The query must have a deterministic ORDER BY (e.g. the primary key),
+    otherwise pages may overlap or skip rows.
+
+    Args:
+        query: Ordered SELECT statement
+        batch_size: Rows per page
+
+    Yields:
+        Lists of result rows
+    """
+    offset = 0
+
+    while True:
+        with op.get_context().autocommit_block():
+            rows: List[Row] = op.get_bind().execute(
+                query.limit(batch_size).offset(offset)
+            ).fetchall()
+
+        if not rows:
+            break
+
+        yield rows
+
+        if len(rows) < batch_size:
+            break
+
+        offset += batch_size
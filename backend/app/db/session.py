@@ -2,15 +2,28 @@
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import NullPool
 from app.core.config import settings
 
+# PgBouncer in transaction pooling mode hands each transaction a different
+# server connection, so asyncpg's per-connection prepared statements break
+connect_args = (
+    {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    if settings.DATABASE_PGBOUNCER
+    else {}
+)
+
 # Create async engine
 engine = create_async_engine(
     str(settings.DATABASE_URL),
     echo=settings.DEBUG,
     pool_size=settings.DATABASE_POOL_SIZE,
     max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+    # Sized for every filter combination of /traders/search (lambda_stmt)
+    query_cache_size=settings.DATABASE_QUERY_CACHE_SIZE,
     pool_pre_ping=True,
+    connect_args=connect_args,
 )
 
 # Create async session factory
@@ -22,6 +35,24 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+# Celery tasks run each job in its own asyncio.run() event loop, and a
+# pooled asyncpg connection can't be used from a loop other than the one
+# that opened it, so task sessions connect per use instead of pooling
+task_engine = create_async_engine(
+    str(settings.DATABASE_URL),
+    echo=settings.DEBUG,
+    poolclass=NullPool,
+    connect_args=connect_args,
+)
+
+TaskSessionLocal = async_sessionmaker(
+    task_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
 # Create base class for models
 Base = declarative_base()
 
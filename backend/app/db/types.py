@@ -0,0 +1,28 @@
+"""Custom column types"""
+
+from typing import Optional
+
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+
+class TxHash(TypeDecorator):
+    """
+    Transaction hash stored as raw 32-byte BYTEA.
+    
+    Application code keeps using "0x"-prefixed hex strings; the conversion
+    happens at bind/result time. Half the storage of the hex text and
+    comparisons are a plain memcmp.
+    """
+    
+    impl = LargeBinary(32)
+    cache_ok = True
+    
+    def process_bind_param(self, value: Optional[str], dialect) -> Optional[bytes]:
+        if value is None or isinstance(value, bytes):
+            return value
+        return bytes.fromhex(value[2:] if value.startswith(('0x', '0X')) else value)
+    
+    def process_result_value(self, value: Optional[bytes], dialect) -> Optional[str]:
+        if value is None:
+            return None
+        return '0x' + bytes(value).hex()
@@ -1,15 +1,18 @@
 """Main FastAPI application"""
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from contextlib import asynccontextmanager
 import sentry_sdk
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 from prometheus_fastapi_instrumentator import Instrumentator
+import redis.asyncio as redis
 
 from app.core.config import settings
 from app.core.logging import logger
+from app.core.cache import init_response_cache
 from app.api.v1.router import api_router
 from app.db.session import engine
 
@@ -31,10 +34,19 @@ async def lifespan(app: FastAPI):
         )
         logger.info("Sentry monitoring initialized")
     
+    # Shared Redis client: response cache and rate limiting
+    redis_client = redis.from_url(str(settings.REDIS_URL))
+    app.state.redis = redis_client
+    
+    # Response cache for read-heavy public endpoints
+    init_response_cache(redis_client)
+    logger.info("Response cache initialized")
+    
     yield
     
     # Shutdown
     logger.info("Shutting down application")
+    await redis_client.close()
     await engine.dispose()
 
 
@@ -46,6 +58,7 @@ app = FastAPI(
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -5,11 +5,35 @@ IP-based rate limiting for API endpoints.
 """
 
 import time
-from typing import Dict
-from fastapi import Request, HTTPException
+import uuid
+from typing import Optional
+from fastapi import Request
+from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
-from collections import defaultdict
-from datetime import datetime, timedelta
+import redis.asyncio as redis
+from redis.commands.core import AsyncScript
+from loguru import logger
+
+
+# Sliding-window log per IP, checked and updated in one atomic step.
+# KEYS[1] = request log (zset of request times in ms)
+# ARGV = now_ms, window_ms, limit, unique member for this request
+# Returns {allowed, requests in window, oldest request time in ms}
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local count = redis.call('ZCARD', KEYS[1])
+local allowed = 0
+if count < tonumber(ARGV[3]) then
+    redis.call('ZADD', KEYS[1], now, ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], window)
+    count = count + 1
+    allowed = 1
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')[2]
+return {allowed, count, oldest}
+"""
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
@@ -19,45 +43,64 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     Configuration:
     - 100 requests per minute per IP
     - Sliding window algorithm
+    
+    Request logs live in Redis so the limit holds across all workers and
+    survives restarts. Each request is a single EVALSHA round trip on the
+    app's shared Redis client (app.state.redis, opened and closed in the
+    lifespan). If Redis is unavailable requests are let through (fail open).
     """
     
+    WINDOW_SECONDS = 60
+    KEY_PREFIX = "ratelimit"
+    
     def __init__(self, app, requests_per_minute: int = 100):
         super().__init__(app)
         self.requests_per_minute = requests_per_minute
-        self.requests: Dict[str, list] = defaultdict(list)
+        self._sliding_window: Optional[AsyncScript] = None
+    
+    def _script(self, redis_client: redis.Redis) -> AsyncScript:
+        """Sliding-window script; sends EVALSHA and only re-ships the body after a NOSCRIPT"""
+        if self._sliding_window is None:
+            self._sliding_window = redis_client.register_script(SLIDING_WINDOW_SCRIPT)
+        return self._sliding_window
     
     async def dispatch(self, request: Request, call_next):
         # Get client IP
         client_ip = request.client.host
         
         # Check rate limit
-        now = time.time()
-        minute_ago = now - 60
+        now_ms = int(time.time() * 1000)
+        window_ms = self.WINDOW_SECONDS * 1000
+        
+        try:
+            redis_client = request.app.state.redis
+            allowed, count, oldest_ms = await self._script(redis_client)(
+                keys=[f"{self.KEY_PREFIX}:{client_ip}"],
+                args=[now_ms, window_ms, self.requests_per_minute, f"{now_ms}-{uuid.uuid4().hex}"],
+                client=redis_client
+            )
+        except Exception as e:
+            logger.error(f"Rate limit check failed: {e}")
+            return await call_next(request)
         
-        # Clean old requests
-        self.requests[client_ip] = [
-            req_time for req_time in self.requests[client_ip]
-            if req_time > minute_ago
-        ]
+        reset_ms = int(oldest_ms) + window_ms
         
         # Check limit
-        if len(self.requests[client_ip]) >= self.requests_per_minute:
-            raise HTTPException(
+        if not allowed:
+            retry_after = (reset_ms - now_ms) // 1000 + 1
+            return JSONResponse(
                 status_code=429,
-                detail="Rate limit exceeded. Try again later.",
-                headers={"Retry-After": "60"}
+                content={"detail": "Rate limit exceeded. Try again later."},
+                headers={"Retry-After": str(retry_after)}
             )
         
-        # Add current request
-        self.requests[client_ip].append(now)
-        
         # Process request
         response = await call_next(request)
         
         # Add rate limit headers
-        remaining = self.requests_per_minute - len(self.requests[client_ip])
+        remaining = self.requests_per_minute - count
         response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
         response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(int(now + 60))
+        response.headers["X-RateLimit-Reset"] = str(reset_ms // 1000)
         
         return response
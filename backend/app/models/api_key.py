@@ -4,23 +4,32 @@ SQLAlchemy Models for API Key Management
 Supporting models for the API key management system.
 """
 
-from sqlalchemy import Column, BigInteger, String, Text, TIMESTAMP, Integer, ForeignKey, Boolean, Numeric, JSON
-from sqlalchemy.dialects.postgresql import INET
+from sqlalchemy import Column, BigInteger, String, Text, LargeBinary, TIMESTAMP, Integer, ForeignKey, Boolean, Numeric, Float, JSON, Sequence, column, table
+from sqlalchemy.dialects.postgresql import ENUM, INET, JSONB
 from datetime import datetime
 
 from app.db.session import Base
+from app.db.types import TxHash
+from app.services.subscription.subscription_service import SubscriptionTier
+
+
+# Native PostgreSQL enum types (created by the 002_performance_schema migration)
+SubscriptionTierType = ENUM('free', 'basic', 'pro', 'premium', name='subscription_tier_t', create_type=False)
+APIKeyStatusType = ENUM('active', 'revoked', 'suspended', 'expired', name='api_key_status_t', create_type=False)
+TradeStatusType = ENUM('pending', 'open', 'closed', 'cancelled', 'failed', name='trade_status_t', create_type=False)
+TradePositionType = ENUM('YES', 'NO', 'LONG', 'SHORT', name='trade_position_t', create_type=False)
 
 
 class APIKey(Base):
     """Model for polymarket_api_keys table"""
     __tablename__ = 'polymarket_api_keys'
     
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(BigInteger, Sequence('polymarket_api_keys_id_seq', cache=100), primary_key=True)
     user_id = Column(BigInteger, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     
-    encrypted_api_key = Column('encrypted_api_key', type_=bytes, nullable=False)
-    encrypted_api_secret = Column('encrypted_api_secret', type_=bytes, nullable=False)
-    encrypted_private_key = Column('encrypted_private_key', type_=bytes, nullable=True)
+    encrypted_api_key = Column(LargeBinary, nullable=False)
+    encrypted_api_secret = Column(LargeBinary, nullable=False)
+    encrypted_private_key = Column(LargeBinary, nullable=True)
     
     key_name = Column(String(100), nullable=True)
     key_hash = Column(String(64), unique=True, nullable=False)
@@ -32,7 +41,7 @@ class APIKey(Base):
     total_trades_executed = Column(Integer, nullable=False, default=0)
     total_volume_usd = Column(Numeric(20, 6), nullable=False, default=0)
     
-    status = Column(String(20), nullable=False, default='active')
+    status = Column(APIKeyStatusType, nullable=False, default='active')
     is_primary = Column(Boolean, nullable=False, default=False)
     
     last_used_at = Column(TIMESTAMP, nullable=True)
@@ -55,7 +64,7 @@ class User(Base):
     username = Column(String(100), nullable=True)
     password_hash = Column(String(255), nullable=True)
     
-    subscription_tier = Column(String(20), nullable=False, default='free')
+    subscription_tier = Column(SubscriptionTierType, nullable=False, default='free', server_default='free')
     max_followed_traders = Column(Integer, nullable=False, default=3)
     max_daily_trades = Column(Integer, nullable=False, default=10)
     max_trade_size_usd = Column(Numeric(12, 2), nullable=False, default=100.00)
@@ -76,16 +85,93 @@ class User(Base):
     created_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)
     updated_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     last_login_at = Column(TIMESTAMP, nullable=True)
+    
+    @property
+    def tier(self) -> SubscriptionTier:
+        """subscription_tier as a SubscriptionTier"""
+        return SubscriptionTier.from_db(self.subscription_tier)
+
+
+class Trader(Base):
+    """Model for traders table (leaderboard data)"""
+    __tablename__ = 'traders'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    wallet_address = Column(String(42), unique=True, nullable=False)
+
+    pnl_7d = Column(Numeric(20, 6), nullable=False, default=0)
+    pnl_7d_percent = Column(Float, nullable=False, default=0)
+    pnl_30d = Column(Numeric(20, 6), nullable=False, default=0)
+
+    total_pnl = Column(Numeric(20, 6), nullable=False, default=0)
+    total_pnl_percent = Column(Numeric(10, 4), nullable=False, default=0)
+    total_volume_usd = Column(Numeric(20, 6), nullable=False, default=0)
+
+    total_trades = Column(Integer, nullable=False, default=0)
+    winning_trades = Column(Integer, nullable=False, default=0)
+    losing_trades = Column(Integer, nullable=False, default=0)
+    win_rate = Column(Numeric(5, 2), nullable=False, default=0)
+
+    avg_trade_size_usd = Column(Numeric(12, 2), nullable=False, default=0)
+    avg_holding_time_hours = Column(Numeric(10, 2), nullable=False, default=0)
+
+    sharpe_ratio = Column(Float, nullable=True, default=0)
+    max_drawdown = Column(Float, nullable=True, default=0)
+    volatility = Column(Float, nullable=True, default=0)
+
+    follower_count = Column(Integer, nullable=False, default=0)
+    total_copied_volume_usd = Column(Numeric(20, 6), nullable=False, default=0)
+
+    categories = Column(JSONB, nullable=False, default=list)
+
+    rank_7d = Column(Integer, nullable=True)
+    rank_all_time = Column(Integer, nullable=True)
+    rank_volume = Column(Integer, nullable=True)
+
+    display_name = Column(String(100), nullable=True)
+    bio = Column(Text, nullable=True)
+    avatar_url = Column(String(500), nullable=True)
+
+    is_verified = Column(Boolean, nullable=False, default=False)
+    is_featured = Column(Boolean, nullable=False, default=False)
+    is_active = Column(Boolean, nullable=False, default=True)
+
+    first_trade_at = Column(TIMESTAMP, nullable=True)
+    last_trade_at = Column(TIMESTAMP, nullable=True)
+    last_updated_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)
+    created_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)
+
+
+# Read-only materialized view (created and refreshed outside the ORM, so it
+# is a lightweight table() rather than a mapped class in Base.metadata)
+trader_leaderboard = table(
+    'mv_trader_leaderboard',
+    column('wallet_address', String),
+    column('is_active', Boolean),
+    column('sharpe_ratio', Float),
+    column('last_trade_at', TIMESTAMP),
+    column('categories', JSONB),
+    column('pnl_7d', Numeric),
+    column('pnl_30d', Numeric),
+    column('pnl_total', Numeric),
+    column('total_volume_usd', Numeric),
+    column('win_rate_7d', Float),
+    column('win_rate_30d', Float),
+    column('win_rate_total', Float),
+    column('total_trades_7d', BigInteger),
+    column('total_trades_30d', BigInteger),
+    column('total_trades', BigInteger),
+)
 
 
 class Trade(Base):
     """Model for trades table"""
     __tablename__ = 'trades'
     
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(BigInteger, Sequence('trades_id_seq', cache=100), primary_key=True)
     
-    original_tx_hash = Column(String(66), nullable=True)
-    copy_tx_hash = Column(String(66), unique=True, nullable=True)
+    original_tx_hash = Column(TxHash, nullable=True)
+    copy_tx_hash = Column(TxHash, unique=True, nullable=True)
     
     trader_wallet_address = Column(String(42), nullable=False)
     copying_user_id = Column(BigInteger, ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
@@ -97,7 +183,7 @@ class Trade(Base):
     market_id = Column(String(100), nullable=False)
     market_name = Column(String(500), nullable=True)
     market_question = Column(Text, nullable=True)
-    position = Column(String(10), nullable=False)
+    position = Column(TradePositionType, nullable=False)
     
     entry_price = Column(Numeric(20, 10), nullable=False)
     exit_price = Column(Numeric(20, 10), nullable=True)
@@ -109,14 +195,14 @@ class Trade(Base):
     gas_fee_usd = Column(Numeric(12, 6), nullable=False, default=0)
     
     realized_pnl_usd = Column(Numeric(20, 6), nullable=True)
-    realized_pnl_percent = Column(Numeric(10, 4), nullable=True)
-    unrealized_pnl_usd = Column(Numeric(20, 6), nullable=True)
+    realized_pnl_percent = Column(Float, nullable=True)
+    unrealized_pnl_usd = Column(Float, nullable=True)
     current_value_usd = Column(Numeric(20, 6), nullable=True)
     
-    status = Column(String(20), nullable=False, default='pending')
+    status = Column(TradeStatusType, nullable=False, default='pending')
     failure_reason = Column(Text, nullable=True)
     
-    slippage_percent = Column(Numeric(5, 2), nullable=True)
+    slippage_percent = Column(Float, nullable=True)
     execution_time_ms = Column(Integer, nullable=True)
     
     created_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)
@@ -4,16 +4,109 @@ Authentication Service
 Handles user authentication, JWT tokens, and security features.
 """
 
+import asyncio
+import hashlib
+import os
 import secrets
-from datetime import datetime, timedelta
-from typing import Optional, Tuple
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from typing import Dict, Optional, Tuple
 import bcrypt
 import jwt
+import orjson
 from loguru import logger
 
 from app.core.config import settings
 
 
+# bcrypt releases the GIL while hashing, so a pool sized to the cores hashes
+# that many passwords in parallel without stalling the event loop
+_bcrypt_pool = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="bcrypt")
+
+
+# Modular crypt prefixes bcrypt.checkpw accepts; a full hash is 60 chars
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+_BCRYPT_HASH_LENGTH = 60
+
+
+def _is_bcrypt_hash(hashed_password: Optional[str]) -> bool:
+    """Cheap shape check, so a hash that can never match skips the KDF"""
+    return (
+        hashed_password is not None
+        and len(hashed_password) == _BCRYPT_HASH_LENGTH
+        and hashed_password.startswith(_BCRYPT_PREFIXES)
+    )
+
+
+class _OrjsonJWT(jwt.PyJWT):
+    """PyJWT with the claims (de)serialized by orjson instead of stdlib json"""
+    
+    def _encode_payload(self, payload, headers=None, json_encoder=None) -> bytes:
+        # Compact output (no whitespace) like PyJWT's own encoder
+        return orjson.dumps(payload)
+    
+    def _decode_payload(self, decoded: dict) -> dict:
+        try:
+            payload = orjson.loads(decoded["payload"])
+        except orjson.JSONDecodeError as e:
+            raise jwt.DecodeError(f"Invalid payload string: {e}") from e
+        if not isinstance(payload, dict):
+            raise jwt.DecodeError("Invalid payload string: must be a json object")
+        return payload
+
+
+# Character classes for password complexity, as bits
+_UPPER, _LOWER, _DIGIT, _SPECIAL = 1, 2, 4, 8
+_ALL_CLASSES = _UPPER | _LOWER | _DIGIT | _SPECIAL
+_SPECIAL_CHARS = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+
+
+def _build_class_table() -> bytes:
+    """Byte -> class bit for ASCII; used with bytes.translate"""
+    table = bytearray(256)
+    for b in range(128):
+        c = chr(b)
+        if c.isupper():
+            table[b] = _UPPER
+        elif c.islower():
+            table[b] = _LOWER
+        elif c.isdigit():
+            table[b] = _DIGIT
+        elif c in _SPECIAL_CHARS:
+            table[b] = _SPECIAL
+    return bytes(table)
+
+
+_CLASS_TABLE = _build_class_table()
+
+
+def _char_classes(password: str) -> int:
+    """Bitmask of the character classes present in a password"""
+    mask = 0
+    if password.isascii():
+        # Classify every byte in C, then OR the (at most five) distinct values
+        for bits in set(password.encode().translate(_CLASS_TABLE)):
+            mask |= bits
+        return mask
+    
+    # Unicode letters and digits count too, as with str.isupper() etc.
+    for c in password:
+        if c.isupper():
+            mask |= _UPPER
+        elif c.islower():
+            mask |= _LOWER
+        elif c.isdigit():
+            mask |= _DIGIT
+        elif c in _SPECIAL_CHARS:
+            mask |= _SPECIAL
+        if mask == _ALL_CLASSES:
+            break
+    return mask
+
+
 class AuthService:
     """
     Authentication service for user management and JWT tokens.
@@ -24,6 +117,11 @@ class AuthService:
     - Email verification tokens
     - Password reset tokens
     - Login attempt tracking
+    
+    Verified token payloads are kept in a small in-process LRU for a few
+    seconds, so a client firing several requests with the same token pays
+    for signature verification once. Only valid tokens are cached, keyed by
+    the token's SHA-256 rather than the token itself.
     """
     
     # Token expiry times
@@ -36,10 +134,32 @@ class AuthService:
     MAX_LOGIN_ATTEMPTS = 5
     LOCKOUT_DURATION_MINUTES = 30
     
+    # Verified token cache
+    VERIFY_CACHE_SIZE = 10_000
+    VERIFY_CACHE_TTL_SECONDS = 5
+    
     def __init__(self):
         """Initialize auth service"""
         self.secret_key = settings.SECRET_KEY
         self.algorithm = "HS256"
+        self.bcrypt_rounds = settings.BCRYPT_ROUNDS
+        self._algorithms = [self.algorithm]
+        
+        # One codec for every token: options are merged once here instead of
+        # per call, and a token without an expiry is never accepted
+        self._jwt = _OrjsonJWT(options={"require": ["exp"]})
+        
+        # sha256(token) -> (cached until, payload), least recently used first
+        self._verify_cache: "OrderedDict[bytes, Tuple[float, dict]]" = OrderedDict()
+        self._verify_lock = threading.Lock()
+        
+        # sha256(hash, password) -> running check; concurrent identical
+        # checks share one bcrypt run. Entries leave when the run finishes.
+        self._verify_inflight: Dict[bytes, "asyncio.Future[bool]"] = {}
+        
+        # Hash checked against when a login names no account (created on
+        # first use, at the configured cost)
+        self._dummy_hash: Optional[str] = None
     
     def hash_password(self, password: str) -> str:
         """
@@ -51,7 +171,7 @@ class AuthService:
         Returns:
             Hashed password
         """
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=self.bcrypt_rounds)
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         return hashed.decode('utf-8')
     
@@ -64,13 +184,54 @@ class AuthService:
             hashed_password: Bcrypt hash
             
         Returns:
-            True if password matches
+            True if password matches (False for a missing or malformed hash)
         """
+        if not _is_bcrypt_hash(hashed_password):
+            return False
+        
         return bcrypt.checkpw(
             plain_password.encode('utf-8'),
             hashed_password.encode('utf-8')
         )
     
+    async def hash_password_async(self, password: str) -> str:
+        """Hash password on the bcrypt thread pool (for async callers)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_bcrypt_pool, self.hash_password, password)
+    
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify password on the bcrypt thread pool (for async callers)"""
+        if not _is_bcrypt_hash(hashed_password):
+            return False
+        
+        # The hash is fixed length, so hash + password is unambiguous
+        key = hashlib.sha256(
+            hashed_password.encode('utf-8') + plain_password.encode('utf-8')
+        ).digest()
+        
+        future = self._verify_inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                _bcrypt_pool, self.verify_password, plain_password, hashed_password
+            )
+            self._verify_inflight[key] = future
+            future.add_done_callback(lambda _: self._verify_inflight.pop(key, None))
+        
+        # Shielded so one cancelled caller doesn't cancel the others' result
+        return await asyncio.shield(future)
+    
+    async def verify_dummy_password_async(self, plain_password: str) -> None:
+        """
+        Spend the time of a real password check without an account.
+        
+        Called when a login names no user, so the response time doesn't
+        reveal whether the account exists.
+        """
+        if self._dummy_hash is None:
+            self._dummy_hash = await self.hash_password_async(secrets.token_urlsafe(16))
+        await self.verify_password_async(plain_password, self._dummy_hash)
+    
     def validate_password_strength(self, password: str) -> Tuple[bool, Optional[str]]:
         """
         Validate password meets complexity requirements.
@@ -88,17 +249,19 @@ class AuthService:
         if len(password) < 8:
             return False, "Password must be at least 8 characters"
         
-        if not any(c.isupper() for c in password):
+        # One pass over the password for all four classes
+        classes = _char_classes(password)
+        
+        if not classes & _UPPER:
             return False, "Password must contain uppercase letter"
         
-        if not any(c.islower() for c in password):
+        if not classes & _LOWER:
             return False, "Password must contain lowercase letter"
         
-        if not any(c.isdigit() for c in password):
+        if not classes & _DIGIT:
             return False, "Password must contain digit"
         
-        special_chars = "!@#$%^&*()_+-=[]{}|;:,.<>?"
-        if not any(c in special_chars for c in password):
+        if not classes & _SPECIAL:
             return False, "Password must contain special character"
         
         return True, None
@@ -114,17 +277,18 @@ class AuthService:
         Returns:
             JWT token string
         """
-        expire = datetime.utcnow() + timedelta(minutes=self.ACCESS_TOKEN_EXPIRE_MINUTES)
+        # Epoch seconds, which is what JWT stores anyway
+        now = int(time.time())
         
         payload = {
             "user_id": user_id,
             "email": email,
             "type": "access",
-            "exp": expire,
-            "iat": datetime.utcnow()
+            "exp": now + self.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            "iat": now
         }
         
-        token = jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        token = self._jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
         return token
     
     def create_refresh_token(self, user_id: int) -> str:
@@ -137,17 +301,17 @@ class AuthService:
         Returns:
             JWT refresh token
         """
-        expire = datetime.utcnow() + timedelta(days=self.REFRESH_TOKEN_EXPIRE_DAYS)
+        now = int(time.time())
         
         payload = {
             "user_id": user_id,
             "type": "refresh",
-            "exp": expire,
-            "iat": datetime.utcnow(),
+            "exp": now + self.REFRESH_TOKEN_EXPIRE_DAYS * 86400,
+            "iat": now,
             "jti": secrets.token_urlsafe(32)  # Unique token ID
         }
         
-        token = jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        token = self._jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
         return token
     
     def verify_token(self, token: str, token_type: str = "access") -> Optional[dict]:
@@ -161,11 +325,30 @@ class AuthService:
         Returns:
             Decoded payload or None if invalid
         """
+        key = hashlib.sha256(token.encode()).digest()
+        now = time.time()
+        
+        with self._verify_lock:
+            cached = self._verify_cache.get(key)
+            if cached is not None:
+                if cached[0] > now:
+                    self._verify_cache.move_to_end(key)
+                else:
+                    del self._verify_cache[key]
+                    cached = None
+        
+        if cached is not None:
+            payload = cached[1]
+            if payload.get("type") != token_type:
+                logger.warning(f"Invalid token type: expected {token_type}, got {payload.get('type')}")
+                return None
+            return dict(payload)
+        
         try:
-            payload = jwt.decode(
+            payload = self._jwt.decode(
                 token,
                 self.secret_key,
-                algorithms=[self.algorithm]
+                algorithms=self._algorithms
             )
             
             # Verify token type
@@ -173,7 +356,14 @@ class AuthService:
                 logger.warning(f"Invalid token type: expected {token_type}, got {payload.get('type')}")
                 return None
             
-            return payload
+            # Cache no longer than the token itself is valid
+            cached_until = min(now + self.VERIFY_CACHE_TTL_SECONDS, payload.get("exp", now))
+            with self._verify_lock:
+                self._verify_cache[key] = (cached_until, payload)
+                if len(self._verify_cache) > self.VERIFY_CACHE_SIZE:
+                    self._verify_cache.popitem(last=False)
+            
+            return dict(payload)
             
         except jwt.ExpiredSignatureError:
             logger.debug("Token expired")
@@ -193,7 +383,7 @@ class AuthService:
         Returns:
             Verification token
         """
-        expire = datetime.utcnow() + timedelta(hours=self.VERIFICATION_TOKEN_EXPIRE_HOURS)
+        expire = int(time.time()) + self.VERIFICATION_TOKEN_EXPIRE_HOURS * 3600
         
         payload = {
             "user_id": user_id,
@@ -202,7 +392,7 @@ class AuthService:
             "exp": expire
         }
         
-        token = jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        token = self._jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
         return token
     
     def create_password_reset_token(self, user_id: int, email: str) -> str:
@@ -216,7 +406,7 @@ class AuthService:
         Returns:
             Reset token
         """
-        expire = datetime.utcnow() + timedelta(hours=self.RESET_TOKEN_EXPIRE_HOURS)
+        expire = int(time.time()) + self.RESET_TOKEN_EXPIRE_HOURS * 3600
         
         payload = {
             "user_id": user_id,
@@ -226,7 +416,7 @@ class AuthService:
             "nonce": secrets.token_urlsafe(16)  # One-time use
         }
         
-        token = jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        token = self._jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
         return token
     
     def verify_special_token(
@@ -247,13 +437,7 @@ class AuthService:
         return self.verify_token(token, token_type)
 
 
-# Singleton instance
-_auth_service: Optional[AuthService] = None
-
-
+@cache
 def get_auth_service() -> AuthService:
     """Get singleton instance of AuthService"""
-    global _auth_service
-    if _auth_service is None:
-        _auth_service = AuthService()
-    return _auth_service
+    return AuthService()
@@ -13,9 +13,11 @@ from app.services.blockchain.web3_provider import (
 from app.services.blockchain.contracts import (
     POLYMARKET_CONTRACTS,
     EVENT_SIGNATURES,
+    EVENT_SIGNATURES_BYTES,
     TradeEvent,
     get_contract_abi,
-    get_contract_address
+    get_contract_address,
+    decode_order_filled
 )
 from app.services.blockchain.block_monitor import (
     BlockMonitorService,
@@ -46,9 +48,11 @@ __all__ = [
     # Contracts
     'POLYMARKET_CONTRACTS',
     'EVENT_SIGNATURES',
+    'EVENT_SIGNATURES_BYTES',
     'TradeEvent',
     'get_contract_abi',
     'get_contract_address',
+    'decode_order_filled',
     
     # Block Monitor
     'BlockMonitorService',
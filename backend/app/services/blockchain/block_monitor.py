@@ -4,7 +4,7 @@ Block Monitoring Service
 Monitors Polygon blockchain for new blocks and Polymarket trades.
 
 Features:
-- WebSocket subscription to new blocks
+- WebSocket push subscription to trade logs (eth_subscribe)
 - Fallback polling mechanism
 - Transaction filtering for Polymarket contracts
 - Event parsing and decoding
@@ -12,19 +12,36 @@ Features:
 """
 
 import asyncio
-from typing import Optional, Callable, List, Set, Dict, Any
+from collections import OrderedDict
+from functools import cache
+from typing import Optional, Callable, List, FrozenSet, Dict, Any, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
+from web3 import AsyncWeb3
 from web3.types import BlockData, TxData, LogReceipt
-from web3.exceptions import Web3Exception
 from loguru import logger
 
-from app.services.blockchain.web3_provider import get_web3_provider_service
+from app.services.blockchain.web3_provider import get_web3_provider_service, BlockTimestampCache
 from app.services.blockchain.contracts import (
-    POLYMARKET_CONTRACTS, TradeEvent, get_contract_abi, EVENT_SIGNATURES
+    POLYMARKET_CONTRACTS, TradeEvent, get_contract_abi, EVENT_SIGNATURES,
+    EVENT_SIGNATURES_BYTES
 )
 
+_ORDER_FILLED_TOPIC = EVENT_SIGNATURES_BYTES['OrderFilled']
+
+# Identity of a log: (blockHash, transactionHash, logIndex)
+LogKey = Tuple[bytes, bytes, int]
+
+# Monitor all Polymarket contracts by default (immutable, so every config
+# can share it)
+_DEFAULT_MONITORED_CONTRACTS = frozenset(POLYMARKET_CONTRACTS.values())
+
+
+def _log_key(log: LogReceipt) -> LogKey:
+    """(blockHash, transactionHash, logIndex) of a log"""
+    return (log['blockHash'], log['transactionHash'], log['logIndex'])
+
 
 @dataclass
 class BlockMonitorConfig:
@@ -34,20 +51,19 @@ class BlockMonitorConfig:
     polling_interval: int = 12  # seconds (Polygon block time ~2s, but we poll slower)
     
     # Contract filtering
-    monitored_contracts: Set[str] = None
+    monitored_contracts: FrozenSet[str] = _DEFAULT_MONITORED_CONTRACTS
     
     # Performance
     max_blocks_per_batch: int = 100
     log_batch_size: int = 1000
+    max_concurrent_block_fetches: int = 10  # in-flight eth_getBlockByNumber calls
+    keep_raw_logs: bool = False  # attach the source log to each TradeEvent
+    block_timestamp_cache_size: int = 256  # recent block hash -> timestamp
     
     # Recovery
     enable_recovery: bool = True
-    recovery_lookback_blocks: int = 100
-    
-    def __post_init__(self):
-        if self.monitored_contracts is None:
-            # Monitor all Polymarket contracts by default
-            self.monitored_contracts = set(POLYMARKET_CONTRACTS.values())
+    recovery_lookback_blocks: int = 100  # re-read on reconnect to catch reorgs
+    seen_log_cache_size: int = 10_000  # should cover the lookback's logs
 
 
 class BlockMonitorService:
@@ -76,18 +92,40 @@ class BlockMonitorService:
         self.config = config or BlockMonitorConfig()
         self.web3_provider = get_web3_provider_service()
         
+        # eth_getLogs filter minus the block range, built once. Only
+        # OrderFilled is processed, so the node doesn't ship other events.
+        self._log_filter_base: Dict[str, Any] = {
+            'address': list(self.config.monitored_contracts),
+            'topics': [EVENT_SIGNATURES['OrderFilled']],
+        }
+        
+        # Block timestamps, so a block with several trades is fetched once
+        self._block_timestamps = BlockTimestampCache(
+            self.web3_provider, self.config.block_timestamp_cache_size
+        )
+        
+        # Logs already handled, oldest first: (blockHash, transactionHash,
+        # logIndex) -> (block number, the TradeEvent dispatched for it).
+        # Keyed by block hash, so a log re-mined in a replacement block is
+        # new, and kept so a reorg can revert what was dispatched.
+        self._seen_logs: "OrderedDict[LogKey, Tuple[int, Optional[TradeEvent]]]" = OrderedDict()
+        
         # State tracking
+        self.start_block: int = 0
         self.latest_processed_block: int = 0
         self.is_running: bool = False
         self._monitor_task: Optional[asyncio.Task] = None
         
-        # Event callbacks
-        self._trade_callbacks: List[Callable[[TradeEvent], None]] = []
-        self._block_callbacks: List[Callable[[BlockData], None]] = []
+        # Event callbacks as (callback, is_coroutine_function), classified once
+        # at registration rather than on every block and log
+        self._trade_callbacks: List[Tuple[Callable[[TradeEvent], None], bool]] = []
+        self._trade_removed_callbacks: List[Tuple[Callable[[TradeEvent], None], bool]] = []
+        self._block_callbacks: List[Tuple[Callable[[BlockData], None], bool]] = []
         
         # Statistics
         self.total_blocks_processed: int = 0
         self.total_trades_detected: int = 0
+        self.total_trades_reverted: int = 0
         self.started_at: Optional[datetime] = None
         
         logger.info("BlockMonitorService initialized")
@@ -99,7 +137,17 @@ class BlockMonitorService:
         Args:
             callback: Async function called when trade is detected
         """
-        self._trade_callbacks.append(callback)
+        self._trade_callbacks.append((callback, asyncio.iscoroutinefunction(callback)))
+    
+    def on_trade_removed(self, callback: Callable[[TradeEvent], None]):
+        """
+        Register callback for trades undone by a chain reorg.
+        
+        Args:
+            callback: Async function called with the TradeEvent previously
+                passed to the trade callbacks, once its log is reorged out
+        """
+        self._trade_removed_callbacks.append((callback, asyncio.iscoroutinefunction(callback)))
     
     def on_new_block(self, callback: Callable[[BlockData], None]):
         """
@@ -108,7 +156,7 @@ class BlockMonitorService:
         Args:
             callback: Async function called for each new block
         """
-        self._block_callbacks.append(callback)
+        self._block_callbacks.append((callback, asyncio.iscoroutinefunction(callback)))
     
     async def start(self, from_block: Optional[int] = None):
         """
@@ -129,7 +177,9 @@ class BlockMonitorService:
             w3 = await self.web3_provider.get_web3()
             from_block = await w3.eth.block_number
         
+        self.start_block = from_block
         self.latest_processed_block = from_block
+        self._seen_logs.clear()
         
         logger.info(f"Starting block monitor from block {from_block}")
         
@@ -153,45 +203,117 @@ class BlockMonitorService:
         logger.info("Block monitor stopped")
     
     async def _websocket_monitor(self):
-        """Monitor using WebSocket subscription"""
+        """
+        Monitor using eth_subscribe push subscriptions.
+        
+        The node pushes OrderFilled logs from the monitored contracts as
+        they are mined, so there is no polling interval to wait out and no
+        eth_getLogs round trip per block. Falls back to polling when no
+        WebSocket endpoint is configured or none will hold a subscription.
+        """
+        endpoints = self.web3_provider.get_websocket_endpoints()
+        max_failures = len(endpoints) * self.web3_provider.config.max_consecutive_failures
+        failures = 0
+        reconnect = False
+        
         try:
-            w3 = await self.web3_provider.get_web3()
-            
-            # Subscribe to new block headers
-            logger.info("Subscribing to new block headers via WebSocket")
-            
-            while self.is_running:
+            while self.is_running and failures < max_failures:
+                endpoint = endpoints[failures % len(endpoints)]
                 try:
-                    # Get latest block
-                    latest_block_number = await w3.eth.block_number
-                    
-                    if latest_block_number > self.latest_processed_block:
-                        # Process new blocks
-                        await self._process_block_range(
-                            self.latest_processed_block + 1,
-                            latest_block_number
-                        )
-                        
-                        self.latest_processed_block = latest_block_number
-                    
-                    # Wait for next block (Polygon ~2s block time)
-                    await asyncio.sleep(2)
-                    
-                except Web3Exception as e:
-                    logger.error(f"WebSocket error: {e}. Reconnecting...")
-                    await self.web3_provider.connect()
+                    async with self.web3_provider.persistent_websocket(endpoint) as w3:
+                        logger.info(f"Subscribing to trade logs via {endpoint.name}")
+                        subscriptions = await self._subscribe(w3)
+                        failures = 0
+                        await self._consume_subscriptions(w3, *subscriptions, reconnect=reconnect)
+                except Exception as e:
+                    failures += 1
+                    reconnect = True
+                    logger.error(f"WebSocket error on {endpoint.name}: {e}. Reconnecting...")
                     await asyncio.sleep(5)
+            
+            if self.is_running:
+                logger.info("No usable WebSocket endpoint, falling back to polling mode")
+                await self._polling_monitor()
                     
         except asyncio.CancelledError:
             logger.info("WebSocket monitor cancelled")
-        except Exception as e:
-            logger.error(f"Fatal error in WebSocket monitor: {e}")
-            # Fallback to polling
-            logger.info("Falling back to polling mode")
-            await self._polling_monitor()
+    
+    async def _subscribe(self, w3: AsyncWeb3) -> Tuple[str, Optional[str]]:
+        """
+        Open the push subscriptions on a connected WebSocket.
+        
+        Returns:
+            (logs subscription id, newHeads subscription id or None when no
+            block callbacks are registered)
+        """
+        logs_subscription = await w3.eth.subscribe("logs", self._log_filter_base)
+        heads_subscription = None
+        if self._block_callbacks:
+            heads_subscription = await w3.eth.subscribe("newHeads")
+        return logs_subscription, heads_subscription
+    
+    async def _consume_subscriptions(
+        self,
+        w3: AsyncWeb3,
+        logs_subscription: str,
+        heads_subscription: Optional[str],
+        reconnect: bool = False
+    ):
+        """
+        Process pushed events until the connection closes.
+        
+        Blocks mined while unsubscribed (at startup and across reconnects)
+        are caught up through the range query path first. The subscriptions
+        are already open by then, so nothing is missed in between, and
+        pushes for logs the catch-up handled are skipped by _process_log.
+        
+        Removal pushes for a reorg that happened while disconnected are
+        never delivered, so a reconnect first re-reads the last
+        recovery_lookback_blocks blocks and reconciles them.
+        """
+        caught_up = await w3.eth.block_number
+        
+        if reconnect:
+            await self._reconcile_recent(caught_up)
+        
+        if caught_up > self.latest_processed_block:
+            await self._process_block_range(self.latest_processed_block + 1, caught_up)
+            self.latest_processed_block = caught_up
+        
+        async for message in w3.ws.process_subscriptions():
+            if not self.is_running:
+                break
+            
+            result = message['result']
+            if message['subscription'] == heads_subscription:
+                if result['number'] > caught_up:
+                    await self._dispatch_blocks(result['number'], result['number'])
+                    self.total_blocks_processed += 1
+                continue
+            
+            if message['subscription'] != logs_subscription:
+                continue
+            
+            # Removals (removed=True) are pushed for logs a reorg dropped; the
+            # log is pushed again if it is re-mined
+            await self._process_log(result)
+            if result.get('removed'):
+                continue
+            
+            # Logs arrive in block order, so every earlier block is complete;
+            # a reconnect re-reads the block this log is in, and the logs of
+            # it already handled are skipped by _process_log
+            self.latest_processed_block = max(
+                self.latest_processed_block, result['blockNumber'] - 1
+            )
     
     async def _polling_monitor(self):
-        """Monitor using polling"""
+        """
+        Monitor using polling.
+        
+        Polling gets no removal notices, so every poll also reconciles the
+        last recovery_lookback_blocks blocks against the chain.
+        """
         try:
             logger.info(f"Starting polling monitor (interval: {self.config.polling_interval}s)")
             
@@ -200,6 +322,8 @@ class BlockMonitorService:
                     w3 = await self.web3_provider.get_web3()
                     latest_block_number = await w3.eth.block_number
                     
+                    await self._reconcile_recent(latest_block_number)
+                    
                     if latest_block_number > self.latest_processed_block:
                         await self._process_block_range(
                             self.latest_processed_block + 1,
@@ -217,13 +341,35 @@ class BlockMonitorService:
         except asyncio.CancelledError:
             logger.info("Polling monitor cancelled")
     
-    async def _process_block_range(self, from_block: int, to_block: int):
+    async def _reconcile_recent(self, chain_head: int):
+        """
+        Re-read the last recovery_lookback_blocks processed blocks.
+        
+        Trades a reorg removed go to the removal callbacks and logs re-mined
+        into replacement blocks are handled as new; unchanged logs are
+        skipped. Never reaches back past the block monitoring started from.
+        
+        Args:
+            chain_head: Current block number
+        """
+        if not self.config.enable_recovery:
+            return
+        
+        await self._process_block_range(
+            max(self.start_block + 1, self.latest_processed_block + 1 - self.config.recovery_lookback_blocks),
+            min(self.latest_processed_block, chain_head),
+            replay=True
+        )
+    
+    async def _process_block_range(self, from_block: int, to_block: int, replay: bool = False):
         """
         Process a range of blocks.
         
         Args:
             from_block: Starting block (inclusive)
             to_block: Ending block (inclusive)
+            replay: Range was processed before (recovery): only reconcile
+                its logs, without block callbacks or block stats
         """
         # Process in batches
         for batch_start in range(from_block, to_block + 1, self.config.max_blocks_per_batch):
@@ -234,38 +380,81 @@ class BlockMonitorService:
             # Get logs for Polymarket contracts
             await self._process_logs_in_range(batch_start, batch_end)
             
+            if replay:
+                continue
+            
             # Call block callbacks
             if self._block_callbacks:
-                w3 = await self.web3_provider.get_web3()
-                for block_num in range(batch_start, batch_end + 1):
-                    try:
-                        block = await w3.eth.get_block(block_num)
-                        for callback in self._block_callbacks:
-                            if asyncio.iscoroutinefunction(callback):
-                                await callback(block)
-                            else:
-                                callback(block)
-                    except Exception as e:
-                        logger.error(f"Error processing block {block_num}: {e}")
+                await self._dispatch_blocks(batch_start, batch_end)
             
             self.total_blocks_processed += (batch_end - batch_start + 1)
     
+    async def _dispatch_blocks(self, from_block: int, to_block: int):
+        """Fetch a range of blocks and pass each to the block callbacks"""
+        blocks = await self._fetch_blocks(from_block, to_block)
+        for block_num, block in zip(range(from_block, to_block + 1), blocks):
+            try:
+                if isinstance(block, BaseException):
+                    raise block
+                for callback, is_async in self._block_callbacks:
+                    if is_async:
+                        await callback(block)
+                    else:
+                        callback(block)
+            except Exception as e:
+                logger.error(f"Error processing block {block_num}: {e}")
+    
+    async def _fetch_blocks(self, from_block: int, to_block: int) -> List[Any]:
+        """
+        Fetch a range of blocks with overlapping requests.
+        
+        web3 6.x has no JSON-RPC batching, so the round trips are overlapped
+        instead (bounded by max_concurrent_block_fetches) rather than paid
+        one after another.
+        
+        Returns:
+            Blocks in order; a failed fetch is its exception in place
+        """
+        w3 = await self.web3_provider.get_web3()
+        semaphore = asyncio.Semaphore(self.config.max_concurrent_block_fetches)
+        
+        async def fetch(block_num: int) -> BlockData:
+            async with semaphore:
+                return await w3.eth.get_block(block_num)
+        
+        return await asyncio.gather(
+            *(fetch(block_num) for block_num in range(from_block, to_block + 1)),
+            return_exceptions=True
+        )
+    
     async def _process_logs_in_range(self, from_block: int, to_block: int):
         """Process logs for monitored contracts in block range"""
         try:
             w3 = await self.web3_provider.get_web3()
             
-            # Get logs for monitored contracts
+            # Get logs for monitored contracts (a range query rather than a
+            # node-side filter: filters live on one node and are lost on RPC
+            # failover, and ranges replay exactly during recovery)
             filter_params = {
+                **self._log_filter_base,
                 'fromBlock': from_block,
                 'toBlock': to_block,
-                'address': list(self.config.monitored_contracts)
             }
             
             logs = await w3.eth.get_logs(filter_params)
             
             logger.debug(f"Found {len(logs)} logs in blocks {from_block}-{to_block}")
             
+            # Logs handled earlier in this range that the canonical chain no
+            # longer has were reorged out
+            current = {_log_key(log) for log in logs}
+            stale = [
+                key for key, (block_number, _) in self._seen_logs.items()
+                if from_block <= block_number <= to_block and key not in current
+            ]
+            for key in stale:
+                await self._revert_log(key)
+            
             # Process each log
             for log in logs:
                 await self._process_log(log)
@@ -277,33 +466,81 @@ class BlockMonitorService:
         """
         Process a single log entry.
         
+        A log flagged removed (reorged out) reverts the trade dispatched for
+        it; a log already handled (catch-up overlap, recovery replay) is
+        skipped.
+        
         Args:
             log: Log receipt from blockchain
         """
+        key = _log_key(log)
+        if log.get('removed'):
+            await self._revert_log(key)
+            return
+        
+        if key in self._seen_logs:
+            return
+        
         try:
-            # Check if this is a trade event
-            event_signature = log['topics'][0].hex() if log['topics'] else None
-            
-            if event_signature == EVENT_SIGNATURES.get('OrderFilled'):
+            # Check if this is a trade event (topics are HexBytes, a bytes
+            # subclass, so this is a plain 32-byte compare)
+            trade_event = None
+            if log['topics'] and log['topics'][0] == _ORDER_FILLED_TOPIC:
                 # Parse trade event
                 trade_event = await self._parse_trade_event(log)
-                
-                if trade_event:
-                    # Call trade callbacks
-                    for callback in self._trade_callbacks:
-                        try:
-                            if asyncio.iscoroutinefunction(callback):
-                                await callback(trade_event)
-                            else:
-                                callback(trade_event)
-                        except Exception as e:
-                            logger.error(f"Error in trade callback: {e}")
-                    
-                    self.total_trades_detected += 1
+            
+            self._remember_log(key, log['blockNumber'], trade_event)
+            
+            if trade_event:
+                await self._dispatch_trade(self._trade_callbacks, trade_event)
+                self.total_trades_detected += 1
                     
         except Exception as e:
             logger.error(f"Error processing log: {e}")
     
+    def _remember_log(self, key: LogKey, block_number: int, trade_event: Optional[TradeEvent]):
+        """Record a handled log, dropping the oldest past seen_log_cache_size"""
+        seen = self._seen_logs
+        seen[key] = (block_number, trade_event)
+        if len(seen) > self.config.seen_log_cache_size:
+            seen.popitem(last=False)
+    
+    async def _revert_log(self, key: LogKey):
+        """
+        Forget a log a reorg removed and pass its trade to the removal callbacks.
+        
+        Args:
+            key: (blockHash, transactionHash, logIndex) of the removed log
+        """
+        entry = self._seen_logs.pop(key, None)
+        if entry is None:
+            # Never handled here (or aged out of the seen logs)
+            return
+        
+        block_number, trade_event = entry
+        logger.warning(
+            f"Log {key[1].hex()}:{key[2]} in block {block_number} removed by reorg"
+        )
+        
+        if trade_event:
+            await self._dispatch_trade(self._trade_removed_callbacks, trade_event)
+            self.total_trades_reverted += 1
+    
+    async def _dispatch_trade(
+        self,
+        callbacks: List[Tuple[Callable[[TradeEvent], None], bool]],
+        trade_event: TradeEvent
+    ):
+        """Call each callback with a trade (a failing callback doesn't stop the rest)"""
+        for callback, is_async in callbacks:
+            try:
+                if is_async:
+                    await callback(trade_event)
+                else:
+                    callback(trade_event)
+            except Exception as e:
+                logger.error(f"Error in trade callback: {e}")
+    
     async def _parse_trade_event(self, log: LogReceipt) -> Optional[TradeEvent]:
         """
         Parse OrderFilled event into TradeEvent.
@@ -320,7 +557,7 @@ class BlockMonitorService:
             # Get transaction details for more context
             tx_hash = log['transactionHash'].hex()
             tx = await w3.eth.get_transaction(tx_hash)
-            block = await w3.eth.get_block(log['blockNumber'])
+            block_timestamp = await self._block_timestamps.get(log['blockHash'])
             
             # Decode log data (simplified - actual decoding would use w3.eth.contract)
             # For now, extract basic info
@@ -334,7 +571,7 @@ class BlockMonitorService:
             trade_event = TradeEvent(
                 transaction_hash=tx_hash,
                 block_number=log['blockNumber'],
-                block_timestamp=block['timestamp'],
+                block_timestamp=block_timestamp,
                 log_index=log['logIndex'],
                 trader_address=trader_address,
                 market_id='',  # Would be parsed from log data
@@ -344,7 +581,7 @@ class BlockMonitorService:
                 price=Decimal('0'),  # Calculated from amounts
                 value_usd=Decimal('0'),  # Calculated
                 fees=Decimal('0'),  # From log data
-                raw_log=dict(log)
+                raw_log=log if self.config.keep_raw_logs else None
             )
             
             return trade_event
@@ -364,19 +601,14 @@ class BlockMonitorService:
             'latest_processed_block': self.latest_processed_block,
             'total_blocks_processed': self.total_blocks_processed,
             'total_trades_detected': self.total_trades_detected,
+            'total_trades_reverted': self.total_trades_reverted,
             'uptime_seconds': uptime,
             'mode': 'websocket' if self.config.use_websocket else 'polling',
             'monitored_contracts': len(self.config.monitored_contracts)
         }
 
 
-# Singleton instance
-_block_monitor_service: Optional[BlockMonitorService] = None
-
-
+@cache
 def get_block_monitor_service() -> BlockMonitorService:
     """Get singleton instance of BlockMonitorService"""
-    global _block_monitor_service
-    if _block_monitor_service is None:
-        _block_monitor_service = BlockMonitorService()
-    return _block_monitor_service
+    return BlockMonitorService()
@@ -10,8 +10,9 @@ Polymarket uses the CLOB (Central Limit Order Book) system with:
 """
 
 from dataclasses import dataclass
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from decimal import Decimal
+from eth_utils import event_abi_to_log_topic
 
 
 # Polymarket Contract Addresses on Polygon
@@ -20,7 +21,7 @@ POLYMARKET_CONTRACTS = {
     'CTF_EXCHANGE': '0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E',
     
     # Conditional Tokens Framework
-    'CTF': '0x4D97DCd97eC945f4​0Cf65F87097ACe5EA0476045',
+    'CTF': '0x4D97DCd97eC945f40cF65F87097ACe5EA0476045',
     
     # Order Book proxy
     'ORDER_BOOK': '0xdFE02Eb6733538f8Ea35D585af8DE5958AD99E40',
@@ -33,24 +34,31 @@ POLYMARKET_CONTRACTS = {
 # Event signatures for tracking
 EVENT_SIGNATURES = {
     # Order placed event
-    'OrderFilled': '0x52a2c9e52d3f2c8f7a75b3b0e0e3c1c2f7e3b8c5d8e2f3a4b5c6d7e8f9a0b1c2',
+    'OrderFilled': '0xd0a08e8c493f9c94f29311604c9de1b4e8c8d4c06bd0c789af57f2d65bfec0f6',
     
     # Position minted (outcome tokens created)
-    'PositionSplit': '0x93c1f3e36ed71139f46f2f88b3f6f86ff0685c96a2a3b7c8aa7f3f6c9b9e3a23',
+    'PositionSplit': '0x2e6bb91f8cbcda0c93623c54d0403a43514fabc40084ec96b6d5379a74786298',
     
-    # Position merged (tokens redeemed)
-    'PositionMerged': '0xa1f4c8e3d2b5f6a7c8d9e0f1a2b3c4d5e6f7a8b9c0d1e2f3a4b5c6d7e8f9a0b1',
+    # Positions merged (tokens redeemed)
+    'PositionsMerge': '0x6f13ca62553fcc2bcd2372180a43949c1e4cebba603901ede2f4e14f36b282ca',
     
     # Transfer (ERC20/ERC1155)
     'Transfer': '0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef',
-    'TransferSingle': '0xc3d58168c5ae7397731d063d5bbffffffffffffffffffffffcd6d7e3c96d38e85',
-    'TransferBatch': '0x4a39dc06d4c0dbc64b70af90fd698a233a518aa5d07e59​5b87c1e85ef9b94fc3f7',
+    'TransferSingle': '0xc3d58168c5ae7397731d063d5bbf3d657854427343f4c083240f7aacaa2d0f62',
+    'TransferBatch': '0x4a39dc06d4c0dbc64b70af90fd698a233a518aa5d07e595d983b8c0526c8f7fb',
+}
+
+# Same signatures as raw 32-byte topics, for comparing against log['topics']
+# without hex-encoding every log
+EVENT_SIGNATURES_BYTES = {
+    name: bytes.fromhex(signature[2:])
+    for name, signature in EVENT_SIGNATURES.items()
 }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TradeEvent:
-    """Parsed trade event from blockchain"""
+    """Parsed trade event from blockchain (immutable, no per-instance __dict__)"""
     transaction_hash: str
     block_number: int
     block_timestamp: int
@@ -68,8 +76,9 @@ class TradeEvent:
     value_usd: Decimal
     fees: Decimal
     
-    # Raw data
-    raw_log: Dict[str, Any]
+    # Raw data, the original log (not a copy); only kept when the monitor is
+    # configured with keep_raw_logs
+    raw_log: Optional[Dict[str, Any]] = None
 
 
 # Simplified CTF Exchange ABI (key functions and events)
@@ -135,7 +144,7 @@ CTF_ABI = [
             {"indexed": False, "name": "partition", "type": "uint256[]"},
             {"indexed": False, "name": "amount", "type": "uint256"},
         ],
-        "name": "PositionMerged",
+        "name": "PositionsMerge",
         "type": "event"
     },
     # ERC1155 Transfer events
@@ -166,6 +175,27 @@ CTF_ABI = [
 ]
 
 
+def _check_event_signatures():
+    """
+    Fail at import if a topic constant is malformed or doesn't match the
+    keccak of its ABI event signature (a wrong topic never matches a log,
+    so it would otherwise go unnoticed).
+    """
+    abi_topics = {
+        abi['name']: event_abi_to_log_topic(abi)
+        for abi in CTF_EXCHANGE_ABI + CTF_ABI
+        if abi['type'] == 'event'
+    }
+    for name, topic in EVENT_SIGNATURES_BYTES.items():
+        if len(topic) != 32:
+            raise ValueError(f"Event signature {name} is not a 32-byte topic")
+        if name in abi_topics and abi_topics[name] != topic:
+            raise ValueError(f"Event signature {name} doesn't match its ABI")
+
+
+_check_event_signatures()
+
+
 def get_contract_abi(contract_name: str) -> List[Dict[str, Any]]:
     """
     Get ABI for a contract.
@@ -196,3 +226,39 @@ def get_contract_address(contract_name: str) -> str:
         Contract address on Polygon
     """
     return POLYMARKET_CONTRACTS.get(contract_name, '')
+
+
+# OrderFilled data: taker address, then makerAssetId, takerAssetId,
+# makerAmountFilled, takerAmountFilled, fee (one 32-byte word each)
+ORDER_FILLED_DATA_SIZE = 6 * 32
+
+
+def decode_order_filled(log: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Decode an OrderFilled log at its fixed word offsets.
+    
+    The event layout never changes, so this slices the data directly instead
+    of running the generic ABI decoder on every log. Returns the same
+    {'args': {...}} shape as contract.events.OrderFilled().process_log(),
+    with addresses as lowercase hex.
+    
+    Raises:
+        ValueError: If the log is not shaped like OrderFilled
+    """
+    topics = log['topics']
+    data = bytes(log['data'])
+    if len(topics) < 3 or len(data) != ORDER_FILLED_DATA_SIZE:
+        raise ValueError("Log is not an OrderFilled event")
+    
+    return {
+        'args': {
+            'orderHash': topics[1],
+            'maker': '0x' + bytes(topics[2][12:]).hex(),
+            'taker': '0x' + data[12:32].hex(),
+            'makerAssetId': int.from_bytes(data[32:64], 'big'),
+            'takerAssetId': int.from_bytes(data[64:96], 'big'),
+            'makerAmountFilled': int.from_bytes(data[96:128], 'big'),
+            'takerAmountFilled': int.from_bytes(data[128:160], 'big'),
+            'fee': int.from_bytes(data[160:192], 'big'),
+        }
+    }
@@ -12,7 +12,8 @@ Features:
 """
 
 import asyncio
-from typing import Optional, Set, Dict, Any, Callable, List
+from functools import cache
+from typing import Optional, Set, Dict, Any, Callable, List, Tuple
 from dataclasses import dataclass, asdict
 from decimal import Decimal
 from datetime import datetime
@@ -20,9 +21,9 @@ from web3.types import LogReceipt, TxReceipt
 from eth_utils import to_checksum_address
 from loguru import logger
 
-from app.services.blockchain.web3_provider import get_web3_provider_service
+from app.services.blockchain.web3_provider import get_web3_provider_service, BlockTimestampCache
 from app.services.blockchain.contracts import (
-    POLYMARKET_CONTRACTS, get_contract_abi, EVENT_SIGNATURES
+    POLYMARKET_CONTRACTS, EVENT_SIGNATURES, decode_order_filled
 )
 
 
@@ -40,7 +41,6 @@ class ParsedTrade:
     
     # Market info
     market_id: str
-    market_name: Optional[str] = None
     
     # Trade details
     side: str  # "BUY" or "SELL"
@@ -49,6 +49,9 @@ class ParsedTrade:
     price: Decimal
     total_value: Decimal
     
+    # Optional market info (after the required fields: dataclass ordering)
+    market_name: Optional[str] = None
+    
     # Fees
     fees: Decimal = Decimal('0')
     gas_used: int = 0
@@ -102,8 +105,12 @@ class EventListenerService:
         self._processed_events: Set[str] = set()  # event_id = tx_hash:log_index
         self._reorg_buffer: Dict[int, List[ParsedTrade]] = {}  # block_number -> trades
         
-        # Callbacks
-        self._trade_callbacks: List[Callable[[ParsedTrade], None]] = []
+        # Block timestamps, so a block with several trades is fetched once
+        self._block_timestamps = BlockTimestampCache(self.web3_provider)
+        
+        # Callbacks as (callback, is_coroutine_function), classified once at
+        # registration rather than per trade
+        self._trade_callbacks: List[Tuple[Callable[[ParsedTrade], None], bool]] = []
         
         # State
         self.is_running: bool = False
@@ -129,7 +136,7 @@ class EventListenerService:
         Args:
             callback: Async function called with ParsedTrade
         """
-        self._trade_callbacks.append(callback)
+        self._trade_callbacks.append((callback, asyncio.iscoroutinefunction(callback)))
     
     async def start(self, from_block: Optional[int] = None):
         """
@@ -303,24 +310,17 @@ class EventListenerService:
             tx_hash = log['transactionHash'].hex()
             tx = await w3.eth.get_transaction(tx_hash)
             receipt = await w3.eth.get_transaction_receipt(tx_hash)
-            block = await w3.eth.get_block(log['blockNumber'])
+            block_timestamp = await self._block_timestamps.get(log['blockHash'])
             
             # Verify transaction success
             if receipt['status'] != 1:
                 logger.debug(f"Transaction {tx_hash} failed, skipping")
                 return None
             
-            # Create contract instance for event decoding
-            contract_address = to_checksum_address(log['address'])
-            contract = w3.eth.contract(
-                address=contract_address,
-                abi=get_contract_abi('CTF_EXCHANGE')
-            )
-            
-            # Decode event
+            # Decode event (fixed layout, no contract instance or ABI codec)
             try:
-                event_data = contract.events.OrderFilled().process_log(log)
-            except Exception as e:
+                event_data = decode_order_filled(log)
+            except ValueError as e:
                 logger.error(f"Failed to decode event: {e}")
                 # Fallback: manual parsing
                 event_data = self._manual_parse_event(log)
@@ -329,7 +329,7 @@ class EventListenerService:
             args = event_data.get('args', {})
             
             # Determine trader (use 'from' address as trader for now)
-            trader_address = to_checksum_address(tx['from'])
+            trader_address = tx['from']
             
             # Extract amounts (these are in token units, usually 1e6 for USDC)
             maker_amount = Decimal(str(args.get('makerAmountFilled', 0))) / Decimal('1e6')
@@ -358,7 +358,7 @@ class EventListenerService:
             trade = ParsedTrade(
                 tx_hash=tx_hash,
                 block_number=log['blockNumber'],
-                block_timestamp=block['timestamp'],
+                block_timestamp=block_timestamp,
                 log_index=log['logIndex'],
                 trader_address=trader_address,
                 market_id=market_id,
@@ -489,9 +489,9 @@ class EventListenerService:
         )
         
         # Call all registered callbacks
-        for callback in self._trade_callbacks:
+        for callback, is_async in self._trade_callbacks:
             try:
-                if asyncio.iscoroutinefunction(callback):
+                if is_async:
                     await callback(trade)
                 else:
                     callback(trade)
@@ -512,13 +512,7 @@ class EventListenerService:
         }
 
 
-# Singleton instance
-_event_listener_service: Optional[EventListenerService] = None
-
-
+@cache
 def get_event_listener_service() -> EventListenerService:
     """Get singleton instance of EventListenerService"""
-    global _event_listener_service
-    if _event_listener_service is None:
-        _event_listener_service = EventListenerService()
-    return _event_listener_service
+    return EventListenerService()
@@ -9,10 +9,14 @@ Manages Redis queue for parsed trades with:
 """
 
 import asyncio
-import json
+import time
+from dataclasses import fields
+from functools import cache
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 from decimal import Decimal
+import msgspec
+import orjson
 import redis.asyncio as redis
 from loguru import logger
 
@@ -20,6 +24,104 @@ from app.core.config import settings
 from app.services.blockchain.event_listener import ParsedTrade
 
 
+class QueuedTrade(msgspec.Struct, array_like=True):
+    """
+    On-wire form of a queued trade (msgpack).
+    
+    ParsedTrade's fields followed by queue bookkeeping. Encoded as an array,
+    so field names aren't repeated in every payload: only ever append new
+    fields (with defaults) at the end.
+    """
+    # ParsedTrade
+    tx_hash: str
+    block_number: int
+    block_timestamp: int
+    log_index: int
+    trader_address: str
+    market_id: str
+    market_name: Optional[str]
+    side: str
+    outcome: str
+    quantity: Decimal
+    price: Decimal
+    total_value: Decimal
+    fees: Decimal
+    gas_used: int
+    gas_price: int
+    is_maker: bool
+    order_id: Optional[str]
+    is_valid: bool
+    validation_errors: List[str]
+    
+    # Queue bookkeeping (timestamps in epoch ms)
+    queued_at: int = 0
+    retry_count: int = 0
+    priority: int = 0
+    last_error: Optional[str] = None
+    retry_at: Optional[int] = None
+    final_error: Optional[str] = None
+    failed_at: Optional[int] = None
+
+
+_TRADE_FIELDS = tuple(f.name for f in fields(ParsedTrade))
+_encoder = msgspec.msgpack.Encoder()
+_decoder = msgspec.msgpack.Decoder(QueuedTrade)
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+# Pop up to N trades and record them as processing, atomically in one step,
+# so a worker crash can't lose a trade between the pop and the mark.
+# KEYS[1] = pending queue, KEYS[2] = this worker's processing hash,
+# KEYS[3] = consumed counter
+# ARGV = max trades, started_at, worker_id, processing timeout (seconds)
+# Returns the popped payloads (empty when the queue is empty)
+POP_AND_MARK_SCRIPT = """
+local payloads = redis.call('RPOP', KEYS[1], ARGV[1])
+if not payloads then
+    return {}
+end
+local marked = 0
+for _, payload in ipairs(payloads) do
+    -- tx_hash is the first field of a msgpack QueuedTrade (JSON for older payloads)
+    local ok, tx_hash = pcall(function()
+        if string.sub(payload, 1, 1) == '{' then
+            return cjson.decode(payload)['tx_hash']
+        end
+        return cmsgpack.unpack(payload)[1]
+    end)
+    if ok and type(tx_hash) == 'string' then
+        redis.call('HSET', KEYS[2], tx_hash, cjson.encode({
+            started_at = ARGV[2], worker_id = ARGV[3], tx_hash = tx_hash
+        }))
+        marked = marked + 1
+    end
+end
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+redis.call('INCRBY', KEYS[3], marked)
+return payloads
+"""
+
+
+# Move up to N payloads from the dead letter queue back to pending in one
+# atomic step (a crash can't drop trades between the pop and the push).
+# KEYS[1] = dead letter queue, KEYS[2] = pending queue, ARGV[1] = max trades
+# Returns the number of trades moved
+REQUEUE_FAILED_SCRIPT = """
+local payloads = redis.call('RPOP', KEYS[1], ARGV[1])
+if not payloads then
+    return 0
+end
+-- LPUSH in slices: unpack() is bounded by the Lua stack
+for i = 1, #payloads, 1000 do
+    redis.call('LPUSH', KEYS[2], unpack(payloads, i, math.min(i + 999, #payloads)))
+end
+return #payloads
+"""
+
+
 class TradeQueueService:
     """
     Manages Redis queue for trade processing.
@@ -53,15 +155,22 @@ class TradeQueueService:
     COMPLETED_SET = "trades:completed"
     RETRY_QUEUE = "trades:retry"
     
+    # Counters shared by every worker (pushed, consumed, completed, failed)
+    STATS_PREFIX = "trades:stats"
+    
     # Configuration
     MAX_RETRIES = 3
     RETRY_DELAY_BASE = 5  # seconds
     PROCESSING_TIMEOUT = 300  # 5 minutes
+    IDLE_SLEEP_MIN = 0.05  # first poll backoff on an empty queue (seconds)
+    MAX_CONNECTIONS = 4  # per worker; commands are batched into pipelines
     
     def __init__(self):
         """Initialize queue service"""
         self.redis_client: Optional[redis.Redis] = None
+        self._connect_lock = asyncio.Lock()
         self.worker_id: str = f"worker_{id(self)}"
+        self._processing_key: str = f"{self.PROCESSING_PREFIX}:{self.worker_id}"
         
         # Statistics
         self.total_pushed: int = 0
@@ -72,14 +181,38 @@ class TradeQueueService:
         logger.info(f"TradeQueueService initialized (worker: {self.worker_id})")
     
     async def connect(self):
-        """Connect to Redis"""
-        if not self.redis_client:
-            self.redis_client = await redis.from_url(
-                str(settings.REDIS_URL),
-                encoding="utf-8",
-                decode_responses=True
-            )
-            logger.info("Connected to Redis for trade queue")
+        """
+        Connect to Redis (idempotent).
+        
+        Call once at startup: the per-trade methods (push_trade,
+        mark_completed, mark_failed) expect an open client rather than
+        checking on every call.
+        
+        The pool is small and blocking (callers wait for a free connection
+        rather than opening more): anything that sends more than one
+        command should batch them through _pipe() instead of awaiting each.
+        """
+        async with self._connect_lock:
+            if self.redis_client is None:
+                # Raw bytes replies: queued trades go straight into the
+                # decoder without a UTF-8 decode in between
+                pool = redis.BlockingConnectionPool.from_url(
+                    str(settings.REDIS_URL),
+                    max_connections=self.MAX_CONNECTIONS,
+                    decode_responses=False
+                )
+                self.redis_client = redis.Redis.from_pool(pool)
+                logger.info("Connected to Redis for trade queue")
+    
+    def _require_client(self) -> redis.Redis:
+        """The connected client (raises if connect() hasn't been awaited)"""
+        if self.redis_client is None:
+            raise RuntimeError("TradeQueueService.connect() must be awaited first")
+        return self.redis_client
+    
+    def _pipe(self) -> redis.client.Pipeline:
+        """Non-transactional pipeline: one round trip for a batch of commands"""
+        return self._require_client().pipeline(transaction=False)
     
     async def push_trade(
         self,
@@ -97,31 +230,28 @@ class TradeQueueService:
             True if successfully queued
         """
         try:
-            await self.connect()
+            self._require_client()
             
             # Serialize trade
-            trade_data = {
-                **trade.to_dict(),
-                'queued_at': datetime.utcnow().isoformat(),
-                'retry_count': 0,
-                'priority': priority
-            }
+            payload = self._encode_trade(trade, queued_at=_now_ms(), priority=priority)
             
-            trade_json = json.dumps(trade_data)
-            
-            # Push to queue (LPUSH = add to left, RPOP = consume from right = FIFO)
-            if priority > 0:
-                # High priority: add to left (will be consumed first)
-                await self.redis_client.lpush(self.PENDING_QUEUE, trade_json)
-            else:
-                # Normal priority: add to right
-                await self.redis_client.rpush(self.PENDING_QUEUE, trade_json)
+            async with self._pipe() as pipe:
+                # Push to queue (LPUSH = add to left, RPOP = consume from right = FIFO)
+                # (both return the new queue length, so no LLEN is needed to log it)
+                if priority > 0:
+                    # High priority: add to left (will be consumed first)
+                    pipe.lpush(self.PENDING_QUEUE, payload)
+                else:
+                    # Normal priority: add to right
+                    pipe.rpush(self.PENDING_QUEUE, payload)
+                pipe.incr(f"{self.STATS_PREFIX}:pushed")
+                queue_size, _ = await pipe.execute()
             
             self.total_pushed += 1
             
             logger.debug(
                 f"Queued trade: {trade.tx_hash[:16]}... "
-                f"(priority: {priority}, queue size: {await self.get_queue_size()})"
+                f"(priority: {priority}, queue size: {queue_size})"
             )
             
             return True
@@ -133,45 +263,60 @@ class TradeQueueService:
     async def consume_trades(
         self,
         batch_size: int = 10,
-        timeout: int = 5
+        timeout: float = 1.0
     ):
         """
         Consume trades from queue (async generator).
         
+        Polls with a non-blocking pop instead of BRPOP/BLMPOP, so no Redis
+        connection sits blocked server-side while the queue is idle.
+        
         Args:
             batch_size: Max trades to fetch at once
-            timeout: Timeout for blocking pop (seconds)
+            timeout: Longest sleep between polls of an empty queue (seconds)
             
         Yields:
             ParsedTrade objects
         """
         await self.connect()
         
+        # Sends EVALSHA and only re-ships the body after a NOSCRIPT
+        pop_and_mark = self.redis_client.register_script(POP_AND_MARK_SCRIPT)
+        idle_sleep = self.IDLE_SLEEP_MIN
+        
         while True:
             try:
-                # Pop from queue (BRPOP = blocking right pop)
-                result = await self.redis_client.brpop(
-                    self.PENDING_QUEUE,
-                    timeout=timeout
+                # Pop up to batch_size trades and mark them as processing in
+                # one round trip
+                payloads = await pop_and_mark(
+                    keys=[self.PENDING_QUEUE, self._processing_key, f"{self.STATS_PREFIX}:consumed"],
+                    args=[
+                        batch_size,
+                        datetime.utcnow().isoformat(),
+                        self.worker_id,
+                        self.PROCESSING_TIMEOUT
+                    ]
                 )
                 
-                if not result:
-                    # Timeout, no trades available
-                    await asyncio.sleep(1)
+                if not payloads:
+                    # No trades available: back off, up to timeout
+                    await asyncio.sleep(idle_sleep)
+                    idle_sleep = min(idle_sleep * 1.5, timeout)
                     continue
                 
-                queue_name, trade_json = result
-                
-                # Parse trade
-                trade_data = json.loads(trade_json)
-                trade = self._deserialize_trade(trade_data)
-                
-                # Mark as processing
-                await self._mark_processing(trade)
+                idle_sleep = self.IDLE_SLEEP_MIN
                 
-                self.total_consumed += 1
-                
-                yield trade
+                for payload in payloads:
+                    # Parse trade (a bad payload mustn't lose the rest of the batch)
+                    try:
+                        trade = self._decode_trade(payload)
+                    except Exception as e:
+                        logger.error(f"Dropping undecodable trade payload: {e}")
+                        continue
+                    
+                    self.total_consumed += 1
+                    
+                    yield trade
                 
             except asyncio.CancelledError:
                 logger.info("Trade consumer cancelled")
@@ -193,30 +338,26 @@ class TradeQueueService:
             metadata: Optional completion metadata
         """
         try:
-            await self.connect()
-            
-            # Remove from processing
-            processing_key = f"{self.PROCESSING_PREFIX}:{self.worker_id}"
-            await self.redis_client.hdel(processing_key, tx_hash)
+            self._require_client()
             
-            # Add to completed set (with timestamp as score)
             timestamp = datetime.utcnow().timestamp()
-            await self.redis_client.zadd(
-                self.COMPLETED_SET,
-                {tx_hash: timestamp}
-            )
             
-            # Store metadata if provided
-            if metadata:
-                await self.redis_client.hset(
-                    f"trades:metadata:{tx_hash}",
-                    mapping=metadata
-                )
-                # Expire after 7 days
-                await self.redis_client.expire(
-                    f"trades:metadata:{tx_hash}",
-                    7 * 24 * 60 * 60
-                )
+            # One round trip for all of it
+            async with self._pipe() as pipe:
+                # Remove from processing
+                pipe.hdel(self._processing_key, tx_hash)
+                
+                # Add to completed set (with timestamp as score)
+                pipe.zadd(self.COMPLETED_SET, {tx_hash: timestamp})
+                
+                # Store metadata if provided
+                if metadata:
+                    pipe.hset(f"trades:metadata:{tx_hash}", mapping=metadata)
+                    # Expire after 7 days
+                    pipe.expire(f"trades:metadata:{tx_hash}", 7 * 24 * 60 * 60)
+                
+                pipe.incr(f"{self.STATS_PREFIX}:completed")
+                await pipe.execute()
             
             self.total_completed += 1
             
@@ -240,47 +381,48 @@ class TradeQueueService:
             retry: Whether to retry or move to DLQ
         """
         try:
-            await self.connect()
-            
-            # Remove from processing
-            processing_key = f"{self.PROCESSING_PREFIX}:{self.worker_id}"
-            await self.redis_client.hdel(processing_key, trade.tx_hash)
+            self._require_client()
             
             # Get current retry count
-            trade_data = trade.to_dict()
-            retry_count = trade_data.get('retry_count', 0)
+            retry_count = getattr(trade, 'retry_count', 0)
+            now_ms = _now_ms()
             
             if retry and retry_count < self.MAX_RETRIES:
                 # Retry with exponential backoff
                 retry_count += 1
-                trade_data['retry_count'] = retry_count
-                trade_data['last_error'] = error
-                trade_data['retry_at'] = (
-                    datetime.utcnow() + 
-                    timedelta(seconds=self.RETRY_DELAY_BASE ** retry_count)
-                ).isoformat()
-                
-                # Add to retry queue
-                await self.redis_client.lpush(
-                    self.RETRY_QUEUE,
-                    json.dumps(trade_data)
+                target_queue = self.RETRY_QUEUE
+                payload = self._encode_trade(
+                    trade,
+                    queued_at=now_ms,
+                    retry_count=retry_count,
+                    last_error=error,
+                    retry_at=now_ms + self.RETRY_DELAY_BASE ** retry_count * 1000
                 )
-                
+            else:
+                # Move to dead letter queue
+                target_queue = self.FAILED_QUEUE
+                payload = self._encode_trade(
+                    trade,
+                    queued_at=now_ms,
+                    retry_count=retry_count,
+                    final_error=error,
+                    failed_at=now_ms
+                )
+            
+            # Remove from processing and requeue in one round trip
+            async with self._pipe() as pipe:
+                pipe.hdel(self._processing_key, trade.tx_hash)
+                pipe.lpush(target_queue, payload)
+                if target_queue == self.FAILED_QUEUE:
+                    pipe.incr(f"{self.STATS_PREFIX}:failed")
+                await pipe.execute()
+            
+            if target_queue == self.RETRY_QUEUE:
                 logger.warning(
                     f"Trade failed, scheduling retry {retry_count}/{self.MAX_RETRIES}: "
                     f"{trade.tx_hash[:16]}... - {error}"
                 )
             else:
-                # Move to dead letter queue
-                trade_data['retry_count'] = retry_count
-                trade_data['final_error'] = error
-                trade_data['failed_at'] = datetime.utcnow().isoformat()
-                
-                await self.redis_client.lpush(
-                    self.FAILED_QUEUE,
-                    json.dumps(trade_data)
-                )
-                
                 self.total_failed += 1
                 
                 logger.error(
@@ -291,27 +433,23 @@ class TradeQueueService:
         except Exception as e:
             logger.error(f"Failed to mark trade as failed: {e}")
     
-    async def _mark_processing(self, trade: ParsedTrade):
-        """Mark trade as currently processing"""
-        processing_key = f"{self.PROCESSING_PREFIX}:{self.worker_id}"
-        
-        processing_data = {
-            'started_at': datetime.utcnow().isoformat(),
-            'worker_id': self.worker_id,
-            'tx_hash': trade.tx_hash
-        }
-        
-        await self.redis_client.hset(
-            processing_key,
-            trade.tx_hash,
-            json.dumps(processing_data)
-        )
+    def _encode_trade(self, trade: ParsedTrade, **queue_fields: Any) -> bytes:
+        """Encode a trade and its queue bookkeeping as a msgpack payload"""
+        return _encoder.encode(QueuedTrade(
+            **{name: getattr(trade, name) for name in _TRADE_FIELDS},
+            **queue_fields
+        ))
+    
+    def _decode_trade(self, payload: bytes) -> ParsedTrade:
+        """Decode a queued payload (msgpack, or JSON from before the switch)"""
+        if payload[:1] == b'{':
+            return self._deserialize_trade(orjson.loads(payload))
         
-        # Set expiration in case worker crashes
-        await self.redis_client.expire(processing_key, self.PROCESSING_TIMEOUT)
+        queued = _decoder.decode(payload)
+        return ParsedTrade(**{name: getattr(queued, name) for name in _TRADE_FIELDS})
     
     def _deserialize_trade(self, data: Dict[str, Any]) -> ParsedTrade:
-        """Deserialize trade from dict"""
+        """Deserialize trade from dict (JSON payloads)"""
         # Convert string decimals back to Decimal
         data['quantity'] = Decimal(str(data['quantity']))
         data['price'] = Decimal(str(data['price']))
@@ -324,36 +462,52 @@ class TradeQueueService:
         data.pop('priority', None)
         data.pop('retry_at', None)
         data.pop('last_error', None)
+        data.pop('final_error', None)
+        data.pop('failed_at', None)
         
         return ParsedTrade(**data)
     
     async def get_queue_size(self) -> int:
         """Get number of trades in pending queue"""
-        await self.connect()
-        return await self.redis_client.llen(self.PENDING_QUEUE)
+        return await self._require_client().llen(self.PENDING_QUEUE)
     
     async def get_failed_count(self) -> int:
         """Get number of trades in failed queue"""
-        await self.connect()
-        return await self.redis_client.llen(self.FAILED_QUEUE)
+        return await self._require_client().llen(self.FAILED_QUEUE)
     
     async def get_completed_count(self) -> int:
         """Get number of completed trades"""
-        await self.connect()
-        return await self.redis_client.zcard(self.COMPLETED_SET)
+        return await self._require_client().zcard(self.COMPLETED_SET)
     
     async def get_status(self) -> Dict[str, Any]:
-        """Get queue status"""
+        """
+        Get queue status.
+        
+        Totals are across all workers (the Redis counters); the total_*
+        attributes on the instance only count this process.
+        """
         await self.connect()
         
+        async with self._pipe() as pipe:
+            pipe.llen(self.PENDING_QUEUE)
+            pipe.llen(self.FAILED_QUEUE)
+            pipe.zcard(self.COMPLETED_SET)
+            pipe.mget([
+                f"{self.STATS_PREFIX}:{name}"
+                for name in ('pushed', 'consumed', 'completed', 'failed')
+            ])
+            pending, failed, completed, totals = await pipe.execute()
+        
+        pushed, consumed, done, failures = (int(v or 0) for v in totals)
+        
         return {
-            'pending_count': await self.get_queue_size(),
-            'failed_count': await self.get_failed_count(),
-            'completed_count': await self.get_completed_count(),
-            'total_pushed': self.total_pushed,
-            'total_consumed': self.total_consumed,
-            'total_completed': self.total_completed,
-            'total_failed': self.total_failed,
+            'pending_count': pending,
+            'failed_count': failed,
+            'completed_count': completed,
+            'total_pushed': pushed,
+            'total_consumed': consumed,
+            'total_completed': done,
+            'total_failed': failures,
             'worker_id': self.worker_id
         }
     
@@ -369,18 +523,9 @@ class TradeQueueService:
         """
         await self.connect()
         
-        requeued = 0
-        
-        for _ in range(limit):
-            # Pop from failed queue
-            result = await self.redis_client.rpop(self.FAILED_QUEUE)
-            
-            if not result:
-                break
-            
-            # Re-add to pending queue
-            await self.redis_client.lpush(self.PENDING_QUEUE, result)
-            requeued += 1
+        # Pop from failed queue and re-add to pending queue, server side
+        requeue = self.redis_client.register_script(REQUEUE_FAILED_SCRIPT)
+        requeued = await requeue(keys=[self.FAILED_QUEUE, self.PENDING_QUEUE], args=[limit])
         
         logger.info(f"Requeued {requeued} failed trades")
         return requeued
@@ -414,13 +559,7 @@ class TradeQueueService:
             logger.info("Trade queue connection closed")
 
 
-# Singleton instance
-_trade_queue_service: Optional[TradeQueueService] = None
-
-
+@cache
 def get_trade_queue_service() -> TradeQueueService:
     """Get singleton instance of TradeQueueService"""
-    global _trade_queue_service
-    if _trade_queue_service is None:
-        _trade_queue_service = TradeQueueService()
-    return _trade_queue_service
+    return TradeQueueService()
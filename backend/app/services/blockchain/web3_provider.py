@@ -9,10 +9,12 @@ Manages RPC connections to Polygon network with:
 """
 
 import asyncio
+from collections import OrderedDict
+from functools import cache
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from web3 import AsyncWeb3, AsyncHTTPProvider
+from web3 import AsyncWeb3, AsyncHTTPProvider, WebsocketProviderV2
 from web3.middleware import async_geth_poa_middleware
 from loguru import logger
 
@@ -210,6 +212,32 @@ class Web3ProviderService:
         
         return w3
     
+    def get_websocket_endpoints(self) -> List[RPCEndpoint]:
+        """WebSocket endpoints in priority order (for push subscriptions)"""
+        return sorted(
+            (e for e in self.config.endpoints if e.is_websocket),
+            key=lambda x: x.priority
+        )
+    
+    def persistent_websocket(self, endpoint: RPCEndpoint) -> AsyncWeb3:
+        """
+        Web3 over a persistent WebSocket connection, for eth_subscribe.
+        
+        Used as an async context manager, which opens the connection and
+        closes it on exit:
+        
+            async with provider.persistent_websocket(endpoint) as w3:
+                await w3.eth.subscribe("logs", {...})
+        """
+        w3 = AsyncWeb3.persistent_websocket(
+            WebsocketProviderV2(endpoint.url, request_timeout=self.config.request_timeout)
+        )
+        
+        # Add PoA middleware for Polygon
+        w3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
+        
+        return w3
+    
     async def get_web3(self) -> AsyncWeb3:
         """
         Get connected Web3 instance.
@@ -416,13 +444,55 @@ class Web3ProviderService:
         logger.info("Web3ProviderService closed")
 
 
-# Singleton instance
-_web3_provider_service: Optional[Web3ProviderService] = None
+class BlockTimestampCache:
+    """
+    Timestamps of recently seen blocks, least recently used first.
+    
+    A block with several logs is then fetched once, not once per log.
+    """
+    
+    def __init__(self, web3_provider: Web3ProviderService, max_size: int = 256):
+        """
+        Initialize block timestamp cache.
+        
+        Args:
+            web3_provider: Provider used to fetch blocks on a miss
+            max_size: Blocks to keep before evicting the least recently used
+        """
+        self.web3_provider = web3_provider
+        self.max_size = max_size
+        self._timestamps: "OrderedDict[bytes, int]" = OrderedDict()
+    
+    async def get(self, block_hash: bytes) -> int:
+        """
+        Get a block's timestamp, fetching the block only on a cache miss.
+        
+        Keyed by hash rather than number, so a reorged block at the same
+        height is never served the replaced block's timestamp.
+        
+        Args:
+            block_hash: Block hash (the log's blockHash)
+            
+        Returns:
+            Block timestamp (unix seconds)
+        """
+        timestamps = self._timestamps
+        timestamp = timestamps.get(block_hash)
+        if timestamp is not None:
+            timestamps.move_to_end(block_hash)
+            return timestamp
+        
+        w3 = await self.web3_provider.get_web3()
+        block = await w3.eth.get_block(block_hash)
+        timestamp = block['timestamp']
+        
+        timestamps[block_hash] = timestamp
+        if len(timestamps) > self.max_size:
+            timestamps.popitem(last=False)
+        return timestamp
 
 
+@cache
 def get_web3_provider_service() -> Web3ProviderService:
     """Get singleton instance of Web3ProviderService"""
-    global _web3_provider_service
-    if _web3_provider_service is None:
-        _web3_provider_service = Web3ProviderService()
-    return _web3_provider_service
+    return Web3ProviderService()
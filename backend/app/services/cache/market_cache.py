@@ -10,10 +10,12 @@ Caches Polymarket market information and prices with:
 
 import asyncio
 import json
-from typing import Optional, List, Dict, Any
+import uuid
+from typing import Optional, List, Dict, Any, AsyncIterator
 from datetime import datetime, timedelta
 from decimal import Decimal
 from dataclasses import dataclass, asdict
+import orjson
 import redis.asyncio as redis
 from loguru import logger
 
@@ -98,20 +100,44 @@ class MarketCacheService:
     
     # Cache keys
     MARKET_PREFIX = "market"
-    MARKETS_LIST_KEY = "markets:all"
+    ACTIVE_MARKETS_KEY = "markets:active"  # zset: market_id -> 24h volume
     TRENDING_KEY = "markets:trending"
     PRICES_CHANNEL = "market:prices"
+    REFILL_LOCK_KEY = "lock:markets:all"
+    REFILLED_CHANNEL = "markets:refilled"
     
     # Configuration
     MARKET_TTL = 60  # 1 minute for individual markets
     LIST_TTL = 60  # 1 minute for market list
     PRICE_TTL = 10  # 10 seconds for prices
+    REFILL_LOCK_MARGIN_MS = 1000  # Added to the API client's request bound
+    
+    # Published on REFILLED_CHANNEL when a refill finishes
+    REFILL_OK = "ok"
+    REFILL_FAILED = "failed"
+    
+    # Delete the lock only if we still own it (it may have expired and
+    # been taken by another refill)
+    RELEASE_LOCK_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('del', KEYS[1])
+    end
+    return 0
+    """
     
     def __init__(self):
         """Initialize market cache service"""
         self.redis_client: Optional[redis.Redis] = None
         self.polymarket_client = get_polymarket_client()
         
+        # The refill lock must outlive the slowest upstream fetch, or a second
+        # refill starts while the first is still waiting on the API; waiters
+        # wait just as long for its result
+        self.refill_lock_ttl_ms = (
+            int(self.polymarket_client.max_request_seconds * 1000)
+            + self.REFILL_LOCK_MARGIN_MS
+        )
+        
         # Metrics
         self.cache_hits: int = 0
         self.cache_misses: int = 0
@@ -144,8 +170,8 @@ class MarketCacheService:
             
             logger.info(f"Fetched {len(markets)} markets from API")
             
-            # Cache each market
-            cached_count = 0
+            # Build cache entries
+            market_infos = []
             for market_data in markets:
                 try:
                     market_info = MarketInfo(
@@ -159,17 +185,15 @@ class MarketCacheService:
                         liquidity=market_data.liquidity,
                         is_active=market_data.is_active
                     )
-                    
-                    await self._cache_market(market_info)
-                    cached_count += 1
+                    market_infos.append(market_info)
                     
                 except Exception as e:
                     logger.error(f"Failed to cache market {market_data.market_id}: {e}")
             
-            # Update markets list
-            await self._update_markets_list([m.market_id for m in markets])
+            # Cache markets and rebuild the index in one round trip
+            await self._store_markets(market_infos)
             
-            logger.info(f"Cache warmed: {cached_count}/{len(markets)} markets cached")
+            logger.info(f"Cache warmed: {len(market_infos)}/{len(markets)} markets cached")
             
         except Exception as e:
             logger.error(f"Failed to warm cache: {e}")
@@ -227,6 +251,25 @@ class MarketCacheService:
             logger.error(f"Failed to fetch market {market_id}: {e}")
             return None
     
+    async def get_market_payload(self, market_id: str) -> Optional[str]:
+        """
+        Get the cached JSON for a market without decoding it.
+        
+        The cached value is already shaped like the API's market response,
+        so a cache hit can be returned to the client as-is.
+        
+        Returns:
+            JSON string, or None on a cache miss
+        """
+        payload = await self._get_payload(market_id)
+        
+        if payload:
+            self.cache_hits += 1
+            return payload
+        
+        self.cache_misses += 1
+        return None
+    
     async def get_all_markets(self, use_cache: bool = True) -> List[MarketInfo]:
         """
         Get all active markets.
@@ -241,28 +284,128 @@ class MarketCacheService:
         
         # Try cache first
         if use_cache:
+            cached = await self._read_cached_markets()
+            if cached is not None:
+                self.cache_hits += 1
+                return cached
+        
+        self.cache_misses += 1
+        
+        if not use_cache:
+            return await self._fetch_all_markets()
+        
+        # Single-flight: only one caller refills from the API, the rest wait
+        # for its refilled notification and share the result
+        token = uuid.uuid4().hex
+        try:
+            locked = await self.redis_client.set(
+                self.REFILL_LOCK_KEY, token, nx=True, px=self.refill_lock_ttl_ms
+            )
+        except Exception as e:
+            logger.error(f"Cache error: {e}")
+            self.cache_errors += 1
+            return await self._fetch_all_markets()
+        
+        if not locked:
+            markets = await self._wait_for_refill()
+            if markets is not None:
+                return markets
+            # No refill result (timed out, or it ended before we subscribed);
+            # fetch ourselves
+            return await self._fetch_all_markets()
+        
+        markets: List[MarketInfo] = []
+        try:
+            markets = await self._fetch_all_markets()
+            return markets
+        finally:
+            # Release before publishing: a waiter that subscribes after the
+            # release sees the lock gone instead of waiting out the TTL
             try:
-                cached_ids = await self.redis_client.smembers(self.MARKETS_LIST_KEY)
-                
-                if cached_ids:
-                    self.cache_hits += 1
-                    
-                    # Fetch each market from cache
-                    markets = []
-                    for market_id in cached_ids:
-                        market = await self._get_from_cache(market_id)
-                        if market:
-                            markets.append(market)
-                    
-                    return markets
-                
+                await self.redis_client.eval(
+                    self.RELEASE_LOCK_SCRIPT, 1, self.REFILL_LOCK_KEY, token
+                )
             except Exception as e:
-                logger.error(f"Cache error: {e}")
-                self.cache_errors += 1
+                logger.error(f"Failed to release refill lock: {e}")
+            
+            # Always publish, so waiters never sit out the TTL on a failed refill
+            try:
+                await self.redis_client.publish(
+                    self.REFILLED_CHANNEL,
+                    self.REFILL_OK if markets else self.REFILL_FAILED
+                )
+            except Exception as e:
+                logger.error(f"Failed to publish refill: {e}")
+    
+    async def _read_cached_markets(self) -> Optional[List[MarketInfo]]:
+        """Read the full market list from cache, or None if it is not cached"""
+        try:
+            cached_ids = await self.redis_client.zrevrange(self.ACTIVE_MARKETS_KEY, 0, -1)
+            
+            if cached_ids:
+                # One MGET for every market instead of a GET per market
+                payloads = await self._get_payloads(cached_ids)
+                
+                # Every entry expired: treat as a miss and refill
+                if payloads:
+                    return [
+                        MarketInfo.from_dict(orjson.loads(payload))
+                        for payload in payloads
+                    ]
+            
+        except Exception as e:
+            logger.error(f"Cache error: {e}")
+            self.cache_errors += 1
         
-        self.cache_misses += 1
+        return None
+    
+    async def _wait_for_refill(self) -> Optional[List[MarketInfo]]:
+        """
+        Wait for another caller's refill to finish and share its result.
+        
+        Returns:
+            The refilled markets, [] if the refill failed, or None if no
+            result arrived (the caller should fetch itself)
+        """
+        pubsub = self.redis_client.pubsub()
         
-        # Fallback to API
+        try:
+            await pubsub.subscribe(self.REFILLED_CHANNEL)
+            
+            # The refill may have finished before we subscribed
+            cached = await self._read_cached_markets()
+            if cached is not None:
+                return cached
+            if not await self.redis_client.exists(self.REFILL_LOCK_KEY):
+                return None
+            
+            message = await asyncio.wait_for(
+                self._next_message(pubsub), self.refill_lock_ttl_ms / 1000
+            )
+            if message == self.REFILL_FAILED:
+                return []
+            
+            return await self._read_cached_markets()
+            
+        except asyncio.TimeoutError:
+            logger.warning("Timed out waiting for market refill")
+        except Exception as e:
+            logger.error(f"Cache error: {e}")
+            self.cache_errors += 1
+        finally:
+            await pubsub.close()
+        
+        return None
+    
+    @staticmethod
+    async def _next_message(pubsub: redis.client.PubSub) -> str:
+        """Block until the next published message (skipping subscribe acks)"""
+        async for message in pubsub.listen():
+            if message["type"] == "message":
+                return message["data"]
+    
+    async def _fetch_all_markets(self) -> List[MarketInfo]:
+        """Fetch all markets from the API and refill the cache"""
         try:
             markets_data = await self.polymarket_client.get_markets()
             
@@ -281,10 +424,9 @@ class MarketCacheService:
                 )
                 
                 markets.append(market_info)
-                await self._cache_market(market_info)
             
-            # Update markets list
-            await self._update_markets_list([m.market_id for m in markets_data])
+            # Cache markets and rebuild the index in one round trip
+            await self._store_markets(markets)
             
             return markets
             
@@ -292,6 +434,69 @@ class MarketCacheService:
             logger.error(f"Failed to fetch markets: {e}")
             return []
     
+    async def iter_market_payloads(
+        self,
+        chunk: int = 64,
+        limit: Optional[int] = None,
+        use_cache: bool = True
+    ) -> AsyncIterator[List[bytes]]:
+        """
+        Yield active markets as JSON documents, in batches of up to `chunk`,
+        highest 24h volume first.
+        
+        Lets callers stream large market lists without holding every market
+        in memory at once. Cached markets are passed through undecoded.
+        
+        Args:
+            chunk: Markets per batch
+            limit: Maximum markets to yield in total (None = all)
+            use_cache: Use cache if available
+            
+        Yields:
+            Lists of JSON-encoded markets
+        """
+        await self.connect()
+        
+        market_ids: List[str] = []
+        if use_cache:
+            try:
+                market_ids = await self.redis_client.zrevrange(
+                    self.ACTIVE_MARKETS_KEY, 0, -1 if limit is None else limit - 1
+                )
+            except Exception as e:
+                logger.error(f"Cache error: {e}")
+                self.cache_errors += 1
+        
+        sent = set()
+        for start in range(0, len(market_ids), chunk):
+            batch_ids = market_ids[start:start + chunk]
+            batch = await self._get_payloads(batch_ids)
+
+            # Entries expired under the index (now pruned): finish from
+            # get_all_markets, as _read_cached_markets would
+            if len(batch) < len(batch_ids):
+                break
+
+            sent.update(batch_ids)
+            yield [payload.encode() for payload in batch]
+        else:
+            if market_ids:
+                self.cache_hits += 1
+                return
+
+        # Cold or stale cache: single-flight refill, then slice
+        markets = await self.get_all_markets(use_cache=use_cache)
+        if limit is not None:
+            markets = markets[:limit]
+        if sent:
+            markets = [market for market in markets if market.market_id not in sent]
+
+        for start in range(0, len(markets), chunk):
+            yield [
+                orjson.dumps(market.to_dict())
+                for market in markets[start:start + chunk]
+            ]
+    
     async def get_market_price(
         self,
         market_id: str
@@ -314,7 +519,7 @@ class MarketCacheService:
             
             if cached_price:
                 self.cache_hits += 1
-                data = json.loads(cached_price)
+                data = orjson.loads(cached_price)
                 return {
                     'yes_price': Decimal(str(data['yes_price'])),
                     'no_price': Decimal(str(data['no_price']))
@@ -329,6 +534,7 @@ class MarketCacheService:
             prices = await self.polymarket_client.get_market_prices(market_id)
             
             price_data = {
+                'market_id': market_id,
                 'yes_price': float(prices.yes_price),
                 'no_price': float(prices.no_price)
             }
@@ -338,7 +544,7 @@ class MarketCacheService:
                 await self.redis_client.setex(
                     price_key,
                     self.PRICE_TTL,
-                    json.dumps(price_data)
+                    orjson.dumps(price_data)
                 )
                 
                 # Publish price update
@@ -356,6 +562,26 @@ class MarketCacheService:
             logger.error(f"Failed to fetch price for {market_id}: {e}")
             return None
     
+    async def get_market_price_payload(self, market_id: str) -> Optional[str]:
+        """
+        Get the cached price JSON for a market without decoding it.
+        
+        Returns:
+            JSON string with market_id, yes_price and no_price, or None on a
+            cache miss
+        """
+        try:
+            await self.connect()
+            cached_price = await self.redis_client.get(f"price:{market_id}")
+        except Exception as e:
+            logger.error(f"Price cache error: {e}")
+            return None
+        
+        if cached_price:
+            self.cache_hits += 1
+        
+        return cached_price
+    
     async def get_trending_markets(self, limit: int = 10) -> List[MarketInfo]:
         """
         Get trending markets (sorted by 24h volume).
@@ -366,7 +592,25 @@ class MarketCacheService:
         Returns:
             List of trending MarketInfo
         """
-        # Get all markets
+        await self.connect()
+        
+        # The index is already ordered by 24h volume
+        try:
+            market_ids = await self.redis_client.zrevrange(
+                self.ACTIVE_MARKETS_KEY, 0, limit - 1
+            )
+            payloads = await self._get_payloads(market_ids) if market_ids else []
+            if payloads:
+                self.cache_hits += 1
+                return [
+                    MarketInfo.from_dict(orjson.loads(payload))
+                    for payload in payloads
+                ]
+        except Exception as e:
+            logger.error(f"Cache error: {e}")
+            self.cache_errors += 1
+        
+        # Cold cache
         markets = await self.get_all_markets()
         
         # Sort by 24h volume
@@ -396,8 +640,8 @@ class MarketCacheService:
             price_key = f"price:{market_id}"
             await self.redis_client.delete(price_key)
             
-            # Remove from markets list
-            await self.redis_client.srem(self.MARKETS_LIST_KEY, market_id)
+            # Remove from markets index
+            await self.redis_client.zrem(self.ACTIVE_MARKETS_KEY, market_id)
             
             logger.info(f"Invalidated cache for market {market_id}")
             
@@ -446,49 +690,97 @@ class MarketCacheService:
             
             market_key = f"{self.MARKET_PREFIX}:{market.market_id}"
             
-            await self.redis_client.setex(
-                market_key,
-                self.MARKET_TTL,
-                json.dumps(market.to_dict())
-            )
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.setex(
+                    market_key,
+                    self.MARKET_TTL,
+                    orjson.dumps(market.to_dict())
+                )
+                # Refresh the volume score, but never create a partial index
+                pipe.zadd(
+                    self.ACTIVE_MARKETS_KEY,
+                    {market.market_id: float(market.volume_24h)},
+                    xx=True
+                )
+                await pipe.execute()
             
         except Exception as e:
             logger.error(f"Failed to cache market: {e}")
             self.cache_errors += 1
     
-    async def _get_from_cache(self, market_id: str) -> Optional[MarketInfo]:
-        """Get market from cache"""
+    async def _store_markets(self, markets: List[MarketInfo]):
+        """Cache a full market list and replace the index atomically"""
         try:
             await self.connect()
             
-            market_key = f"{self.MARKET_PREFIX}:{market_id}"
-            cached = await self.redis_client.get(market_key)
-            
-            if cached:
-                data = json.loads(cached)
-                return MarketInfo.from_dict(data)
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                for market in markets:
+                    pipe.setex(
+                        f"{self.MARKET_PREFIX}:{market.market_id}",
+                        self.MARKET_TTL,
+                        orjson.dumps(market.to_dict())
+                    )
+                
+                pipe.delete(self.ACTIVE_MARKETS_KEY)
+                if markets:
+                    pipe.zadd(self.ACTIVE_MARKETS_KEY, {
+                        market.market_id: float(market.volume_24h)
+                        for market in markets
+                    })
+                    pipe.expire(self.ACTIVE_MARKETS_KEY, self.LIST_TTL)
+                
+                await pipe.execute()
             
         except Exception as e:
-            logger.error(f"Cache read error: {e}")
+            logger.error(f"Failed to cache markets: {e}")
             self.cache_errors += 1
+    
+    async def _get_from_cache(self, market_id: str) -> Optional[MarketInfo]:
+        """Get market from cache"""
+        cached = await self._get_payload(market_id)
+        
+        if cached:
+            try:
+                return MarketInfo.from_dict(orjson.loads(cached))
+            except Exception as e:
+                logger.error(f"Cache read error: {e}")
+                self.cache_errors += 1
         
         return None
     
-    async def _update_markets_list(self, market_ids: List[str]):
-        """Update list of all market IDs"""
+    async def _get_payload(self, market_id: str) -> Optional[str]:
+        """Get a market's cached JSON"""
         try:
             await self.connect()
             
-            # Clear existing list
-            await self.redis_client.delete(self.MARKETS_LIST_KEY)
-            
-            # Add all market IDs
-            if market_ids:
-                await self.redis_client.sadd(self.MARKETS_LIST_KEY, *market_ids)
-                await self.redis_client.expire(self.MARKETS_LIST_KEY, self.LIST_TTL)
+            market_key = f"{self.MARKET_PREFIX}:{market_id}"
+            return await self.redis_client.get(market_key)
             
         except Exception as e:
-            logger.error(f"Failed to update markets list: {e}")
+            logger.error(f"Cache read error: {e}")
+            self.cache_errors += 1
+        
+        return None
+    
+    async def _get_payloads(self, market_ids: List[str]) -> List[str]:
+        """
+        Get several markets' cached JSON with a single MGET.
+        
+        Index members whose market entry has expired are removed from
+        the index and left out of the result.
+        """
+        payloads = await self.redis_client.mget(
+            [f"{self.MARKET_PREFIX}:{market_id}" for market_id in market_ids]
+        )
+        
+        stale = [
+            market_id for market_id, payload in zip(market_ids, payloads)
+            if payload is None
+        ]
+        if stale:
+            await self.redis_client.zrem(self.ACTIVE_MARKETS_KEY, *stale)
+        
+        return [payload for payload in payloads if payload is not None]
     
     async def _publish_price_update(self, market_id: str, prices: Any):
         """Publish price update to Redis pub/sub"""
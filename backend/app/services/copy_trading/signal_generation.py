@@ -16,7 +16,7 @@ import json
 
 from app.core.config import settings
 from app.models.api_key import User
-from app.services.subscription import get_subscription_service, SubscriptionTier
+from app.services.subscription import get_subscription_service
 
 
 @dataclass
@@ -206,11 +206,7 @@ class SignalGenerationService:
             return False, "User not found"
         
         # Check subscription tier
-        tier = SubscriptionTier(
-            user.subscription_tier 
-            if hasattr(user, 'subscription_tier') 
-            else 'free'
-        )
+        tier = user.tier
         
         # Get user's monthly volume (would query from database)
         current_monthly_volume = Decimal('0')
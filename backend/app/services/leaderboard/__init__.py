@@ -4,6 +4,10 @@ Leaderboard Services Package
 Trader leaderboard and P&L tracking services.
 """
 
+from app.services.leaderboard.categories import (
+    CATEGORIES,
+    categorize_trader
+)
 from app.services.leaderboard.pnl_calculator import (
     PnLCalculator,
     get_pnl_calculator
@@ -14,6 +18,8 @@ from app.services.leaderboard.ranking_service import (
 )
 
 __all__ = [
+    'CATEGORIES',
+    'categorize_trader',
     'PnLCalculator',
     'get_pnl_calculator',
     'LeaderboardService',
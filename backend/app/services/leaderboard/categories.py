@@ -0,0 +1,87 @@
+"""
+Trader Categories
+
+Rule-based trader categorisation. Categories are computed once when a
+trader's stats are written (see LeaderboardService.update_trader_stats)
+and stored in traders.categories, so read endpoints serve them straight
+from SQL and filter on them through a GIN index.
+"""
+
+from typing import Any, Dict, List, Optional
+
+
+# URL slug -> category name stored in traders.categories, description and
+# the search filters that approximate it
+CATEGORIES: Dict[str, Dict[str, Any]] = {
+    "consistent-winners": {
+        "name": "Consistent Winners",
+        "description": "Traders with 65%+ win rate and positive P&L",
+        "criteria": {"min_winrate": 65, "min_pnl_7d": 0},
+    },
+    "high-volume": {
+        "name": "High Volume",
+        "description": "Traders with 100+ total trades",
+        "criteria": {"min_trades": 100},
+    },
+    "new-rising": {
+        "name": "New & Rising",
+        "description": "New traders with strong recent performance",
+        "criteria": {"min_pnl_7d": 500, "max_trades": 50},
+    },
+    "top-performers": {
+        "name": "Top Performers",
+        "description": "Top traders with 30-day P&L > $5000",
+        "criteria": {"min_pnl_30d": 5000},
+    },
+    "risk-managers": {
+        "name": "Risk Managers",
+        "description": "Traders with excellent risk-adjusted returns",
+        "criteria": {"min_sharpe": 2.0},
+    },
+    "active-traders": {
+        "name": "Active Traders",
+        "description": "Active traders with 20+ trades",
+        "criteria": {"min_trades": 20},
+    },
+}
+
+
+def categorize_trader(
+    pnl_7d: float,
+    pnl_30d: float,
+    win_rate_7d: float,
+    total_trades: int,
+    sharpe_ratio: Optional[float]
+) -> List[str]:
+    """
+    Auto-categorize trader based on performance metrics.
+
+    Returns list of category names.
+    """
+    categories = []
+
+    # Consistent Winners
+    if win_rate_7d >= 65 and pnl_7d > 0 and pnl_30d > 0:
+        categories.append("Consistent Winners")
+
+    # High Volume
+    if total_trades >= 100:
+        categories.append("High Volume")
+
+    # New & Rising
+    if total_trades < 50 and pnl_7d > 500:
+        categories.append("New & Rising")
+
+    # Top Performers
+    if pnl_30d > 5000:
+        categories.append("Top Performers")
+
+    # Risk Managers
+    if sharpe_ratio and sharpe_ratio > 2.0:
+        categories.append("Risk Managers")
+
+    # Active Traders
+    if total_trades >= 20:  # Would check last_7d in real implementation
+        categories.append("Active Traders")
+
+    return categories
@@ -172,8 +172,20 @@ class PnLCalculator:
         Returns:
             Dictionary with trade stats
         """
-        # Build base query
-        query = select(Trade).where(
+        closed = Trade.status == 'closed'
+        
+        # Aggregate in SQL; only the counts and volume cross the wire
+        query = select(
+            func.count().label('total_trades'),
+            func.count().filter(closed).label('closed_trades'),
+            func.count().filter(
+                and_(closed, Trade.realized_pnl_usd > 0)
+            ).label('winning_trades'),
+            func.count().filter(
+                and_(closed, Trade.realized_pnl_usd < 0)
+            ).label('losing_trades'),
+            func.coalesce(func.sum(Trade.entry_value_usd), 0).label('total_volume'),
+        ).where(
             Trade.trader_wallet_address == wallet_address
         )
         
@@ -182,11 +194,10 @@ class PnLCalculator:
             cutoff = datetime.utcnow() - timedelta(days=days)
             query = query.where(Trade.entry_timestamp >= cutoff)
         
-        # Fetch trades
         result = await db.execute(query)
-        trades = result.scalars().all()
+        stats = result.one()
         
-        if not trades:
+        if not stats.total_trades:
             return {
                 'total_trades': 0,
                 'winning_trades': 0,
@@ -196,32 +207,18 @@ class PnLCalculator:
                 'total_volume': 0.0
             }
         
-        # Calculate stats
-        total_trades = len(trades)
-        closed_trades = [t for t in trades if t.status == 'closed']
-        
-        winning_trades = len([
-            t for t in closed_trades 
-            if t.realized_pnl_usd and t.realized_pnl_usd > 0
-        ])
-        
-        losing_trades = len([
-            t for t in closed_trades 
-            if t.realized_pnl_usd and t.realized_pnl_usd <= 0
-        ])
-        
-        win_rate = (winning_trades / len(closed_trades) * 100) if closed_trades else 0
-        
-        total_volume = sum(
-            Decimal(str(t.entry_value_usd)) for t in trades
+        win_rate = (
+            stats.winning_trades / stats.closed_trades * 100
+            if stats.closed_trades else 0
         )
         
-        avg_trade_size = total_volume / len(trades) if trades else Decimal('0')
+        total_volume = Decimal(str(stats.total_volume))
+        avg_trade_size = total_volume / stats.total_trades
         
         return {
-            'total_trades': total_trades,
-            'winning_trades': winning_trades,
-            'losing_trades': losing_trades,
+            'total_trades': stats.total_trades,
+            'winning_trades': stats.winning_trades,
+            'losing_trades': stats.losing_trades,
             'win_rate': float(win_rate),
             'avg_trade_size': float(avg_trade_size),
             'total_volume': float(total_volume)
@@ -285,7 +282,8 @@ class PnLCalculator:
         # Fetch closed trades
         cutoff = datetime.utcnow() - timedelta(days=days)
         
-        query = select(Trade).where(
+        # Only the return column is needed
+        query = select(Trade.realized_pnl_percent).where(
             and_(
                 Trade.trader_wallet_address == wallet_address,
                 Trade.status == 'closed',
@@ -295,13 +293,13 @@ class PnLCalculator:
         )
         
         result = await db.execute(query)
-        trades = result.scalars().all()
+        pnl_percents = result.scalars().all()
         
-        if len(trades) < 2:
+        if len(pnl_percents) < 2:
             return None
         
         # Calculate returns
-        returns = [Decimal(str(t.realized_pnl_percent)) for t in trades]
+        returns = [Decimal(str(p)) for p in pnl_percents]
         
         # Calculate average return
         avg_return = sum(returns) / len(returns)
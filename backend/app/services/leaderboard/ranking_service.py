@@ -9,17 +9,18 @@ Maintains ranked list of top Polymarket traders with:
 - Pagination support
 """
 
-import json
+import orjson
 from typing import List, Dict, Any, Optional
 from decimal import Decimal
 from datetime import datetime, timedelta
-from sqlalchemy import select, update, and_, desc, func
+from sqlalchemy import select, update, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 import redis.asyncio as redis
 from loguru import logger
 
 from app.core.config import settings
-from app.models.api_key import User
+from app.models.api_key import Trader, trader_leaderboard
+from app.services.leaderboard.categories import categorize_trader
 from app.services.leaderboard.pnl_calculator import get_pnl_calculator
 
 
@@ -50,6 +51,17 @@ class LeaderboardService:
     MIN_VOLUME_THRESHOLD = 100  # Minimum $100 volume
     DEFAULT_RANK_BY = "pnl_7d"  # Default ranking metric
     
+    # Whitelisted rank_by -> mv_trader_leaderboard column (each has an
+    # active-only index)
+    RANK_COLUMNS = {
+        'pnl_7d': trader_leaderboard.c.pnl_7d,
+        'pnl_30d': trader_leaderboard.c.pnl_30d,
+        'pnl_total': trader_leaderboard.c.pnl_total,
+        'win_rate_7d': trader_leaderboard.c.win_rate_7d,
+        'volume': trader_leaderboard.c.total_volume_usd,
+        'sharpe': trader_leaderboard.c.sharpe_ratio,
+    }
+    
     def __init__(self):
         """Initialize leaderboard service"""
         self.redis_client: Optional[redis.Redis] = None
@@ -90,29 +102,31 @@ class LeaderboardService:
                 db, wallet_address, days=30
             )
             
+            sharpe = float(sharpe_ratio) if sharpe_ratio else None
+            
             # Upsert into traders table
-            from app.models.api_key import User
             from sqlalchemy.dialects.postgresql import insert
             
-            # Build values dict
             values = {
                 'wallet_address': wallet_address,
-                'pnl_7d_usd': rolling_pnl['pnl_7d'],
-                'pnl_30d_usd': rolling_pnl['pnl_30d'],
-                'pnl_total_usd': rolling_pnl['pnl_all_time'],
-                'win_rate_7d': rolling_pnl['win_rate_7d'],
-                'win_rate_30d': rolling_pnl['win_rate_30d'],
-                'win_rate_total': rolling_pnl['win_rate_all_time'],
-                'total_trades_7d': rolling_pnl['total_trades_7d'],
-                'total_trades_30d': rolling_pnl['total_trades_30d'],
+                'pnl_7d': rolling_pnl['pnl_7d'],
+                'pnl_30d': rolling_pnl['pnl_30d'],
+                'total_pnl': rolling_pnl['pnl_all_time'],
+                'win_rate': rolling_pnl['win_rate_all_time'],
                 'total_trades': rolling_pnl['total_trades_all_time'],
-                'sharpe_ratio': float(sharpe_ratio) if sharpe_ratio else None,
-                'updated_at': datetime.utcnow()
+                'sharpe_ratio': sharpe,
+                # Categorised here, once per write, instead of per read
+                'categories': categorize_trader(
+                    float(rolling_pnl['pnl_7d']),
+                    float(rolling_pnl['pnl_30d']),
+                    rolling_pnl['win_rate_7d'],
+                    rolling_pnl['total_trades_all_time'],
+                    sharpe
+                ),
+                'last_updated_at': datetime.utcnow()
             }
             
-            # Note: This uses the traders table from database schema
-            # In production, you'd import the Trader model
-            stmt = insert(User.__table__).values(**values)
+            stmt = insert(Trader).values(**values)
             stmt = stmt.on_conflict_do_update(
                 index_elements=['wallet_address'],
                 set_=values
@@ -158,7 +172,7 @@ class LeaderboardService:
             
             if cached:
                 logger.debug(f"Leaderboard cache hit: {rank_by}")
-                return json.loads(cached)
+                return orjson.loads(cached)
         
         # Query database
         traders = await self._query_leaderboard(db, limit, rank_by)
@@ -169,11 +183,21 @@ class LeaderboardService:
             await self.redis_client.setex(
                 cache_key,
                 self.CACHE_TTL,
-                json.dumps(traders)
+                orjson.dumps(traders)
             )
         
         return traders
     
+    def _rank_order(self, rank_by: str):
+        """Map rank_by to a whitelisted DESC ordering on the leaderboard view"""
+        rank_column = self.RANK_COLUMNS.get(rank_by, trader_leaderboard.c.pnl_7d)
+        
+        # Only sharpe_ratio is nullable; its index is built NULLS LAST to match
+        if rank_column is trader_leaderboard.c.sharpe_ratio:
+            return rank_column.desc().nullslast()
+        
+        return rank_column.desc()
+    
     async def _query_leaderboard(
         self,
         db: AsyncSession,
@@ -191,49 +215,44 @@ class LeaderboardService:
         Returns:
             List of trader data
         """
-        # Map rank_by to column
-        rank_column_map = {
-            'pnl_7d': 'pnl_7d_usd',
-            'pnl_30d': 'pnl_30d_usd',
-            'pnl_total': 'pnl_total_usd',
-            'win_rate_7d': 'win_rate_7d',
-            'win_rate_30d': 'win_rate_30d',
-            'volume': 'total_volume_usd',
-            'sharpe': 'sharpe_ratio'
-        }
+        order_by = self._rank_order(rank_by)
         
-        rank_column = rank_column_map.get(rank_by, 'pnl_7d_usd')
+        lb = trader_leaderboard.c
         
-        # Build query - using User table, but in production you'd use Trader model
-        query = select(User).where(
+        # Reads the pre-aggregated view; ORDER BY ... LIMIT is pushed down so
+        # Postgres walks the active-only rank index and stops after `limit`
+        query = select(
+            lb.wallet_address,
+            lb.pnl_7d,
+            lb.pnl_30d,
+            lb.pnl_total,
+            lb.win_rate_7d,
+            lb.win_rate_30d,
+            lb.total_trades,
+            lb.sharpe_ratio,
+        ).where(
             and_(
-                User.total_trades >= self.MIN_TRADES_THRESHOLD,
-                #User.total_volume_usd >= self.MIN_VOLUME_THRESHOLD  # Commented - needs column
+                lb.is_active == True,  # matches the partial index predicate
+                lb.total_trades >= self.MIN_TRADES_THRESHOLD,
             )
-        ).order_by(
-            desc(getattr(User, rank_column))
-        ).limit(limit)
+        ).order_by(order_by).limit(limit)
         
         result = await db.execute(query)
-        traders = result.scalars().all()
         
-        # Convert to dictionaries
-        trader_list = []
-        for rank, trader in enumerate(traders, start=1):
-            trader_dict = {
+        return [
+            {
                 'rank': rank,
-                'wallet_address': trader.wallet_address,
-                'pnl_7d': float(trader.pnl_7d_usd) if hasattr(trader, 'pnl_7d_usd') else 0,
-                'pnl_30d': float(trader.pnl_30d_usd) if hasattr(trader, 'pnl_30d_usd') else 0,
-                'pnl_total': float(trader.pnl_total_usd) if hasattr(trader, 'pnl_total_usd') else 0,
-                'win_rate_7d': float(trader.win_rate_7d) if hasattr(trader, 'win_rate_7d') else 0,
-                'win_rate_30d': float(trader.win_rate_30d) if hasattr(trader, 'win_rate_30d') else 0,
-                'total_trades': trader.total_trades if hasattr(trader, 'total_trades') else 0,
-                'sharpe_ratio': float(trader.sharpe_ratio) if hasattr(trader, 'sharpe_ratio') and trader.sharpe_ratio else None,
+                'wallet_address': row.wallet_address,
+                'pnl_7d': float(row.pnl_7d),
+                'pnl_30d': float(row.pnl_30d),
+                'pnl_total': float(row.pnl_total),
+                'win_rate_7d': row.win_rate_7d,
+                'win_rate_30d': row.win_rate_30d,
+                'total_trades': row.total_trades,
+                'sharpe_ratio': row.sharpe_ratio,
             }
-            trader_list.append(trader_dict)
-        
-        return trader_list
+            for rank, row in enumerate(result, start=1)
+        ]
     
     async def get_trader_rank(
         self,
@@ -252,19 +271,87 @@ class LeaderboardService:
         Returns:
             Rank number or None if not ranked
         """
-        # Get full leaderboard (could be optimized with SQL window functions)
-        leaderboard = await self.get_top_traders(
-            db,
-            limit=1000,
-            rank_by=rank_by,
-            use_cache=False
+        stats = await self.get_stats_with_rank(db, wallet_address, rank_by)
+        
+        return stats['rank'] if stats else None
+    
+    async def get_stats_with_rank(
+        self,
+        db: AsyncSession,
+        wallet_address: str,
+        rank_by: str = DEFAULT_RANK_BY
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a trader's leaderboard stats and rank in one query.
+        
+        The rank is computed with RANK() OVER the same population as
+        get_top_traders (active traders above the trade threshold), so
+        it matches the trader's position on the leaderboard. Traders
+        outside that population are returned with rank None.
+        
+        Args:
+            db: Database session
+            wallet_address: Trader's address
+            rank_by: Ranking metric
+            
+        Returns:
+            Stats dictionary with rank, or None if the trader is unknown
+        """
+        order_by = self._rank_order(rank_by)
+        lb = trader_leaderboard.c
+        
+        ranked = select(
+            lb.wallet_address,
+            func.rank().over(order_by=order_by).label('rank')
+        ).where(
+            and_(
+                lb.is_active == True,
+                lb.total_trades >= self.MIN_TRADES_THRESHOLD,
+            )
+        ).cte('ranked')
+        
+        query = select(
+            lb.wallet_address,
+            lb.pnl_7d,
+            lb.pnl_30d,
+            lb.pnl_total,
+            lb.win_rate_7d,
+            lb.win_rate_30d,
+            lb.win_rate_total,
+            lb.total_trades_7d,
+            lb.total_trades_30d,
+            lb.total_trades,
+            lb.sharpe_ratio,
+            ranked.c.rank,
+        ).select_from(
+            trader_leaderboard.outerjoin(
+                ranked, ranked.c.wallet_address == lb.wallet_address
+            )
+        ).where(
+            # Served by idx_mv_trader_leaderboard_wallet_lower
+            func.lower(lb.wallet_address) == wallet_address.lower()
         )
         
-        for trader in leaderboard:
-            if trader['wallet_address'].lower() == wallet_address.lower():
-                return trader['rank']
+        row = (await db.execute(query)).first()
         
-        return None
+        if row is None:
+            return None
+        
+        # Keys match the /leaderboard/trader/{wallet} response clients use
+        return {
+            'wallet_address': row.wallet_address,
+            'rank': row.rank,
+            'pnl_7d': float(row.pnl_7d),
+            'pnl_30d': float(row.pnl_30d),
+            'pnl_all_time': float(row.pnl_total),
+            'win_rate_7d': row.win_rate_7d,
+            'win_rate_30d': row.win_rate_30d,
+            'win_rate_all_time': row.win_rate_total,
+            'total_trades_7d': row.total_trades_7d,
+            'total_trades_30d': row.total_trades_30d,
+            'total_trades_all_time': row.total_trades,
+            'sharpe_ratio': row.sharpe_ratio,
+        }
     
     async def _invalidate_cache(self):
         """Invalidate all leaderboard caches"""
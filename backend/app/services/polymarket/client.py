@@ -98,6 +98,7 @@ class PolymarketClient:
         self.testnet = testnet
         self.mock_mode = mock_mode
         self.dry_run = dry_run
+        self.timeout = timeout
         
         # Select base URL
         self.base_url = self.TESTNET_URL if testnet else self.BASE_URL
@@ -117,6 +118,16 @@ class PolymarketClient:
             f"(testnet={testnet}, mock={mock_mode}, dry_run={dry_run})"
         )
     
+    @property
+    def max_request_seconds(self) -> float:
+        """Upper bound on one request, including retries and their backoff"""
+        # Server-requested rate-limit waits (retry_after) are not included
+        backoff = sum(
+            min(self.RETRY_BACKOFF_BASE ** attempt, self.RETRY_BACKOFF_MAX)
+            for attempt in range(1, self.MAX_RETRIES + 1)
+        )
+        return (self.MAX_RETRIES + 1) * self.timeout + backoff
+    
     def _get_default_headers(self) -> Dict[str, str]:
         """Get default HTTP headers"""
         headers = {
@@ -4,6 +4,7 @@ Trade Reconciliation Service
 Reconciles executed trades with on-chain outcomes and API confirmations.
 """
 
+import asyncio
 from typing import Optional, List, Dict
 from datetime import datetime, timedelta
 from decimal import Decimal
@@ -123,14 +124,15 @@ class TradeReconciliationService:
         try:
             w3 = Web3(Web3.HTTPProvider(settings.POLYGON_RPC_URL))
             
-            # Get transaction receipt
-            receipt = w3.eth.get_transaction_receipt(tx_hash)
+            # Get transaction receipt (blocking HTTP calls, run off the event loop)
+            receipt = await asyncio.to_thread(w3.eth.get_transaction_receipt, tx_hash)
             
             if receipt:
+                latest_block = await asyncio.to_thread(lambda: w3.eth.block_number)
                 return {
                     "confirmed": True,
                     "block_number": receipt['blockNumber'],
-                    "confirmations": w3.eth.block_number - receipt['blockNumber'],
+                    "confirmations": latest_block - receipt['blockNumber'],
                     "status": "success" if receipt['status'] == 1 else "failed"
                 }
             else:
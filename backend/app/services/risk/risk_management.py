@@ -4,6 +4,7 @@ Risk Management & Circuit Breaker Service
 Emergency controls and risk management safeguards.
 """
 
+import asyncio
 from typing import Optional, Dict, List
 from datetime import datetime, timedelta
 from decimal import Decimal
@@ -71,6 +72,9 @@ class RiskManagementService:
         # Circuit breaker key
         self.circuit_breaker_key = "circuit_breaker:status"
         self.paused_traders_key = "circuit_breaker:paused_traders"
+        # Sorted set of user_id -> cooling period expiry (unix ts), so the
+        # admin dashboard can count users in cooling without a SCAN
+        self.cooling_users_key = "circuit_breaker:cooling_users"
         
         logger.info("RiskManagementService initialized")
     
@@ -143,8 +147,8 @@ class RiskManagementService:
             from web3 import Web3
             w3 = Web3(Web3.HTTPProvider(settings.POLYGON_RPC_URL))
             
-            # Try to get latest block
-            block = w3.eth.block_number
+            # Try to get latest block (blocking HTTP call, run off the event loop)
+            await asyncio.to_thread(lambda: w3.eth.block_number)
             
             return False, None
             
@@ -204,6 +208,38 @@ class RiskManagementService:
         
         return False
     
+    async def get_risk_snapshot(self) -> Dict[str, object]:
+        """
+        Read circuit breaker status and paused/cooling counts in one round trip.
+        
+        Returns:
+            Dict with circuit_breaker_active, paused_traders and
+            users_in_cooling_period
+        """
+        if not self.redis:
+            await self.connect()
+        
+        now = datetime.utcnow().timestamp()
+        
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.get(self.circuit_breaker_key)
+            pipe.hlen(self.paused_traders_key)
+            # Drop expired cooling entries, then count the rest
+            pipe.zremrangebyscore(self.cooling_users_key, '-inf', now)
+            pipe.zcount(self.cooling_users_key, now, '+inf')
+            status, paused_count, _, cooling_count = await pipe.execute()
+        
+        is_active = False
+        if status:
+            import ast
+            is_active = ast.literal_eval(status.decode()).get('is_active', False)
+        
+        return {
+            "circuit_breaker_active": is_active,
+            "paused_traders": paused_count,
+            "users_in_cooling_period": cooling_count,
+        }
+    
     async def reset_circuit_breaker(
         self,
         reset_by: str
@@ -289,11 +325,16 @@ class RiskManagementService:
         
         cooling_key = f"user:{user_id}:cooling_period"
         
-        await self.redis.setex(
-            cooling_key,
-            self.COOLING_PERIOD_HOURS * 3600,
-            reason
-        )
+        expires_at = datetime.utcnow() + timedelta(hours=self.COOLING_PERIOD_HOURS)
+        
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.setex(
+                cooling_key,
+                self.COOLING_PERIOD_HOURS * 3600,
+                reason
+            )
+            pipe.zadd(self.cooling_users_key, {str(user_id): expires_at.timestamp()})
+            await pipe.execute()
         
         logger.warning(
             f"Cooling period applied to user {user_id} for {self.COOLING_PERIOD_HOURS}h. "
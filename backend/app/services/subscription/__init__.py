@@ -8,7 +8,9 @@ from app.services.subscription.subscription_service import (
     SubscriptionService,
     get_subscription_service,
     SubscriptionTier,
-    TierLimits
+    TierLimits,
+    TIER_LIMITS,
+    TIER_PRICES
 )
 
 __all__ = [
@@ -16,4 +18,6 @@ __all__ = [
     'get_subscription_service',
     'SubscriptionTier',
     'TierLimits',
+    'TIER_LIMITS',
+    'TIER_PRICES',
 ]
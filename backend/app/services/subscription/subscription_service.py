@@ -17,6 +17,40 @@ class SubscriptionTier(str, Enum):
     FREE = "free"
     PRO = "pro"
     ENTERPRISE = "enterprise"
+    
+    @classmethod
+    def from_db(cls, value: Optional[str]) -> "SubscriptionTier":
+        """
+        Tier for a users.subscription_tier value (subscription_tier_t).
+        
+        Unknown values fall back to FREE rather than failing the request.
+        """
+        tier = _DB_TIERS.get(value)
+        if tier is None:
+            logger.warning(f"Unknown subscription tier {value!r}, treating as free")
+            return cls.FREE
+        return tier
+    
+    @property
+    def db_value(self) -> str:
+        """Value to store in users.subscription_tier"""
+        return _TIER_DB_VALUES[self]
+
+
+# subscription_tier_t predates these tier names: 'basic' gets the Pro limits
+# and 'premium' is Enterprise
+_DB_TIERS: Dict[str, SubscriptionTier] = {
+    'free': SubscriptionTier.FREE,
+    'basic': SubscriptionTier.PRO,
+    'pro': SubscriptionTier.PRO,
+    'premium': SubscriptionTier.ENTERPRISE,
+}
+
+_TIER_DB_VALUES: Dict[SubscriptionTier, str] = {
+    SubscriptionTier.FREE: 'free',
+    SubscriptionTier.PRO: 'pro',
+    SubscriptionTier.ENTERPRISE: 'premium',
+}
 
 
 @dataclass
@@ -28,6 +62,51 @@ class TierLimits:
     features: list[str]
 
 
+# Tier configurations (static, resolved at import time)
+TIER_LIMITS: Dict[SubscriptionTier, TierLimits] = {
+    SubscriptionTier.FREE: TierLimits(
+        max_copy_traders=1,
+        max_monthly_volume_usd=Decimal('100'),
+        max_api_calls_per_day=1000,
+        features=['basic_analytics', 'email_notifications']
+    ),
+    SubscriptionTier.PRO: TierLimits(
+        max_copy_traders=5,
+        max_monthly_volume_usd=Decimal('5000'),
+        max_api_calls_per_day=10000,
+        features=[
+            'basic_analytics',
+            'advanced_analytics',
+            'email_notifications',
+            'telegram_notifications',
+            'auto_close_trades'
+        ]
+    ),
+    SubscriptionTier.ENTERPRISE: TierLimits(
+        max_copy_traders=None,  # Unlimited
+        max_monthly_volume_usd=None,  # Unlimited
+        max_api_calls_per_day=None,  # Unlimited
+        features=[
+            'basic_analytics',
+            'advanced_analytics',
+            'email_notifications',
+            'telegram_notifications',
+            'auto_close_trades',
+            'priority_support',
+            'custom_integrations',
+            'api_access'
+        ]
+    )
+}
+
+# Pricing (monthly)
+TIER_PRICES: Dict[SubscriptionTier, Decimal] = {
+    SubscriptionTier.FREE: Decimal('0'),
+    SubscriptionTier.PRO: Decimal('29.99'),
+    SubscriptionTier.ENTERPRISE: Decimal('199.99')
+}
+
+
 class SubscriptionService:
     """
     Manage subscriptions and enforce usage limits.
@@ -38,49 +117,8 @@ class SubscriptionService:
     - Enterprise: Unlimited
     """
     
-    # Tier configurations
-    TIER_LIMITS = {
-        SubscriptionTier.FREE: TierLimits(
-            max_copy_traders=1,
-            max_monthly_volume_usd=Decimal('100'),
-            max_api_calls_per_day=1000,
-            features=['basic_analytics', 'email_notifications']
-        ),
-        SubscriptionTier.PRO: TierLimits(
-            max_copy_traders=5,
-            max_monthly_volume_usd=Decimal('5000'),
-            max_api_calls_per_day=10000,
-            features=[
-                'basic_analytics',
-                'advanced_analytics',
-                'email_notifications',
-                'telegram_notifications',
-                'auto_close_trades'
-            ]
-        ),
-        SubscriptionTier.ENTERPRISE: TierLimits(
-            max_copy_traders=None,  # Unlimited
-            max_monthly_volume_usd=None,  # Unlimited
-            max_api_calls_per_day=None,  # Unlimited
-            features=[
-                'basic_analytics',
-                'advanced_analytics',
-                'email_notifications',
-                'telegram_notifications',
-                'auto_close_trades',
-                'priority_support',
-                'custom_integrations',
-                'api_access'
-            ]
-        )
-    }
-    
-    # Pricing (monthly)
-    TIER_PRICING = {
-        SubscriptionTier.FREE: Decimal('0'),
-        SubscriptionTier.PRO: Decimal('29.99'),
-        SubscriptionTier.ENTERPRISE: Decimal('199.99')
-    }
+    TIER_LIMITS = TIER_LIMITS
+    TIER_PRICING = TIER_PRICES
     
     def __init__(self):
         """Initialize subscription service"""
@@ -88,11 +126,11 @@ class SubscriptionService:
     
     def get_tier_limits(self, tier: SubscriptionTier) -> TierLimits:
         """Get limits for a tier"""
-        return self.TIER_LIMITS[tier]
+        return TIER_LIMITS[tier]
     
     def get_tier_price(self, tier: SubscriptionTier) -> Decimal:
         """Get monthly price for a tier"""
-        return self.TIER_PRICING[tier]
+        return TIER_PRICES[tier]
     
     def check_copy_trader_limit(
         self,
@@ -179,7 +217,7 @@ class SubscriptionService:
         if current_tier == SubscriptionTier.FREE:
             return {
                 "suggested_tier": SubscriptionTier.PRO,
-                "price": float(self.TIER_PRICING[SubscriptionTier.PRO]),
+                "price": float(TIER_PRICES[SubscriptionTier.PRO]),
                 "benefits": [
                     "Copy up to 5 traders (vs 1)",
                     "$5,000 monthly volume (vs $100)",
@@ -191,7 +229,7 @@ class SubscriptionService:
         elif current_tier == SubscriptionTier.PRO:
             return {
                 "suggested_tier": SubscriptionTier.ENTERPRISE,
-                "price": float(self.TIER_PRICING[SubscriptionTier.ENTERPRISE]),
+                "price": float(TIER_PRICES[SubscriptionTier.ENTERPRISE]),
                 "benefits": [
                     "Unlimited copy traders",
                     "Unlimited volume",
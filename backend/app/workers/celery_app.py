@@ -29,6 +29,13 @@ celery_app.conf.update(
 # Auto-discover tasks
 celery_app.autodiscover_tasks(['app.workers'])
 
+# Periodic tasks
+from app.workers.tasks.maintenance_tasks import MAINTENANCE_SCHEDULE
+
+celery_app.conf.beat_schedule = {
+    **MAINTENANCE_SCHEDULE,
+}
+
 
 @celery_app.task(bind=True)
 def debug_task(self):
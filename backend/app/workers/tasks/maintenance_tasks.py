@@ -0,0 +1,124 @@
+"""
+Database Maintenance Tasks
+
+Celery tasks for keeping derived database objects fresh:
+- Periodic refresh of the v_user_portfolio materialized view
+- Periodic refresh of the mv_trader_leaderboard materialized view
+- Reconciling cached trade history after retention drops old chunks
+"""
+
+from datetime import timedelta
+
+from celery import shared_task
+from loguru import logger
+
+from app.core.config import settings
+
+
+@shared_task(name="maintenance.refresh_user_portfolio")
+def refresh_user_portfolio_task():
+    """
+    Refresh the v_user_portfolio materialized view.
+    
+    Uses CONCURRENTLY so portfolio reads are never blocked while the
+    aggregation is recomputed.
+    """
+    import asyncio
+    from sqlalchemy import text
+    from app.db.session import TaskSessionLocal
+    
+    async def _run():
+        async with TaskSessionLocal() as db:
+            await db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY v_user_portfolio"))
+            await db.commit()
+    
+    try:
+        asyncio.run(_run())
+        logger.debug("Refreshed v_user_portfolio")
+    except Exception as e:
+        logger.error(f"Portfolio view refresh error: {e}", exc_info=True)
+        raise
+
+
+@shared_task(name="maintenance.refresh_trader_leaderboard")
+def refresh_trader_leaderboard_task():
+    """
+    Refresh the mv_trader_leaderboard materialized view.
+    
+    Uses CONCURRENTLY so leaderboard reads keep hitting the previous
+    snapshot while the aggregation over trades is recomputed.
+    """
+    import asyncio
+    from sqlalchemy import text
+    from app.db.session import TaskSessionLocal
+    
+    async def _run():
+        async with TaskSessionLocal() as db:
+            await db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_trader_leaderboard"))
+            await db.commit()
+    
+    try:
+        asyncio.run(_run())
+        logger.debug("Refreshed mv_trader_leaderboard")
+    except Exception as e:
+        logger.error(f"Leaderboard view refresh error: {e}", exc_info=True)
+        raise
+
+
+@shared_task(name="maintenance.reconcile_trade_retention")
+def reconcile_trade_retention_task():
+    """
+    Reconcile trader history with the trades retention policy.
+    
+    Once the trades retention policy drops old chunks,
+    traders.first_trade_at can point at trades that no longer exist. Clamp
+    it to the oldest retained trade so history-based stats don't over-report.
+    """
+    import asyncio
+    from sqlalchemy import text
+    from app.db.session import TaskSessionLocal
+    
+    query = text("""
+        UPDATE traders t
+        SET first_trade_at = (
+            SELECT MIN(tr.entry_timestamp)
+            FROM trades tr
+            WHERE tr.trader_wallet_address = t.wallet_address
+        )
+        WHERE t.first_trade_at < NOW() - (
+            SELECT (j.config->>'drop_after')::interval
+            FROM timescaledb_information.jobs j
+            WHERE j.proc_name = 'policy_retention' AND j.hypertable_name = 'trades'
+        )
+    """)
+    
+    async def _run():
+        async with TaskSessionLocal() as db:
+            result = await db.execute(query)
+            await db.commit()
+            return result.rowcount
+    
+    try:
+        num_updated = asyncio.run(_run())
+        logger.info(f"Retention reconcile updated {num_updated} traders")
+        return {"updated": num_updated}
+    except Exception as e:
+        logger.error(f"Retention reconcile error: {e}", exc_info=True)
+        raise
+
+
+# Celery beat schedule configuration
+MAINTENANCE_SCHEDULE = {
+    'refresh-user-portfolio': {
+        'task': 'maintenance.refresh_user_portfolio',
+        'schedule': float(settings.PORTFOLIO_VIEW_REFRESH_SECONDS),
+    },
+    'refresh-trader-leaderboard': {
+        'task': 'maintenance.refresh_trader_leaderboard',
+        'schedule': float(settings.LEADERBOARD_VIEW_REFRESH_SECONDS),
+    },
+    'reconcile-trade-retention': {
+        'task': 'maintenance.reconcile_trade_retention',
+        'schedule': timedelta(days=1),  # Retention policy runs daily
+    },
+}
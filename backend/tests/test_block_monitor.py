@@ -0,0 +1,100 @@
+"""
+Unit Tests for Block Monitor
+
+Tests for log deduplication and chain reorg handling.
+"""
+
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+
+from app.services.blockchain.block_monitor import BlockMonitorService, BlockMonitorConfig
+from app.services.blockchain.contracts import EVENT_SIGNATURES_BYTES
+
+
+def make_log(block_number, log_index=0, block_hash=b'\x01' * 32, tx_hash=b'\xaa' * 32, removed=False):
+    """OrderFilled log receipt"""
+    return {
+        'blockNumber': block_number,
+        'blockHash': block_hash,
+        'transactionHash': tx_hash,
+        'logIndex': log_index,
+        'topics': [EVENT_SIGNATURES_BYTES['OrderFilled']],
+        'removed': removed,
+    }
+
+
+@pytest.fixture
+def monitor():
+    """Block monitor with a mocked provider and one event per parsed log"""
+    with patch('app.services.blockchain.block_monitor.get_web3_provider_service') as mock_provider:
+        w3 = Mock()
+        w3.eth.get_logs = AsyncMock(return_value=[])
+        mock_provider.return_value.get_web3 = AsyncMock(return_value=w3)
+
+        monitor = BlockMonitorService(BlockMonitorConfig(use_websocket=False))
+
+    monitor.w3 = w3
+    monitor._parse_trade_event = AsyncMock(side_effect=lambda log: Mock(log=log))
+    monitor.trades = []
+    monitor.removed = []
+    monitor.on_trade_event(monitor.trades.append)
+    monitor.on_trade_removed(monitor.removed.append)
+    return monitor
+
+
+@pytest.mark.asyncio
+class TestReorgHandling:
+    """Test suite for BlockMonitorService reorg handling"""
+
+    async def test_duplicate_log_dispatched_once(self, monitor):
+        """Test the same log seen twice (catch-up overlap) is handled once"""
+        await monitor._process_log(make_log(100))
+        await monitor._process_log(make_log(100))
+
+        assert len(monitor.trades) == 1
+
+    async def test_remined_log_dispatched_again(self, monitor):
+        """Test a log re-mined at the same height and index in a new block is new"""
+        await monitor._process_log(make_log(100, log_index=3))
+        await monitor._process_log(make_log(100, log_index=3, block_hash=b'\x02' * 32))
+
+        assert len(monitor.trades) == 2
+
+    async def test_removed_log_reverts_trade(self, monitor):
+        """Test a removed log passes the dispatched trade to removal callbacks"""
+        await monitor._process_log(make_log(100))
+        await monitor._process_log(make_log(100, removed=True))
+        await monitor._process_log(make_log(100, removed=True))
+
+        assert monitor.removed == monitor.trades
+        assert monitor.total_trades_reverted == 1
+
+    async def test_replayed_range_reconciles(self, monitor):
+        """Test a re-read range reverts missing logs and handles replacements"""
+        await monitor._process_log(make_log(100, block_hash=b'\x01' * 32))
+        await monitor._process_log(make_log(101, block_hash=b'\x03' * 32, tx_hash=b'\xbb' * 32))
+
+        # Block 100 was replaced; block 101 is unchanged
+        replacement = make_log(100, block_hash=b'\x02' * 32)
+        monitor.w3.eth.get_logs.return_value = [
+            replacement,
+            make_log(101, block_hash=b'\x03' * 32, tx_hash=b'\xbb' * 32),
+        ]
+        await monitor._process_logs_in_range(100, 101)
+
+        assert [t.log for t in monitor.removed] == [make_log(100)]
+        assert [t.log for t in monitor.trades][-1] == replacement
+        assert len(monitor.trades) == 3
+
+    async def test_reconcile_recent_rewinds_lookback(self, monitor):
+        """Test recovery re-reads recovery_lookback_blocks, not before the start"""
+        monitor._process_block_range = AsyncMock()
+        monitor.start_block = 1000
+        monitor.latest_processed_block = 1500
+
+        await monitor._reconcile_recent(1510)
+        monitor._process_block_range.assert_awaited_with(1401, 1500, replay=True)
+
+        monitor.latest_processed_block = 1010
+        await monitor._reconcile_recent(1510)
+        monitor._process_block_range.assert_awaited_with(1001, 1010, replay=True)
@@ -96,7 +96,7 @@ class TestEventListenerService:
         listener.on_trade_detected(callback)
         
         assert len(listener._trade_callbacks) == 1
-        assert listener._trade_callbacks[0] == callback
+        assert listener._trade_callbacks[0] == (callback, True)
     
     @pytest.mark.asyncio
     async def test_event_deduplication(self):
@@ -185,6 +185,19 @@ class TestEventListenerService:
         assert "Missing trader_address" in trade.validation_errors
 
 
+def mock_redis_with_pipeline():
+    """Mock Redis client whose pipeline() works as an async context manager"""
+    pipe = Mock()
+    pipe.execute = AsyncMock()
+    
+    pipeline_cm = AsyncMock()
+    pipeline_cm.__aenter__.return_value = pipe
+    
+    mock_redis = AsyncMock()
+    mock_redis.pipeline = Mock(return_value=pipeline_cm)
+    return mock_redis, pipe
+
+
 @pytest.mark.asyncio
 class TestTradeQueueService:
     """Test TradeQueueService"""
@@ -201,9 +214,8 @@ class TestTradeQueueService:
         queue = TradeQueueService()
         
         # Mock Redis client
-        mock_redis = AsyncMock()
-        mock_redis.rpush = AsyncMock()
-        mock_redis.llen = AsyncMock(return_value=1)
+        mock_redis, pipe = mock_redis_with_pipeline()
+        pipe.execute.return_value = [1, 1]
         queue.redis_client = mock_redis
         
         # Push trade
@@ -211,7 +223,8 @@ class TestTradeQueueService:
         
         assert success is True
         assert queue.total_pushed == 1
-        mock_redis.rpush.assert_called_once()
+        pipe.rpush.assert_called_once()
+        pipe.incr.assert_called_once_with(f"{queue.STATS_PREFIX}:pushed")
     
     async def test_serialize_deserialize_trade(self, sample_trade):
         """Test trade serialization roundtrip"""
@@ -229,51 +242,56 @@ class TestTradeQueueService:
         assert restored_trade.quantity == sample_trade.quantity
         assert isinstance(restored_trade.quantity, Decimal)
     
+    async def test_encode_decode_trade(self, sample_trade):
+        """Test msgpack payload roundtrip"""
+        queue = TradeQueueService()
+        
+        payload = queue._encode_trade(sample_trade, queued_at=0, priority=1)
+        restored_trade = queue._decode_trade(payload)
+        
+        assert restored_trade == sample_trade
+        assert isinstance(restored_trade.quantity, Decimal)
+    
     async def test_mark_completed(self, sample_trade):
         """Test marking trade as completed"""
         queue = TradeQueueService()
         
-        mock_redis = AsyncMock()
-        mock_redis.hdel = AsyncMock()
-        mock_redis.zadd = AsyncMock()
+        mock_redis, pipe = mock_redis_with_pipeline()
         queue.redis_client = mock_redis
         
         await queue.mark_completed(sample_trade.tx_hash)
         
         assert queue.total_completed == 1
-        mock_redis.zadd.assert_called_once()
+        pipe.zadd.assert_called_once()
+        pipe.execute.assert_awaited_once()
     
     async def test_mark_failed_with_retry(self, sample_trade):
         """Test marking trade as failed with retry"""
         queue = TradeQueueService()
         
-        mock_redis = AsyncMock()
-        mock_redis.hdel = AsyncMock()
-        mock_redis.lpush = AsyncMock()
+        mock_redis, pipe = mock_redis_with_pipeline()
         queue.redis_client = mock_redis
         
         await queue.mark_failed(sample_trade, "Test error", retry=True)
         
         # Should push to retry queue
-        mock_redis.lpush.assert_called()
-        call_args = mock_redis.lpush.call_args
+        pipe.lpush.assert_called()
+        call_args = pipe.lpush.call_args
         assert call_args[0][0] == queue.RETRY_QUEUE
     
     async def test_mark_failed_dlq(self, sample_trade):
         """Test marking trade as failed (dead letter queue)"""
         queue = TradeQueueService()
         
-        mock_redis = AsyncMock()
-        mock_redis.hdel = AsyncMock()
-        mock_redis.lpush = AsyncMock()
+        mock_redis, pipe = mock_redis_with_pipeline()
         queue.redis_client = mock_redis
         
         # Max retries exceeded
         await queue.mark_failed(sample_trade, "Final error", retry=False)
         
         # Should push to failed queue
-        mock_redis.lpush.assert_called()
-        call_args = mock_redis.lpush.call_args
+        pipe.lpush.assert_called()
+        call_args = pipe.lpush.call_args
         assert call_args[0][0] == queue.FAILED_QUEUE
         assert queue.total_failed == 1
 
@@ -288,9 +306,8 @@ class TestIntegration:
         queue = TradeQueueService()
         
         # Mock queue connection
-        queue.redis_client = AsyncMock()
-        queue.redis_client.rpush = AsyncMock()
-        queue.redis_client.llen = AsyncMock(return_value=1)
+        queue.redis_client, pipe = mock_redis_with_pipeline()
+        pipe.execute.return_value = [1, 1]
         
         # Register callback
         trades_received = []
@@ -0,0 +1,101 @@
+"""
+Unit Tests for Leaderboard Service
+
+Runs get_stats_with_rank against an in-memory SQLite copy of
+mv_trader_leaderboard.
+"""
+
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.services.leaderboard.ranking_service import LeaderboardService
+
+
+# (wallet_address, pnl_7d, total_trades)
+TRADERS = [
+    ('0xAbC1', 500, 20),
+    ('0xabc2', 300, 20),
+    ('0xabc3', 300, 20),
+    ('0xabc4', 100, 2),  # below MIN_TRADES_THRESHOLD: stats but no rank
+]
+
+
+class _AsyncSessionAdapter:
+    """The one AsyncSession method the service uses, over a sync Session"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def execute(self, statement):
+        return self.session.execute(statement)
+
+
+@pytest.fixture
+def db():
+    """Session over an in-memory leaderboard view"""
+    engine = create_engine('sqlite://')
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            'CREATE TABLE mv_trader_leaderboard ('
+            'wallet_address TEXT, is_active BOOLEAN, sharpe_ratio FLOAT, '
+            'pnl_7d NUMERIC, pnl_30d NUMERIC, pnl_total NUMERIC, '
+            'win_rate_7d FLOAT, win_rate_30d FLOAT, win_rate_total FLOAT, '
+            'total_trades_7d INTEGER, total_trades_30d INTEGER, total_trades INTEGER)'
+        )
+        for wallet, pnl, trades in TRADERS:
+            conn.exec_driver_sql(
+                'INSERT INTO mv_trader_leaderboard VALUES (?, 1, 1.5, ?, ?, ?, 60.0, 55.0, 50.0, 3, 8, ?)',
+                (wallet, pnl, pnl * 2, pnl * 4, trades)
+            )
+
+    with Session(engine) as session:
+        yield _AsyncSessionAdapter(session)
+
+    engine.dispose()
+
+
+@pytest.fixture
+def leaderboard():
+    """Leaderboard service (no Redis needed for stats lookups)"""
+    with patch('app.services.leaderboard.ranking_service.get_pnl_calculator'):
+        return LeaderboardService()
+
+
+@pytest.mark.asyncio
+class TestStatsWithRank:
+    """Test suite for LeaderboardService.get_stats_with_rank"""
+
+    async def test_response_keys(self, leaderboard, db):
+        """Test the stats keep the /leaderboard/trader/{wallet} response keys"""
+        stats = await leaderboard.get_stats_with_rank(db, '0xabc1')
+
+        assert stats == {
+            'wallet_address': '0xAbC1',
+            'rank': 1,
+            'pnl_7d': 500.0,
+            'pnl_30d': 1000.0,
+            'pnl_all_time': 2000.0,
+            'win_rate_7d': 60.0,
+            'win_rate_30d': 55.0,
+            'win_rate_all_time': 50.0,
+            'total_trades_7d': 3,
+            'total_trades_30d': 8,
+            'total_trades_all_time': 20,
+            'sharpe_ratio': 1.5,
+        }
+
+    async def test_ties_share_rank(self, leaderboard, db):
+        """Test equal pnl_7d gets equal RANK()"""
+        ranks = [
+            (await leaderboard.get_stats_with_rank(db, wallet))['rank']
+            for wallet in ('0xabc2', '0xABC3')
+        ]
+
+        assert ranks == [2, 2]
+
+    async def test_unranked_and_unknown(self, leaderboard, db):
+        """Test traders below the threshold have no rank and unknown ones no stats"""
+        assert (await leaderboard.get_stats_with_rank(db, '0xabc4'))['rank'] is None
+        assert await leaderboard.get_stats_with_rank(db, '0xdead') is None
@@ -0,0 +1,230 @@
+"""
+Unit Tests for Market Cache
+
+Runs MarketCacheService against an in-process fake Redis server, with the
+Polymarket client mocked.
+"""
+
+import asyncio
+import pytest
+import fakeredis
+import orjson
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import Mock, AsyncMock, patch
+
+from app.services.cache.market_cache import MarketCacheService
+
+
+def make_market(market_id, volume):
+    """Polymarket client market"""
+    return SimpleNamespace(
+        market_id=market_id,
+        name=f"Market {market_id}",
+        question=f"Will {market_id} happen?",
+        end_date=datetime(2030, 1, 1),
+        yes_price=Decimal('0.6'),
+        no_price=Decimal('0.4'),
+        volume_24h=Decimal(volume),
+        liquidity=Decimal('1000'),
+        is_active=True
+    )
+
+
+UPSTREAM_MARKETS = [make_market('0xaaa', '300'), make_market('0xbbb', '200'), make_market('0xccc', '100')]
+
+
+@pytest.fixture
+def polymarket_client():
+    """Mocked Polymarket client returning UPSTREAM_MARKETS"""
+    client = Mock()
+    client.max_request_seconds = 2
+    client.get_markets = AsyncMock(return_value=UPSTREAM_MARKETS)
+    return client
+
+
+@pytest.fixture
+def make_cache(polymarket_client):
+    """Factory for cache services (one per simulated process) sharing a Redis server"""
+    server = fakeredis.FakeServer()
+
+    def factory():
+        with patch(
+            'app.services.cache.market_cache.get_polymarket_client',
+            return_value=polymarket_client
+        ):
+            cache = MarketCacheService()
+        cache.redis_client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+        return cache
+
+    return factory
+
+
+def slow(result, delay=0.2):
+    """get_markets side effect that takes `delay` seconds"""
+    async def get_markets():
+        await asyncio.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return get_markets
+
+
+@pytest.mark.asyncio
+class TestSingleFlightRefill:
+    """Test suite for the get_all_markets single-flight refill"""
+
+    async def test_lock_ttl_covers_client_requests(self, make_cache):
+        """Test the refill lock outlives the client's slowest request"""
+        cache = make_cache()
+
+        assert cache.refill_lock_ttl_ms == 2000 + cache.REFILL_LOCK_MARGIN_MS
+
+    async def test_concurrent_misses_fetch_once(self, make_cache, polymarket_client):
+        """Test concurrent cache misses share one upstream fetch"""
+        polymarket_client.get_markets.side_effect = slow(UPSTREAM_MARKETS)
+        caches = [make_cache() for _ in range(5)]
+
+        results = await asyncio.gather(*(cache.get_all_markets() for cache in caches))
+
+        assert polymarket_client.get_markets.await_count == 1
+        for markets in results:
+            assert [m.market_id for m in markets] == ['0xaaa', '0xbbb', '0xccc']
+
+    async def test_waiters_wake_on_publish(self, make_cache, polymarket_client):
+        """Test waiters return as soon as the refill lands, not after the TTL"""
+        polymarket_client.get_markets.side_effect = slow(UPSTREAM_MARKETS)
+        leader, waiter = make_cache(), make_cache()
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        leader_task = asyncio.create_task(leader.get_all_markets())
+        await asyncio.sleep(0.05)
+
+        markets = await waiter.get_all_markets()
+
+        assert len(markets) == 3
+        assert loop.time() - started < 1
+        await leader_task
+
+    async def test_failed_refill_releases_waiters(self, make_cache, polymarket_client):
+        """Test a failed refill is shared with waiters instead of timing them out"""
+        polymarket_client.get_markets.side_effect = slow(RuntimeError("API down"))
+        caches = [make_cache() for _ in range(3)]
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        results = await asyncio.gather(*(cache.get_all_markets() for cache in caches))
+
+        assert results == [[], [], []]
+        assert polymarket_client.get_markets.await_count == 1
+        assert loop.time() - started < 1
+        assert not await caches[0].redis_client.exists(MarketCacheService.REFILL_LOCK_KEY)
+
+    async def test_waiter_after_release_returns(self, make_cache):
+        """Test a waiter whose refill already ended (lock gone) doesn't wait"""
+        cache = make_cache()
+        cache.refill_lock_ttl_ms = 60_000
+
+        assert await asyncio.wait_for(cache._wait_for_refill(), 1) is None
+
+    async def test_waiter_times_out(self, make_cache):
+        """Test a waiter gives up after the lock TTL if no result is published"""
+        cache = make_cache()
+        cache.refill_lock_ttl_ms = 100
+        await cache.redis_client.set(MarketCacheService.REFILL_LOCK_KEY, 'other')
+
+        assert await cache._wait_for_refill() is None
+
+
+@pytest.mark.asyncio
+class TestActiveMarketsIndex:
+    """Test suite for the markets:active index and MGET reads"""
+
+    async def test_refill_builds_index(self, make_cache):
+        """Test a refill caches each market and indexes it by 24h volume"""
+        cache = make_cache()
+        await cache.get_all_markets()
+
+        index = await cache.redis_client.zrevrange(cache.ACTIVE_MARKETS_KEY, 0, -1, withscores=True)
+        assert index == [('0xaaa', 300.0), ('0xbbb', 200.0), ('0xccc', 100.0)]
+        assert await cache.redis_client.ttl(cache.ACTIVE_MARKETS_KEY) > 0
+        assert await cache.redis_client.exists('market:0xaaa', 'market:0xbbb', 'market:0xccc') == 3
+
+    async def test_reads_use_one_mget(self, make_cache, polymarket_client):
+        """Test a warm read is one ZREVRANGE and one MGET, no per-market GETs"""
+        cache = make_cache()
+        await cache.get_all_markets()
+        polymarket_client.get_markets.reset_mock()
+
+        redis_client = cache.redis_client
+        with patch.object(redis_client, 'get', wraps=redis_client.get) as get, \
+                patch.object(redis_client, 'mget', wraps=redis_client.mget) as mget:
+            markets = await cache.get_all_markets()
+
+        assert [m.market_id for m in markets] == ['0xaaa', '0xbbb', '0xccc']
+        assert mget.call_count == 1
+        assert get.call_count == 0
+        polymarket_client.get_markets.assert_not_awaited()
+
+    async def test_stale_members_removed(self, make_cache, polymarket_client):
+        """Test index members whose market entry expired are skipped and removed"""
+        cache = make_cache()
+        await cache.get_all_markets()
+        await cache.redis_client.delete('market:0xbbb')
+        polymarket_client.get_markets.reset_mock()
+
+        markets = await cache.get_all_markets()
+
+        assert [m.market_id for m in markets] == ['0xaaa', '0xccc']
+        assert await cache.redis_client.zrevrange(cache.ACTIVE_MARKETS_KEY, 0, -1) == ['0xaaa', '0xccc']
+        polymarket_client.get_markets.assert_not_awaited()
+
+    async def test_all_members_stale_refills(self, make_cache, polymarket_client):
+        """Test an index with only expired entries is a miss"""
+        cache = make_cache()
+        await cache.get_all_markets()
+        await cache.redis_client.delete('market:0xaaa', 'market:0xbbb', 'market:0xccc')
+        polymarket_client.get_markets.reset_mock()
+
+        markets = await cache.get_all_markets()
+
+        assert len(markets) == 3
+        polymarket_client.get_markets.assert_awaited_once()
+
+    async def test_iter_market_payloads(self, make_cache, polymarket_client):
+        """Test cached markets stream in volume order, in chunks, skipping stale ones"""
+        cache = make_cache()
+        await cache.get_all_markets()
+        await cache.redis_client.delete('market:0xbbb')
+        polymarket_client.get_markets.reset_mock()
+
+        batches = [batch async for batch in cache.iter_market_payloads(chunk=1)]
+
+        assert [[orjson.loads(p)['market_id'] for p in batch] for batch in batches] == [['0xaaa'], ['0xccc']]
+        assert await cache.redis_client.zcard(cache.ACTIVE_MARKETS_KEY) == 2
+        polymarket_client.get_markets.assert_not_awaited()
+
+    async def test_iter_market_payloads_all_stale_refills(self, make_cache, polymarket_client):
+        """Test streaming an index with only expired entries refills instead of yielding nothing"""
+        cache = make_cache()
+        await cache.get_all_markets()
+        await cache.redis_client.delete('market:0xaaa', 'market:0xbbb', 'market:0xccc')
+        polymarket_client.get_markets.reset_mock()
+
+        batches = [batch async for batch in cache.iter_market_payloads(chunk=2)]
+
+        assert [[orjson.loads(p)['market_id'] for p in batch] for batch in batches] == [['0xaaa', '0xbbb'], ['0xccc']]
+        polymarket_client.get_markets.assert_awaited_once()
+
+    async def test_iter_market_payloads_stale_mid_stream(self, make_cache, polymarket_client):
+        """Test a refill after a stale chunk doesn't repeat markets already yielded"""
+        cache = make_cache()
+        await cache.get_all_markets()
+        await cache.redis_client.delete('market:0xbbb', 'market:0xccc')
+        polymarket_client.get_markets.reset_mock()
+
+        batches = [batch async for batch in cache.iter_market_payloads(chunk=1)]
+
+        assert [[orjson.loads(p)['market_id'] for p in batch] for batch in batches] == [['0xaaa']]
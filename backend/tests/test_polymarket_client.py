@@ -358,6 +358,15 @@ class TestPolymarketClientEdgeCases:
         
         await client.close()
     
+    async def test_max_request_seconds(self):
+        """Test the request bound covers every attempt and backoff"""
+        client = PolymarketClient(timeout=30)
+        
+        # 4 attempts of 30s plus 2s + 4s + 8s of backoff
+        assert client.max_request_seconds == 134
+        
+        await client.close()
+    
     async def test_testnet_url_selection(self):
         """Test that testnet flag selects correct URL"""
         mainnet_client = PolymarketClient(testnet=False)
@@ -0,0 +1,108 @@
+"""
+Unit Tests for Rate Limit Middleware
+
+Runs RateLimitMiddleware in a minimal app against an in-process fake Redis
+server, with the clock patched.
+"""
+
+import pytest
+import fakeredis
+import httpx
+from fastapi import FastAPI
+from unittest.mock import AsyncMock, patch
+from redis.exceptions import ConnectionError
+
+from app.middleware.rate_limit import RateLimitMiddleware
+
+
+LIMIT = 3
+
+
+@pytest.fixture
+def app():
+    """App with a rate limit of LIMIT requests per minute on the shared Redis client"""
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, requests_per_minute=LIMIT)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    app.state.redis = fakeredis.FakeAsyncRedis()
+    return app
+
+
+@pytest.fixture
+def clock():
+    """Patched time.time for the middleware, starting at t=1000s"""
+    with patch('app.middleware.rate_limit.time') as mock_time:
+        mock_time.time.return_value = 1000.0
+        yield mock_time.time
+
+
+async def get(app, path="/ping"):
+    """One request from 127.0.0.1"""
+    transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 50000))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(path)
+
+
+@pytest.mark.asyncio
+class TestRateLimitMiddleware:
+    """Test suite for RateLimitMiddleware"""
+
+    async def test_allows_under_limit(self, app, clock):
+        """Test requests under the limit pass with rate limit headers"""
+        responses = [await get(app) for _ in range(LIMIT)]
+
+        assert [r.status_code for r in responses] == [200] * LIMIT
+        assert [r.headers["X-RateLimit-Remaining"] for r in responses] == ["2", "1", "0"]
+        assert responses[0].headers["X-RateLimit-Limit"] == str(LIMIT)
+        assert responses[0].headers["X-RateLimit-Reset"] == "1060"
+
+    async def test_denies_over_limit_with_retry_after(self, app, clock):
+        """Test the request over the limit gets 429 and when to retry"""
+        for _ in range(LIMIT):
+            await get(app)
+
+        clock.return_value = 1030.0
+        response = await get(app)
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "31"
+
+    async def test_window_expiry(self, app, clock):
+        """Test requests are allowed again once the oldest leaves the window"""
+        for _ in range(LIMIT):
+            await get(app)
+
+        clock.return_value = 1059.999
+        assert (await get(app)).status_code == 429
+
+        clock.return_value = 1060.0
+        response = await get(app)
+        assert response.status_code == 200
+        assert response.headers["X-RateLimit-Remaining"] == str(LIMIT - 1)
+
+    async def test_denied_requests_not_counted(self, app, clock):
+        """Test rejected requests don't extend the window"""
+        for _ in range(LIMIT):
+            await get(app)
+        for _ in range(5):
+            await get(app)
+
+        assert await app.state.redis.zcard("ratelimit:127.0.0.1") == LIMIT
+
+    async def test_fails_open_on_redis_error(self, app, clock):
+        """Test requests pass when Redis errors"""
+        with patch.object(app.state.redis, 'evalsha', AsyncMock(side_effect=ConnectionError("Redis down"))):
+            response = await get(app)
+
+        assert response.status_code == 200
+        assert "X-RateLimit-Remaining" not in response.headers
+
+    async def test_fails_open_without_redis(self, app, clock):
+        """Test requests pass before the lifespan has opened Redis"""
+        del app.state.redis
+
+        assert (await get(app)).status_code == 200
@@ -0,0 +1,181 @@
+"""
+Unit Tests for Trader Discovery
+
+Tests the /traders/search keyset cursor. Pages are read from an in-memory
+SQLite copy of mv_trader_leaderboard.
+"""
+
+import base64
+import pytest
+import httpx
+import orjson
+from decimal import Decimal
+from unittest.mock import AsyncMock, Mock, patch
+from fastapi import FastAPI, HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.api.v1.endpoints.trader_discovery import (
+    router, encode_search_cursor, decode_search_cursor
+)
+from app.db.session import get_db
+
+
+# (wallet_address, pnl_7d): ties on pnl_7d must be broken by wallet_address
+TRADERS = [
+    ('0x01', 500), ('0x02', 300), ('0x03', 300), ('0x04', 300),
+    ('0x05', 300), ('0x06', 0.1), ('0x07', 0.1), ('0x08', -20),
+]
+
+# ORDER BY pnl_7d DESC, wallet_address DESC
+EXPECTED_ORDER = ['0x01', '0x05', '0x04', '0x03', '0x02', '0x07', '0x06', '0x08']
+
+
+class _AsyncSessionAdapter:
+    """The one AsyncSession method the search endpoint uses, over a sync Session"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def execute(self, statement):
+        return self.session.execute(statement)
+
+
+@pytest.fixture
+def app():
+    """App serving the trader discovery router over an in-memory leaderboard"""
+    engine = create_engine('sqlite://')
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            'CREATE TABLE mv_trader_leaderboard ('
+            'wallet_address TEXT, is_active BOOLEAN, sharpe_ratio FLOAT, last_trade_at TIMESTAMP, '
+            'categories JSON, pnl_7d NUMERIC, pnl_30d NUMERIC, pnl_total NUMERIC, '
+            'win_rate_7d FLOAT, total_trades INTEGER)'
+        )
+        for wallet, pnl in TRADERS:
+            conn.exec_driver_sql(
+                'INSERT INTO mv_trader_leaderboard VALUES (?, 1, NULL, NULL, ?, ?, 0, 0, 50.0, 10)',
+                (wallet, '[]', pnl)
+            )
+
+    app = FastAPI()
+    app.include_router(router)
+
+    with Session(engine) as session:
+        async def override_get_db():
+            yield _AsyncSessionAdapter(session)
+
+        app.dependency_overrides[get_db] = override_get_db
+        yield app
+
+    engine.dispose()
+
+
+async def search(app, **params):
+    """GET /traders/search"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get("/traders/search", params=params)
+
+
+class TestSearchCursor:
+    """Test suite for the search cursor encoding"""
+
+    @pytest.mark.parametrize("pnl_7d", [0.1, 300.0, -20.0, 1234.567891, 0.0])
+    def test_round_trip(self, pnl_7d):
+        """Test a cursor decodes to the exact key it was built from"""
+        cursor = encode_search_cursor(pnl_7d, '0xabc')
+
+        assert decode_search_cursor(cursor) == (Decimal(repr(pnl_7d)), '0xabc')
+
+    @pytest.mark.parametrize("cursor", [
+        "not base64!",
+        base64.urlsafe_b64encode(b"not json").decode(),
+        base64.urlsafe_b64encode(orjson.dumps({"pnl": 1})).decode(),
+        base64.urlsafe_b64encode(orjson.dumps([1, "0xabc", 3])).decode(),
+        base64.urlsafe_b64encode(orjson.dumps(["1e400", "0xabc"])).decode(),
+        base64.urlsafe_b64encode(orjson.dumps([True, "0xabc"])).decode(),
+        base64.urlsafe_b64encode(orjson.dumps([1, 2])).decode(),
+        base64.urlsafe_b64encode(orjson.dumps([1, None])).decode(),
+    ])
+    def test_invalid_cursor_rejected(self, cursor):
+        """Test malformed or tampered cursors are rejected as a client error"""
+        with pytest.raises(HTTPException) as exc_info:
+            decode_search_cursor(cursor)
+
+        assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+class TestSearchPagination:
+    """Test suite for keyset pagination of /traders/search"""
+
+    @pytest.mark.parametrize("limit", [1, 2, 3])
+    async def test_pages_cover_every_trader_once(self, app, limit):
+        """Test walking next_cursor returns every match once, in order, through ties"""
+        response = await search(app, limit=limit, exact_count=True)
+        page = response.json()
+        wallets = [r['wallet_address'] for r in page['results']]
+        assert page['total'] == len(TRADERS)
+
+        while page['next_cursor']:
+            response = await search(app, limit=limit, cursor=page['next_cursor'])
+            assert response.status_code == 200
+            page = response.json()
+            assert page['total'] is None
+            wallets += [r['wallet_address'] for r in page['results']]
+
+        assert wallets == EXPECTED_ORDER
+
+    async def test_cursor_inside_tie(self, app):
+        """Test a cursor pointing into a run of equal pnl_7d continues within it"""
+        response = await search(app, limit=2, cursor=encode_search_cursor(300.0, '0x04'))
+
+        assert [r['wallet_address'] for r in response.json()['results']] == ['0x03', '0x02']
+
+    @pytest.mark.parametrize("cursor", [
+        "garbage",
+        base64.urlsafe_b64encode(orjson.dumps(["300", {"a": 1}])).decode(),
+    ])
+    async def test_bad_cursor_is_400(self, app, cursor):
+        """Test a malformed or tampered cursor is a 400, not a 500"""
+        response = await search(app, cursor=cursor)
+
+        assert response.status_code == 400
+        assert response.json() == {"detail": "Invalid cursor"}
+
+
+@pytest.mark.asyncio
+class TestDefaultSearchCache:
+    """Test suite for the cached unfiltered /traders/search page"""
+
+    @pytest.fixture
+    def backend(self):
+        """Response cache backend installed for the duration of a test"""
+        backend = Mock()
+        backend.get = AsyncMock(return_value=None)
+        backend.set = AsyncMock()
+        with patch('app.api.v1.endpoints.trader_discovery.FastAPICache') as fastapi_cache:
+            fastapi_cache.get_prefix.return_value = 'pm-cache'
+            fastapi_cache.get_backend.return_value = backend
+            yield backend
+
+    async def test_served_from_cache(self, app, backend):
+        """Test a cached default page is returned without a query"""
+        backend.get.return_value = b'{"cached": true}'
+
+        response = await search(app)
+
+        assert response.json() == {"cached": True}
+        backend.get.assert_awaited_once_with('pm-cache:traders:search-default:0:50')
+
+    async def test_redis_errors_fail_open(self, app, backend):
+        """Test cache read and write errors fall through to the database"""
+        backend.get.side_effect = ConnectionError("Redis down")
+        backend.set.side_effect = ConnectionError("Redis down")
+
+        response = await search(app)
+
+        assert response.status_code == 200
+        assert [r['wallet_address'] for r in response.json()['results']] == EXPECTED_ORDER
+        backend.set.assert_awaited_once()